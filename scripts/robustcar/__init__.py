@@ -0,0 +1,5 @@
+"""Pipeline de normalização do estoque Robustcar (usado por robustcar-scraper.py).
+
+Importar o pacote ou qualquer módulo dele não tem efeitos colaterais; a
+linha de comando está em ``robustcar.cli.main``.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from robustcar.cli import main
+
+sys.exit(main())
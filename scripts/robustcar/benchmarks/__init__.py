@@ -0,0 +1,4 @@
+"""Micro-benchmarks do pipeline Robustcar.
+
+Executar a partir de ``scripts/``: ``python -m robustcar.benchmarks.<nome>``.
+"""
@@ -0,0 +1,72 @@
+"""Compara o custo por anúncio do classificador compilado com o detect_category antigo.
+
+Uso: python -m robustcar.benchmarks.category [N]
+"""
+
+import json
+import os
+import sys
+import time
+
+from robustcar.category import CategoryClassifier
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), '..', '..', 'robustcar-vehicles.json')
+
+
+# Implementação original (seis laços, listas recriadas a cada chamada)
+def legacy_detect_category(model):
+    model_upper = model.upper()
+    suv_keywords = ['CRETA', 'COMPASS', 'RENEGADE', 'TRACKER', 'ECOSPORT', 'DUSTER',
+                    'HR-V', 'TUCSON', 'SPORTAGE', 'RAV4', 'TIGGO', 'KORANDO',
+                    'PAJERO', 'T-CROSS', 'T CROSS', 'AIRCROSS', 'STONIC', 'GRAND LIVINA', 'FREEMONT']
+    sedan_keywords = ['CIVIC', 'COROLLA', 'CITY', 'CRUZE', 'HB20S', 'SENTRA',
+                      'LOGAN', 'VOYAGE', 'FOCUS', 'PRIUS', 'ARRIZO']
+    hatch_keywords = ['ONIX', 'HB20', 'FIESTA', 'KA', 'CELTA', 'UNO', 'PALIO',
+                      'FOX', 'MOBI', 'KWID', 'ETIOS', 'YARIS', 'C3', '207',
+                      'PUNTO', 'SOUL']
+    pickup_keywords = ['TORO', 'STRADA']
+    minivan_keywords = ['MERIVA', 'IDEA']
+    moto_keywords = ['NEO']
+    for keywords, category in ((moto_keywords, 'MOTO'), (pickup_keywords, 'PICKUP'),
+                               (minivan_keywords, 'MINIVAN'), (suv_keywords, 'SUV'),
+                               (sedan_keywords, 'SEDAN'), (hatch_keywords, 'HATCH')):
+        for keyword in keywords:
+            if keyword in model_upper:
+                return category
+    return 'OUTROS'
+
+
+def load_models(n):
+    with open(SNAPSHOT, encoding='utf-8') as f:
+        models = [v['model'] for v in json.load(f)]
+    # Acrescenta sufixos para que boa parte das strings seja distinta
+    return [f'{models[i % len(models)]} {i % 997}' for i in range(n)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    models = load_models(n)
+    classifier = CategoryClassifier()
+
+    legacy, t_legacy = timed(lambda ms: [legacy_detect_category(m) for m in ms], models)
+    single, t_single = timed(lambda ms: [classifier._match(m) for m in ms], models)
+    batch, t_batch = timed(classifier.classify_many, models)
+
+    assert legacy == single == batch, 'classificador divergiu da implementação original'
+
+    print(f'📊 detect_category — {n:,} anúncios')
+    for label, elapsed in (('original (laços)', t_legacy),
+                           ('regex compilada', t_single),
+                           ('classify_many', t_batch)):
+        print(f'  {label:<18} {elapsed * 1e9 / n:8.0f} ns/anúncio  '
+              f'({t_legacy / elapsed:4.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
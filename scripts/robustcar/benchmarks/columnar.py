@@ -0,0 +1,66 @@
+"""Tamanho e tempo de carga: JSON formatado versus snapshot colunar RCAR.
+
+Uso: python -m robustcar.benchmarks.columnar [N]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from robustcar.benchmarks.synthetic import generate
+from robustcar.columnar import ColumnarSnapshot, write_columnar
+from robustcar.normalize import normalize_vehicle
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    vehicles = [normalize_vehicle(item) for item in generate(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'vehicles.json')
+        rcar_path = os.path.join(tmp, 'vehicles.rcar')
+
+        def dump_json():
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(vehicles, f, ensure_ascii=False, indent=2)
+
+        def load_json():
+            with open(json_path, encoding='utf-8') as f:
+                return json.load(f)
+
+        def price_column():
+            with ColumnarSnapshot(rcar_path) as snapshot:
+                prices = snapshot.raw('price')
+                total = sum(p for p in prices if p == p)
+                del prices
+                return total
+
+        def load_records():
+            with ColumnarSnapshot(rcar_path) as snapshot:
+                return snapshot.records()
+
+        _, t_dump = timed(dump_json)
+        _, t_write = timed(lambda: write_columnar(vehicles, rcar_path))
+        loaded, t_load = timed(load_json)
+        records, t_records = timed(load_records)
+        _, t_price = timed(price_column)
+        assert records == loaded
+
+        json_size = os.path.getsize(json_path)
+        rcar_size = os.path.getsize(rcar_path)
+        print(f'📊 Snapshot — {n:,} veículos')
+        print(f'  JSON indent=2   {json_size / 1e6:8.1f} MB  grava {t_dump:6.2f}s  carrega {t_load:6.2f}s')
+        print(f'  RCAR colunar    {rcar_size / 1e6:8.1f} MB  grava {t_write:6.2f}s  '
+              f'carrega tudo {t_records:6.2f}s  só preço {t_price:6.3f}s')
+        print(f'  tamanho: {json_size / rcar_size:.1f}x menor')
+
+
+if __name__ == '__main__':
+    main()
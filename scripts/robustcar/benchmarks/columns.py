@@ -0,0 +1,48 @@
+"""Parse colunar (NumPy) de preço/km versus extract_price/clean_mileage por registro.
+
+Uso: python -m robustcar.benchmarks.columns [N]
+"""
+
+import math
+import sys
+import time
+
+from robustcar.benchmarks.synthetic import generate
+from robustcar.columns import parse_mileages, parse_prices
+from robustcar.normalize import clean_mileage, extract_price
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    listings = generate(n)
+    prices = [item['price'] for item in listings]
+    mileages = [item['mileage'] for item in listings]
+    print(f'📊 Preço e quilometragem — {n:,} linhas')
+
+    start = time.perf_counter()
+    scalar_prices = [extract_price(p) for p in prices]
+    t_scalar_price = time.perf_counter() - start
+    start = time.perf_counter()
+    values, missing = parse_prices(prices)
+    t_vector_price = time.perf_counter() - start
+
+    for expected, value, absent in zip(scalar_prices, values.tolist(), missing.tolist()):
+        assert (expected is None and absent and math.isnan(value)) or (expected == value and not absent)
+
+    start = time.perf_counter()
+    scalar_km = [clean_mileage(m) for m in mileages]
+    t_scalar_km = time.perf_counter() - start
+    start = time.perf_counter()
+    km = parse_mileages(mileages)
+    t_vector_km = time.perf_counter() - start
+    assert km.tolist() == scalar_km
+
+    for label, scalar, vector in (('preço', t_scalar_price, t_vector_price),
+                                  ('quilometragem', t_scalar_km, t_vector_km)):
+        print(f'  {label:<14} escalar {scalar * 1e9 / n:6.0f} ns/linha | '
+              f'colunar {vector * 1e9 / n:6.0f} ns/linha  ({scalar / vector:.1f}x)')
+    print(f'  "Consulte"/sem preço: {int(missing.sum()):,} linhas')
+
+
+if __name__ == '__main__':
+    main()
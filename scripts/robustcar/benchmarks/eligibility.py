@@ -0,0 +1,38 @@
+"""Elegibilidade Uber/99: regras com memo por chave versus avaliar veículo a veículo.
+
+Uso: python -m robustcar.benchmarks.eligibility [N]
+"""
+
+import sys
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.eligibility import EligibilityEngine, evaluate
+from robustcar.record import Vehicle
+
+
+def per_vehicle(engine, vehicles):
+    """Uma avaliação por anúncio, como o validador TS (lá, uma chamada ao LLM cada)."""
+    return [evaluate(*engine.key(vehicle)) for vehicle in vehicles]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+    engine = EligibilityEngine()
+    start = time.perf_counter()
+    per_vehicle(engine, vehicles)
+    naive = n / (time.perf_counter() - start)
+    start = time.perf_counter()
+    _, summary = engine.classify_many(vehicles)
+    memo = n / (time.perf_counter() - start)
+    print(f'📊 Elegibilidade Uber/99 — {n:,} anúncios, {summary["distinctKeys"]:,} combinações distintas')
+    print(f'  avaliação por veículo  {naive:>12,.0f} veículos/s')
+    print(f'  memo por combinação    {memo:>12,.0f} veículos/s')
+    print(f'  aptos {summary["aptoUber"]:,} | Black {summary["aptoUberBlack"]:,} | '
+          f'revisão {summary["review"]:,} veículos')
+    print(f'  chamadas ao LLM: {summary["llmCalls"]:,} (evitadas {summary["llmCallsAvoided"]:,} de {n:,})')
+
+
+if __name__ == '__main__':
+    main()
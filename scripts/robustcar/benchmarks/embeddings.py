@@ -0,0 +1,47 @@
+"""Etapa de embeddings com o backend local: cache frio, cache quente e coleta com 10% alterados.
+
+Uso: python -m robustcar.benchmarks.embeddings [N...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.embeddings import EmbeddingCache, EmbeddingStage, LocalBackend
+from robustcar.record import Vehicle
+
+
+def run(vehicles, backend, cache):
+    stage = EmbeddingStage(backend, cache)
+    start = time.perf_counter()
+    for _ in stage.embed_vehicles(vehicles):
+        pass
+    return stage, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [20_000, 100_000]
+    backend = LocalBackend()
+    for n in sizes:
+        vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        # Nova coleta: 10% dos anúncios com km atualizada (texto muda)
+        changed = [v if i % 10 else Vehicle(**{**v, 'mileage': v['mileage'] + 1})
+                   for i, v in enumerate(vehicles)]
+        path = os.path.join(tempfile.mkdtemp(), 'bench.embeddings.db')
+        print(f'📊 Embeddings — {n:,} veículos, {backend.name}')
+        with EmbeddingCache(path) as cache:
+            for label, batch in (('cache frio', vehicles), ('cache quente', vehicles),
+                                 ('10% alterados', changed)):
+                stage, elapsed = run(batch, backend, cache)
+                print(f'  {label:<14} {stage.unique:>9,} textos únicos  acerto {stage.hit_rate:6.1%}  '
+                      f'backend {stage.computed:>9,} ({stage.vectors_per_second:8,.0f} vetores/s)  '
+                      f'etapa {n / elapsed:9,.0f} veículos/s')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == '__main__':
+    main()
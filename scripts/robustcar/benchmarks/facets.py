@@ -0,0 +1,72 @@
+"""Consultas combinadas no índice RFAC versus filtro linear em Python.
+
+Uso: python -m robustcar.benchmarks.facets [N]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.facets import FacetIndex, write_facets
+from robustcar.normalize import detect_transmission
+from robustcar.record import Vehicle
+
+QUERIES = (
+    ('SUV, flex, < R$100k, >= 2020',
+     dict(category='SUV', fuel='FLEX', price=(None, 100_000), year=(2020, None))),
+    ('hatch manual até R$ 60k', dict(category='HATCH', transmission='Manual', price=(None, 60_000))),
+    ('sedan automático, < 80.000 km', dict(category='SEDAN', transmission='Automático', mileage=(None, 80_000))),
+    ('preço quebrado 47.321–93.210', dict(price=(47_321, 93_210))),
+    ('Toyota/Honda brancos >= 2018', dict(brand=('TOYOTA', 'HONDA'), color='BRANCO', year=(2018, None))),
+)
+
+
+def matches(vehicle, filters):
+    for name, wanted in filters.items():
+        if name in ('price', 'year', 'mileage'):
+            value = vehicle[name]
+            low, high = wanted
+            if value is None or (low is not None and value < low) or (high is not None and value >= high):
+                return False
+        else:
+            value = detect_transmission(vehicle['version']) if name == 'transmission' else vehicle[name]
+            if value != wanted and not (isinstance(wanted, tuple) and value in wanted):
+                return False
+    return True
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+    path = os.path.join(tempfile.mkdtemp(), 'bench.rfac')
+
+    start = time.perf_counter()
+    size = write_facets(vehicles, path)
+    built = time.perf_counter() - start
+    print(f'📊 Índice de facetas — {n:,} veículos: {size / 1e6:.1f} MB, construído em {built:.1f} s')
+
+    with FacetIndex(path) as index:
+        for label, filters in QUERIES:
+            bits = index.query(**filters)  # aquece: bitmaps lidos do mmap
+            samples = []
+            for _ in range(50):
+                start = time.perf_counter()
+                bits = index.query(**filters)
+                hits = index.count(bits)
+                first = index.row_ids(bits, limit=20)
+                samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            expected = [i for i, v in enumerate(vehicles) if matches(v, filters)]
+            scan = time.perf_counter() - start
+            assert hits == len(expected) and first == expected[:20], label
+            indexed = statistics.median(samples)
+            print(f'  {label:<32} {hits:>9,} hits  índice {indexed * 1e6:8.0f} µs | '
+                  f'varredura {scan * 1e3:8.1f} ms  ({scan / indexed:,.0f}x)')
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Coleta contra o servidor local (robustcar.standin): páginas/s e p95 de latência.
+
+Uso: python -m robustcar.benchmarks.fetch [N_ANUNCIOS]
+"""
+
+import json
+import os
+import sys
+
+from robustcar.benchmarks.synthetic import format_brl
+from robustcar.fetch import FetchStats, HttpCache, scrape_sync
+from robustcar.normalize import normalize_vehicle
+from robustcar.standin import StandInServer
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), '..', '..', 'robustcar-vehicles.json')
+
+
+def iter_raw_listings(n):
+    """Reconstrói anúncios brutos a partir do snapshot, com URLs distintas."""
+    with open(SNAPSHOT, encoding='utf-8') as f:
+        vehicles = json.load(f)
+    for i in range(n):
+        v = vehicles[i % len(vehicles)]
+        path = v['detailUrl'].replace('https://robustcar.com.br', '')
+        yield {
+            "brand": v['brand'],
+            "model": v['model'],
+            "version": v['version'],
+            "year": str(v['year']),
+            "mileage": f"{v['mileage']:,}".replace(',', '.'),
+            "fuel": v['fuel'],
+            "color": v['color'],
+            "price": format_brl(v['price']) if v['price'] else 'R$ Consulte',
+            "detailUrl": path.replace('.html', f'-{i}.html'),
+        }
+
+
+def raw_listings(n):
+    return list(iter_raw_listings(n))
+
+
+def report(label, stats):
+    s = stats.summary()
+    print(f"  {label:<22} {s['pages']:>5} págs  {s['pages_per_sec']:>8.1f} págs/s  "
+          f"p95 {s['p95_latency_ms']:>6.1f} ms  304={s['not_modified']}  retries={s['retries']}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    listings = raw_listings(n)
+    sold = {listings[i]['detailUrl'] for i in range(0, n, 50)}
+    expected = [normalize_vehicle(item) for item in listings if item['detailUrl'] not in sold]
+
+    print(f'📊 Coleta assíncrona — {n:,} anúncios, 20 por página')
+    with StandInServer(listings, fail_first=True, sold=sold, delay=0.002) as server:
+        cache = HttpCache()
+        stats = FetchStats()
+        raw = scrape_sync(base_url=server.base_url, details=True, limit=32,
+                          limit_per_host=16, backoff=0.01, cache=cache, stats=stats)
+        assert [normalize_vehicle(item) for item in raw] == expected, 'saída divergente'
+        report('primeira coleta', stats)
+
+        stats = FetchStats()
+        raw = scrape_sync(base_url=server.base_url, details=True, limit=32,
+                          limit_per_host=16, backoff=0.01, cache=cache, stats=stats)
+        assert len(raw) == len(expected)
+        report('condicional (ETag)', stats)
+
+
+if __name__ == '__main__':
+    main()
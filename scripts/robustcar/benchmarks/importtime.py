@@ -0,0 +1,67 @@
+"""Custo de importar o pacote, medido com ``python -X importtime``.
+
+Cada módulo é importado em um interpretador novo, ``--repeats`` vezes, e
+fica o menor tempo. O que vale para o limite é o tempo próprio dos módulos
+``robustcar.*`` (o código do pacote executado no import); o total com as
+dependências da biblioteca padrão (re, json, asyncio...) aparece ao lado,
+só para referência. Sai com código 1 se algum módulo passar de ``--budget``
+ms, então serve de verificação antes do commit. Meça com a máquina ociosa:
+outro processo disputando a CPU dobra os números.
+
+Uso:
+    python -m robustcar.benchmarks.importtime
+    python -m robustcar.benchmarks.importtime --budget 3 robustcar.normalize robustcar.parallel
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# O que jobs curtos e workers importam; cli é o import de robustcar-scraper.py
+MODULES = ('robustcar', 'robustcar.category', 'robustcar.normalize', 'robustcar.record',
+           'robustcar.fixtures', 'robustcar.cli')
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_times(module):
+    """``(µs próprios dos módulos robustcar, µs totais)`` de uma importação."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    own = total = 0
+    # import time: self [us] | cumulative | imported package
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.strip().startswith('robustcar'):
+            own += int(self_us)
+        if name.strip() == module:
+            total = int(cumulative_us)
+    return own, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de import dos módulos robustcar')
+    parser.add_argument('modules', nargs='*', default=MODULES)
+    parser.add_argument('--budget', type=float, default=5.0,
+                        help='limite em ms do tempo próprio dos módulos robustcar (padrão: 5)')
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'📊 Import — menor de {args.repeats} execuções, limite {args.budget:g} ms')
+    over = []
+    for module in args.modules:
+        own, total = min(import_times(module) for _ in range(args.repeats))
+        flag = ''
+        if own / 1e3 > args.budget:
+            over.append(module)
+            flag = '  ⚠️  acima do limite'
+        print(f'  {module:<22} robustcar {own / 1e3:>6.2f} ms  total {total / 1e3:>7.2f} ms{flag}')
+    if over:
+        print(f'❌ {len(over)} módulo(s) acima de {args.budget:g} ms: {", ".join(over)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Carga no SQLite: tabela temporária + upsert em lote versus um INSERT por veículo (como o seed).
+
+Uso: python -m robustcar.benchmarks.loader [N...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import closing
+from dataclasses import replace
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.loader import COLUMNS, BulkLoader, connect, should_load, vehicle_row
+from robustcar.record import Vehicle
+
+# Acima disso o laço linha a linha fica lento demais para o benchmark
+PER_ROW_LIMIT = 20_000
+
+
+def per_row(conn, vehicles):
+    """Um ``INSERT`` e um commit por veículo, como ``prisma.vehicle.create()`` em laço."""
+    columns = ', '.join(f'"{c}"' for c in COLUMNS)
+    sql = (f'INSERT INTO "Vehicle" ({columns}, "updatedAt") '
+           f'VALUES ({", ".join("?" * len(COLUMNS))}, CURRENT_TIMESTAMP)')
+    start = time.perf_counter()
+    loaded = 0
+    for vehicle in vehicles:
+        if should_load(vehicle):
+            conn.execute('BEGIN')
+            conn.execute(sql, vehicle_row(vehicle))
+            conn.execute('COMMIT')
+            loaded += 1
+    return loaded / (time.perf_counter() - start)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for n in sizes:
+        vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        # Segunda coleta: 10% com preço novo, 5% saíram do estoque
+        changed = [replace(v, price=v.price - 500) if v.price and i % 10 == 0 else v
+                   for i, v in enumerate(vehicles) if i % 20 != 1]
+        directory = tempfile.mkdtemp()
+        print(f'📊 Carga — {n:,} veículos')
+        with closing(connect(f'sqlite:///{os.path.join(directory, "bulk.db")}')) as conn:
+            loader = BulkLoader(conn)
+            first = loader.load(vehicles)
+            print(f"  lote, banco vazio    {first['rowsPerSec']:>10,.0f} linhas/s  "
+                  f"({first['inserted']:,} inseridas em {first['seconds']:.1f} s)")
+            second = loader.load(changed, retire_missing=True)
+            print(f"  lote, nova coleta    {second['rowsPerSec']:>10,.0f} linhas/s  "
+                  f"({second['updated']:,} atualizadas, {second['retired']:,} indisponíveis, "
+                  f"{second['seconds']:.1f} s)")
+        if n <= PER_ROW_LIMIT:
+            with closing(connect(f'sqlite:///{os.path.join(directory, "per-row.db")}')) as conn:
+                rate = per_row(conn, vehicles)
+            print(f'  um INSERT por linha  {rate:>10,.0f} linhas/s  ({first["rowsPerSec"] / rate:.0f}x mais lento)')
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Speed-up da normalização em ProcessPoolExecutor versus um processo só.
+
+Uso: python -m robustcar.benchmarks.parallel [N] [WORKERS...]
+"""
+
+import io
+import json
+import os
+import sys
+import time
+
+from robustcar import parallel
+from robustcar.benchmarks.synthetic import generate
+from robustcar.normalize import normalize_vehicle
+from robustcar.stream import normalize_stream, read_ndjson, write_ndjson
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    worker_counts = [int(w) for w in sys.argv[2:]] or [2, 4, os.cpu_count() or 1]
+    listings = generate(n)
+    blob = ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in listings).encode('utf-8')
+    print(f'📊 Normalização paralela — {n:,} anúncios, {os.cpu_count()} CPUs')
+
+    start = time.perf_counter()
+    out = io.StringIO()
+    write_ndjson(normalize_stream(read_ndjson(io.StringIO(blob.decode('utf-8')))), out)
+    base = time.perf_counter() - start
+    expected = out.getvalue().encode('utf-8')
+    print(f'  NDJSON  1 processo   {n / base:>10,.0f} reg/s')
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        dst = io.BytesIO()
+        parallel.run_ndjson(io.BytesIO(blob), dst, workers)
+        elapsed = time.perf_counter() - start
+        assert dst.getvalue() == expected, 'saída paralela divergiu'
+        print(f'  NDJSON {workers:>2} processos  {n / elapsed:>10,.0f} reg/s  ({base / elapsed:.1f}x)')
+
+    start = time.perf_counter()
+    single = [normalize_vehicle(item) for item in listings]
+    base = time.perf_counter() - start
+    print(f'  lista   1 processo   {n / base:>10,.0f} reg/s')
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = parallel.normalize_many(listings, workers)
+        elapsed = time.perf_counter() - start
+        assert [v.to_dict() for v in result] == single, 'saída paralela divergiu'
+        print(f'  lista  {workers:>2} processos  {n / elapsed:>10,.0f} reg/s  ({base / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Bytes por veículo retidos em memória: dict normalizado versus Vehicle (slots).
+
+Os registros são construídos a partir de linhas NDJSON, como no modo
+streaming, para que cada string venha de um parse independente.
+
+Uso: python -m robustcar.benchmarks.record [N...]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.normalize import normalize_vehicle
+from robustcar.record import Vehicle
+
+
+def retained_bytes(build, n):
+    lines = (json.dumps(item, ensure_ascii=False) for item in ListingGenerator().generate(n))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(json.loads(line)) for line in lines]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / n
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    print('📊 Memória retida por veículo (tracemalloc)')
+    for n in sizes:
+        as_dict = retained_bytes(normalize_vehicle, n)
+        as_record = retained_bytes(Vehicle.from_raw, n)
+        print(f'  {n:>9,}  dict {as_dict:6.0f} B/veículo | Vehicle {as_record:6.0f} B/veículo  '
+              f'({as_dict / as_record:.1f}x menor, {(as_dict - as_record) * n / 1e6:,.0f} MB a menos)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Serialização do snapshot: json.dumps inteiro versus ``iter_json`` por backend.
+
+Mede o tempo de codificação (MB/s de JSON) e a memória de pico
+(tracemalloc, em execução separada) de cada combinação backend/formato. Os
+pedaços de ``iter_json`` são só contados, como se fossem para o arquivo.
+Confere também que ``pretty`` sai byte a byte igual ao ``json.dumps`` de hoje.
+Backends não instalados ficam de fora.
+
+Uso: python -m robustcar.benchmarks.serialize [N...]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.record import Vehicle
+from robustcar.serialize import BACKENDS, FORMATS, dumps, iter_json, resolve_backend
+
+
+def available():
+    names = []
+    for name in BACKENDS:
+        try:
+            names.append(resolve_backend(name))
+        except RuntimeError:
+            pass
+    return names
+
+
+def baseline(vehicles):
+    # O que o script fazia: o snapshot inteiro como str e depois em UTF-8
+    payload = json.dumps(vehicles, ensure_ascii=False, indent=2, default=Vehicle.to_dict)
+    return len(payload.encode('utf-8'))
+
+
+def streamed(backend, fmt):
+    def run(vehicles):
+        return sum(len(chunk) for chunk in iter_json(vehicles, fmt, backend))
+    return run
+
+
+def measure(fn, vehicles):
+    """Segundos numa execução e memória de pico (tracemalloc) em outra."""
+    start = time.perf_counter()
+    size = fn(vehicles)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn(vehicles)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, seconds, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    backends = available()
+    for n in sizes:
+        vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        reference = json.dumps(vehicles[:5_000], ensure_ascii=False, indent=2, default=Vehicle.to_dict).encode()
+        identical = all(dumps(vehicles[:5_000], 'pretty', backend) == reference for backend in backends)
+        print(f'📊 Serialização — {n:,} veículos (pretty idêntico ao json.dumps: {"sim" if identical else "NÃO"})')
+        cases = [('json.dumps inteiro', 'pretty', baseline)]
+        cases += [(f'iter_json {backend}', fmt, streamed(backend, fmt)) for backend in backends for fmt in FORMATS]
+        for label, fmt, fn in cases:
+            size, seconds, peak = measure(fn, vehicles)
+            print(f'  {label:<20} {fmt:<8} {size / 1e6:>7,.1f} MB  {seconds:>6.2f} s  '
+                  f'{size / 1e6 / seconds:>6,.0f} MB/s  pico {peak / 1e6:>7,.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
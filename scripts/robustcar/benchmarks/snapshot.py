@@ -0,0 +1,62 @@
+"""Gravação do snapshot: escrita direta versus atômica, sem compressão, gzip e zstd.
+
+Mede MB/s de escrita (texto JSON sem compressão por segundo), tamanho no
+disco e MB/s de leitura com ``read_snapshot`` (descompressão + json.load).
+zstd só entra se ``compression.zstd`` ou ``zstandard`` estiver disponível.
+
+Uso: python -m robustcar.benchmarks.snapshot [N...]
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.record import Vehicle
+from robustcar.snapshot import SnapshotWriter, _zstd, read_snapshot
+
+
+def available():
+    modes = [None, 'gzip']
+    try:
+        _zstd()
+        modes.append('zstd')
+    except RuntimeError:
+        pass
+    return modes
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        payload = json.dumps(vehicles, ensure_ascii=False, indent=2, default=Vehicle.to_dict)
+        del vehicles
+        megabytes = len(payload.encode('utf-8')) / 1e6
+        directory = tempfile.mkdtemp()
+        print(f'📊 Snapshot — {n:,} veículos, {megabytes:,.1f} MB de JSON')
+        try:
+            path = os.path.join(directory, 'direto.json')
+            start = time.perf_counter()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            print(f'  open + write (sem fsync)  escrita {megabytes / (time.perf_counter() - start):>7,.0f} MB/s')
+            for compression in available():
+                writer = SnapshotWriter(os.path.join(directory, 'snapshot.json'), compression=compression)
+                result = writer.write((payload,))
+                start = time.perf_counter()
+                read_snapshot(writer.path)
+                read_rate = megabytes / (time.perf_counter() - start)
+                label = f'atômico, {compression or "sem compressão"}'
+                print(f'  {label:<25} escrita {result["mbPerSec"]:>7,.0f} MB/s  '
+                      f'{result["storedBytes"] / 1e6:>7,.1f} MB ({result["storedBytes"] / result["bytes"]:.0%})  '
+                      f'leitura {read_rate:>5,.0f} MB/s')
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
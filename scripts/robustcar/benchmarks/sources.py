@@ -0,0 +1,52 @@
+"""Várias lojas: uma coleta por vez versus ``scrape_sources`` com orçamento compartilhado.
+
+Cada loja é um ``StandInServer`` com latência própria; o tempo total com
+coleta simultânea deve ficar perto do da loja mais lenta, não da soma.
+
+Uso: python -m robustcar.benchmarks.sources [N_LOJAS] [ANUNCIOS_POR_LOJA]
+"""
+
+import sys
+import time
+from contextlib import ExitStack
+
+from robustcar.benchmarks.fetch import raw_listings
+from robustcar.fetch import FetchStats, parse_listing_page
+from robustcar.sources import Source, scrape_sources_sync
+from robustcar.standin import StandInServer
+
+LIMIT = 32
+PER_HOST = 8
+
+
+def main():
+    dealers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    per_dealer = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    listings = raw_listings(per_dealer)
+    print(f'📊 Coleta de {dealers} lojas — {per_dealer:,} anúncios cada, detalhes visitados')
+    with ExitStack() as stack:
+        servers = [stack.enter_context(StandInServer(listings, delay=0.002 * (i + 1)))
+                   for i in range(dealers)]
+        selected = [Source(f'loja{i}', server.base_url, '/busca//pag/{page}/ordem/ano-desc/',
+                           parse_listing_page) for i, server in enumerate(servers)]
+
+        alone = []
+        for source in selected:
+            start = time.perf_counter()
+            scrape_sources_sync([source], details=True, limit=LIMIT, limit_per_host=PER_HOST)
+            alone.append(time.perf_counter() - start)
+            print(f'  {source.name} sozinha    {alone[-1]:6.2f} s')
+
+        stats = FetchStats()
+        start = time.perf_counter()
+        raw, _ = scrape_sources_sync(selected, details=True, limit=LIMIT, limit_per_host=PER_HOST,
+                                     stats=stats)
+        together = time.perf_counter() - start
+        assert len(raw) == dealers * per_dealer, 'anúncios faltando'
+        print(f'  soma das lojas     {sum(alone):6.2f} s')
+        print(f'  todas juntas       {together:6.2f} s  ({together / max(alone):.2f}x a mais lenta, '
+              f'{stats.summary()["pages_per_sec"]:,.0f} págs/s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Ficha técnica da versão: regex combinada (com e sem memo) versus uma busca por campo.
+
+Uso: python -m robustcar.benchmarks.specs [N]
+"""
+
+import re
+import sys
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.specs import _parse, parse_version
+
+# Referência ingênua: uma regex por campo, cada uma varrendo a versão inteira
+# (só as buscas; não trata termos colados nem monta a ficha)
+_FIELDS = (
+    re.compile(r'\b(?:AUT\.?|AUTOMATICO|AT\d?|CVT|POWERSHIFT)(?!\w)'),
+    re.compile(r'\b(?:MANUAL|MEC|MT\d?)\b'),
+    re.compile(r'\b(\d[.,]\d)L?\b'),
+    re.compile(r'\b(?:TURBO|TB|TGDI|TSI)\b'),
+    re.compile(r'\b([2-5])P\b'),
+    re.compile(r'\b(8|12|16|20)V\b'),
+    re.compile(r'\b[A-Z]{2,}\b'),
+)
+
+
+def per_field(version):
+    text = version.upper()
+    return [pattern.findall(text) for pattern in _FIELDS]
+
+
+def rate(fn, versions):
+    start = time.perf_counter()
+    for version in versions:
+        fn(version)
+    return len(versions) / (time.perf_counter() - start)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    versions = [item['version'] for chunk in ListingGenerator().chunks(n) for item in chunk]
+    distinct = len(set(versions))
+    print(f'📊 Ficha da versão — {n:,} anúncios, {distinct:,} versões distintas')
+    print(f'  uma regex por campo      {rate(per_field, versions):>12,.0f} versões/s  (sem memo)')
+    print(f'  regex combinada          {rate(_parse, versions):>12,.0f} versões/s  (sem memo)')
+    parse_version.cache_clear()
+    print(f'  regex combinada + memo   {rate(parse_version, versions):>12,.0f} versões/s  '
+          f'({parse_version.cache_info().hits / n:.1%} do cache)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Vazão sustentada de upsert no ListingStore (SQLite/WAL).
+
+Uso: python -m robustcar.benchmarks.state [N] [CHUNK]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from robustcar.state import ListingStore
+
+SNAPSHOT = os.path.join(os.path.dirname(__file__), '..', '..', 'robustcar-vehicles.json')
+
+
+def synthetic_records(n, seed=0, price_change=0.0):
+    """Registros normalizados com ids distintos; ``price_change`` = fração com preço novo."""
+    with open(SNAPSHOT, encoding='utf-8') as f:
+        base = json.load(f)
+    rng = random.Random(seed)
+    for i in range(n):
+        record = dict(base[i % len(base)])
+        record['detailUrl'] = record['detailUrl'].rsplit('-', 1)[0] + f'-{10_000_000 + i}.html'
+        if record['price'] is not None and rng.random() < price_change:
+            record['price'] = float(round(record['price'] * rng.uniform(0.9, 1.0)))
+        yield record
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunk = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.db')
+        print(f'📊 ListingStore — {n:,} anúncios, blocos de {chunk:,}')
+        with ListingStore(path, chunk_size=chunk) as store:
+            for label, stamp, change in (('inserção', '2026-01-01T00:00:00+00:00', 0.0),
+                                         ('re-coleta (5% preço)', '2026-01-02T00:00:00+00:00', 0.05)):
+                start = time.perf_counter()
+                store.upsert_many(synthetic_records(n, price_change=change), seen_at=stamp)
+                elapsed = time.perf_counter() - start
+                print(f'  {label:<22} {n / elapsed:>10,.0f} linhas/s  ({elapsed:.1f}s)')
+            history = store.conn.execute('SELECT COUNT(*) FROM price_history').fetchone()[0]
+        size = os.path.getsize(path)
+        print(f'  histórico de preços: {history:,} linhas | banco: {size / 1e6:.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
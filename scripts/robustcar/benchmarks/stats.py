@@ -0,0 +1,77 @@
+"""Estatísticas do snapshot: t-digest numa passada versus guardar e ordenar todos os valores.
+
+Mede registros/s, memória de pico (tracemalloc), erro de rank dos quantis de
+preço e o resultado de mesclar parciais por bloco, como nos workers.
+
+Uso: python -m robustcar.benchmarks.stats [N...]
+"""
+
+import bisect
+import sys
+import time
+import tracemalloc
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.normalize import normalize_vehicle
+from robustcar.stats import QUANTILES, SnapshotStats
+
+CHUNK = 5_000
+
+
+def exact(records):
+    """Referência: listas de preço/km/ano por grupo, ordenadas no fim."""
+    groups = {}
+    for record in records:
+        for key in ('*', record['category'], record['brand'], record['fuel']):
+            lists = groups.setdefault(key, ([], [], []))
+            if record['price'] is not None:
+                lists[0].append(record['price'])
+            lists[1].append(record['mileage'])
+            lists[2].append(record['year'])
+    for lists in groups.values():
+        for values in lists:
+            values.sort()
+    return groups
+
+
+def measure(fn, records):
+    """Registros/s numa execução e memória de pico (tracemalloc) em outra."""
+    start = time.perf_counter()
+    result = fn(records)
+    rate = len(records) / (time.perf_counter() - start)
+    tracemalloc.start()
+    fn(records)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, rate, peak
+
+
+def rank_error(digest, values):
+    n = len(values)
+    return max(abs(bisect.bisect_left(values, digest.quantile(q)) / n - q) for _, q in QUANTILES)
+
+
+def merged(records):
+    total = SnapshotStats()
+    for i in range(0, len(records), CHUNK):
+        total.merge(SnapshotStats().update(records[i:i + CHUNK]).compress())
+    return total
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        records = [normalize_vehicle(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        print(f'📊 Estatísticas — {n:,} veículos')
+        reference, rate, peak = measure(exact, records)
+        print(f'  listas + sort        {rate:>10,.0f} registros/s  pico {peak / 1e6:7.1f} MB')
+        single, rate, peak = measure(lambda r: SnapshotStats().update(r), records)
+        print(f'  t-digest, 1 passada  {rate:>10,.0f} registros/s  pico {peak / 1e6:7.1f} MB  '
+              f'erro de rank (preço) {rank_error(single.overall.price, reference["*"][0]):.3%}')
+        partial, rate, peak = measure(merged, records)
+        print(f'  blocos de {CHUNK:,} + merge {rate:>9,.0f} registros/s  pico {peak / 1e6:7.1f} MB  '
+              f'erro de rank (preço) {rank_error(partial.overall.price, reference["*"][0]):.3%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Suíte reproduzível: categoria, preço, km, loop completo e serialização JSON.
+
+Os anúncios vêm de ``synthetic.ListingGenerator`` (semente fixa) e são
+processados em blocos, então 10M linhas cabem em memória. Cada benchmark é
+medido ``--repeats`` vezes por bloco e fica o menor tempo. O resultado vai
+para JSON (``--out``); com ``--baseline`` os ns/linha são comparados e a saída
+é 1 se algum piorar mais que ``--threshold``.
+
+Uso:
+    python -m robustcar.benchmarks.suite --sizes 1k 100k 1M --out perf/atual.json
+    python -m robustcar.benchmarks.suite --baseline perf/base.json --threshold 0.15
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.category import CategoryClassifier
+from robustcar.normalize import clean_mileage, extract_price
+from robustcar.record import Vehicle
+from robustcar.serialize import iter_json
+
+SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+
+def parse_size(text):
+    text = text.strip().lower().replace('_', '')
+    if text[-1:] in SUFFIXES:
+        return int(float(text[:-1]) * SUFFIXES[text[-1]])
+    return int(text)
+
+
+def bench_detect_category(chunk, state):
+    # Sem cache: custo real de cada nome de modelo
+    match = state['classifier']._match
+    for v in chunk:
+        match(v['model'])
+
+
+def bench_extract_price(chunk, state):
+    for v in chunk:
+        extract_price(v['price'])
+
+
+def bench_clean_mileage(chunk, state):
+    for v in chunk:
+        clean_mileage(v['mileage'])
+
+
+def bench_process(chunk, state):
+    # Mesmo corpo do script: normalização + contagem por categoria
+    vehicles = [Vehicle.from_raw(v) for v in chunk]
+    categories = {}
+    for v in vehicles:
+        categories[v.category] = categories.get(v.category, 0) + 1
+    state['vehicles'] = vehicles
+
+
+def bench_serialize(chunk, state):
+    # Como o script grava: iter_json pretty, backend auto
+    for _ in iter_json(state['vehicles']):
+        pass
+
+
+# Ordem importa: serialize usa os veículos do process
+BENCHMARKS = {
+    'detect_category': bench_detect_category,
+    'extract_price': bench_extract_price,
+    'clean_mileage': bench_clean_mileage,
+    'process': bench_process,
+    'serialize': bench_serialize,
+}
+
+
+def run_size(rows, names, seed, repeats, chunk_size):
+    totals = dict.fromkeys(names, 0.0)
+    state = {'classifier': CategoryClassifier()}
+    if 'serialize' in names and 'process' not in names:
+        names = ['process'] + names
+    for chunk in ListingGenerator(seed).chunks(rows, chunk_size):
+        for name in names:
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter()
+                BENCHMARKS[name](chunk, state)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            if name in totals:
+                totals[name] += best
+    return [
+        {'benchmark': name, 'rows': rows, 'seconds': round(seconds, 6),
+         'nsPerRow': round(seconds * 1e9 / rows, 1),
+         'rowsPerSec': round(rows / seconds, 1) if seconds else None}
+        for name, seconds in totals.items()
+    ]
+
+
+def compare(results, baseline, threshold):
+    """Lista de (benchmark, rows, antes, depois, variação) que passaram do limite."""
+    previous = {(r['benchmark'], r['rows']): r['nsPerRow'] for r in baseline['results']}
+    regressions = []
+    print(f'\n📈 Comparação com a linha de base (limite +{threshold:.0%})')
+    for r in results:
+        before = previous.get((r['benchmark'], r['rows']))
+        if not before:
+            continue
+        change = r['nsPerRow'] / before - 1
+        flag = '❌' if change > threshold else '✅'
+        print(f"  {flag} {r['benchmark']:<16} {r['rows']:>11,}  {before:>9.1f} → "
+              f"{r['nsPerRow']:>9.1f} ns/linha  ({change:+.1%})")
+        if change > threshold:
+            regressions.append((r['benchmark'], r['rows'], before, r['nsPerRow'], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks do pipeline Robustcar')
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=[1_000, 10_000, 100_000],
+                        help='linhas por execução (aceita 1k, 10M)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--chunk-size', type=parse_size, default=100_000)
+    parser.add_argument('--out', help='grava os resultados em JSON')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para comparar')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='piora relativa tolerada em ns/linha (0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.only is None or name in args.only]
+    print(f'📊 Suíte Robustcar — semente {args.seed}, {args.repeats} repetições, '
+          f'blocos de {args.chunk_size:,}')
+    results = []
+    for rows in args.sizes:
+        for r in run_size(rows, names, args.seed, args.repeats, args.chunk_size):
+            results.append(r)
+            print(f"  {r['benchmark']:<16} {rows:>11,}  {r['nsPerRow']:>9.1f} ns/linha  "
+                  f"{r['rowsPerSec']:>12,.0f} linhas/s")
+
+    report = {
+        'generatedAt': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeats': args.repeats,
+        'chunkSize': args.chunk_size,
+        'results': results,
+    }
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f'💾 Resultados: {args.out}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('seed') != args.seed:
+            print(f"⚠️  Linha de base com outra semente ({baseline.get('seed')})")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f'❌ {len(regressions)} regressão(ões) acima de {args.threshold:.0%}')
+            return 1
+        print('✅ Sem regressões')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
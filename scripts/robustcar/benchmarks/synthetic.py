@@ -0,0 +1,90 @@
+"""Gerador determinístico de anúncios brutos no formato de ``fixtures.vehicles_data()``.
+
+As distribuições vêm do estoque real (``fixtures.vehicles_data()`` normalizado,
+não o ``robustcar-vehicles.json``, que cada execução reescreve):
+marca/modelo/versão/combustível são sorteados juntos de um anúncio real, ano,
+preço e quilometragem variam em torno dele, e cor e a taxa de "Consulte"
+seguem as frequências observadas.
+Com a mesma semente a sequência é sempre a mesma, e a de ``n`` anúncios é
+prefixo da de qualquer tamanho maior.
+"""
+
+import random
+import re
+from itertools import islice
+
+from robustcar.fixtures import vehicles_data
+from robustcar.normalize import normalize_vehicle
+
+BASE_URL = 'https://robustcar.com.br'
+FIRST_ID = 10_000_000
+MAX_YEAR = 2026
+
+
+def format_brl(value):
+    return 'R$ ' + f'{value:,.2f}'.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def format_km(value):
+    return f'{value:,}'.replace(',', '.')
+
+
+def _slug(text):
+    return '-'.join(part.capitalize() for part in re.sub(r'[^\w\s]', '', text).split())
+
+
+def load_templates():
+    return [normalize_vehicle(item) for item in vehicles_data()]
+
+
+class ListingGenerator:
+    def __init__(self, seed=42, templates=None):
+        self.seed = seed
+        self.templates = templates or load_templates()
+        colors = [t['color'] for t in self.templates]
+        self.colors = sorted(set(colors))
+        self.color_weights = [colors.count(c) for c in self.colors]
+        self.consulte_rate = sum(t['price'] is None for t in self.templates) / len(self.templates)
+        self._priced = [t['price'] for t in self.templates if t['price'] is not None]
+
+    def generate(self, n):
+        """Gera ``n`` anúncios brutos; os ``k`` primeiros não dependem de ``n``."""
+        rng = random.Random(self.seed)
+        for i in range(n):
+            t = rng.choice(self.templates)
+            year = min(MAX_YEAR, max(1995, t['year'] + rng.randint(-2, 1)))
+            age = max(0, MAX_YEAR - year)
+            mileage = int(max(0, (t['mileage'] or 1) * rng.lognormvariate(0, 0.35)
+                              + age * rng.randint(0, 4000)))
+            if rng.random() < self.consulte_rate:
+                price = 'R$ Consulte'
+            else:
+                base = t['price'] if t['price'] is not None else rng.choice(self._priced)
+                value = base * rng.lognormvariate(0, 0.12) * (1 + 0.06 * (year - t['year']))
+                price = format_brl(round(value / 10) * 10)
+            brand, model, version = t['brand'], t['model'], t['version']
+            vid = FIRST_ID + i
+            path = (f'/carros/{_slug(brand)}/{_slug(model)}/{_slug(version)}/'
+                    f'{_slug(brand)}-{_slug(model)}-{_slug(version)}-{year}'
+                    f'-São-Paulo-Sao-Paulo-{vid}.html')
+            yield {
+                "brand": brand,
+                "model": model,
+                "version": version,
+                "year": str(year),
+                "mileage": format_km(mileage),
+                "fuel": t['fuel'],
+                "color": rng.choices(self.colors, self.color_weights)[0],
+                "price": price,
+                "detailUrl": path,
+            }
+
+    def chunks(self, n, size=100_000):
+        """Blocos (listas) de até ``size`` anúncios, somando ``n``."""
+        listings = self.generate(n)
+        for start in range(0, n, size):
+            yield list(islice(listings, size))
+
+
+def generate(n, seed=42):
+    return list(ListingGenerator(seed).generate(n))
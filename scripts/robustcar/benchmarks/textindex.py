@@ -0,0 +1,61 @@
+"""Busca BM25 top-10: MaxScore com tetos por bloco versus acumulação sem poda.
+
+Uso: python -m robustcar.benchmarks.textindex [N...]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.record import Vehicle
+from robustcar.textindex import TextIndex, write_text_index
+
+QUERIES = (
+    'onix premier automático',
+    'corolla xei 2.0',
+    'hb20 comfort 1.0',
+    'creta platinum turbo',
+    'fiat uno attractive',
+    'suv turbo',
+    'toyota',
+    '1.0 flex manual',
+)
+
+
+def latencies(fn, query, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(query, 10)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for n in sizes:
+        vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+        path = os.path.join(tempfile.mkdtemp(), 'bench.rtxt')
+        start = time.perf_counter()
+        size = write_text_index(vehicles, path)
+        built = time.perf_counter() - start
+        del vehicles
+        print(f'📊 BM25 — {n:,} documentos: {size / 1e6:.1f} MB, construído em {built:.1f} s')
+        with TextIndex(path) as index:
+            repeats = 20 if n <= 100_000 else 5
+            for query in QUERIES:
+                pruned, exhaustive = index.search(query, 10), index.search_exhaustive(query, 10)
+                assert [d for d, _ in pruned] == [d for d, _ in exhaustive], query
+                p50, p95 = latencies(index.search, query, repeats)
+                e50, _ = latencies(index.search_exhaustive, query, max(3, repeats // 4))
+                print(f'  {query:<26} MaxScore p50 {p50 * 1e3:8.2f} ms  p95 {p95 * 1e3:8.2f} ms | '
+                      f'sem poda {e50 * 1e3:8.2f} ms  ({e50 / p50:5.1f}x)')
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
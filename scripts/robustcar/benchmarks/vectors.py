@@ -0,0 +1,87 @@
+"""Top-10 por cosseno: IVF (vários ``nprobe``) versus varredura exata da matriz ``.npy``.
+
+Os vetores são as descrições de anúncios sintéticos no ``LocalBackend``; as
+consultas são descrições de anúncios fora da matriz. Recall@10 é medido contra
+a varredura exata (força bruta); como há muitos anúncios com a mesma
+descrição, um resultado conta se o score empata com o 10º exato.
+
+Uso: python -m robustcar.benchmarks.vectors [--dims D] [--queries Q] [N...]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.embeddings import EmbeddingStage, LocalBackend
+from robustcar.record import Vehicle
+from robustcar.vectors import VectorIndex, build_ivf, ids_path, ivf_path, vehicle_ids, write_vectors
+
+NPROBES = (1, 4, 8, 16, 32)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[max(0, int(len(samples) * 0.95) - 1)]
+
+
+def timed(fn, queries):
+    results, samples = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        samples.append(time.perf_counter() - start)
+    return results, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sizes', nargs='*', type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--dims', type=int, default=256,
+                        help='dimensões do LocalBackend (1536 = text-embedding-3-small)')
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    backend = LocalBackend(args.dims)
+    for n in args.sizes:
+        generator = ListingGenerator().chunks(n + args.queries)
+        vehicles = [Vehicle.from_raw(item) for chunk in generator for item in chunk]
+        vehicles, held_out = vehicles[:n], vehicles[n:]
+        path = os.path.join(tempfile.mkdtemp(), 'bench.vectors.npy')
+
+        start = time.perf_counter()
+        stage = EmbeddingStage(backend)
+        write_vectors(stage.embed_vehicles(vehicles), path, n, args.dims, vehicle_ids(vehicles), backend.name)
+        embedded = time.perf_counter() - start
+        start = time.perf_counter()
+        with VectorIndex(path) as index:
+            lists = build_ivf(index.matrix, ivf_path(path))
+        clustered = time.perf_counter() - start
+        queries = [np.frombuffer(blob, dtype='<f4') for blob in EmbeddingStage(backend).embed_vehicles(held_out)]
+        print(f'📊 Vetores — {n:,} x {args.dims} ({os.path.getsize(path) / 1e6:.0f} MB): '
+              f'embeddings + matriz {embedded:.1f} s, IVF com {lists} listas {clustered:.1f} s')
+
+        with VectorIndex(path) as index:
+            index.search_exact(queries[0])  # aquece o mmap
+            exact, samples = timed(index.search_exact, queries)
+            p50, p95 = percentiles(samples)
+            print(f'  exato              p50 {p50 * 1e3:8.2f} ms  p95 {p95 * 1e3:8.2f} ms')
+            # Score do 10º exato; abaixo disso (com folga de arredondamento) é erro do IVF
+            floors = [result[-1][1] - 1e-5 for result in exact]
+            for nprobe in NPROBES:
+                approx, samples = timed(lambda q: index.search_ivf(q, 10, nprobe), queries)
+                recall = statistics.mean(sum(score >= floor for _, score in a) / 10
+                                         for floor, a in zip(floors, approx))
+                p50, p95 = percentiles(samples)
+                print(f'  ivf nprobe={nprobe:<3}     p50 {p50 * 1e3:8.2f} ms  p95 {p95 * 1e3:8.2f} ms  '
+                      f'recall@10 {recall:6.1%}')
+        for name in (path, ids_path(path), ivf_path(path)):
+            os.remove(name)
+
+
+if __name__ == '__main__':
+    main()
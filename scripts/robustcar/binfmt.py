@@ -0,0 +1,36 @@
+"""Peças comuns dos formatos binários RCAR, RFAC e RTXT.
+
+Os três gravam blocos little-endian alinhados em 8 bytes depois de um
+cabeçalho JSON, e os leitores fazem mmap e leem os blocos sem cópia. Tipos
+pelo nome usado nos cabeçalhos (``u8``, ``u32``, ``f64``...).
+"""
+
+import sys
+from array import array
+
+TYPECODES = {'u8': 'B', 'u16': 'H', 'u32': 'I', 'i16': 'h', 'i32': 'i', 'f64': 'd'}
+ALIGNMENT = 8
+
+
+def pad(size):
+    """Bytes de padding até o próximo múltiplo de ``ALIGNMENT``."""
+    return -size % ALIGNMENT
+
+
+def le_bytes(values):
+    """``array`` -> bytes little-endian."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def le_view(buffer, offset, length, dtype):
+    """Bloco little-endian de ``buffer`` como sequência de ``dtype``: memoryview sem
+    cópia; em máquinas big-endian, um ``array`` convertido."""
+    view = memoryview(buffer)[offset:offset + length]
+    if sys.byteorder == 'big' and dtype != 'u8':
+        values = array(TYPECODES[dtype], view.tobytes())
+        values.byteswap()
+        return values
+    return view.cast(TYPECODES[dtype])
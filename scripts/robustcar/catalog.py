@@ -0,0 +1,360 @@
+"""Dicionário canônico de marcas e modelos, com resolução aproximada.
+
+``detect_category`` procura palavras-chave dentro do nome do modelo, então
+depende de sorte com substrings ("KA" casa qualquer modelo que contenha KA).
+Aqui cada marca e modelo tem um id, um nome de exibição, apelidos e, para os
+modelos, a categoria curada. A resolução de um texto é feita em camadas:
+
+1. chave normalizada (sem acento, maiúscula, separadores viram espaço)
+   procurada numa trie: O(comprimento) e também devolve o maior prefixo
+   cadastrado, o que resolve ``RAV4H`` -> RAV4 e ``KA 10`` -> KA;
+2. se nada casar, uma BK-tree por marca procura o apelido mais próximo com
+   distância de edição limitada (erros de digitação do feed);
+3. resultados ficam num LRU, já que marca/modelo se repetem em quase todas
+   as linhas.
+
+``resolve_url`` faz o mesmo a partir do caminho do ``detailUrl``
+(``/carros/Fiat/Fiat/Palio-Fire...``, ``/carros/Volkswagen/Novo/Voyage-10...``).
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+# (id, nome, apelidos, ((id, nome, categoria, apelidos), ...))
+CATALOG = (
+    ('caoa-chery', 'CAOA CHERY', ('CHERY', 'CAOACHERY'), (
+        ('arrizo', 'ARRIZO', 'SEDAN', ('ARRIZO 5', 'ARRIZO 6')),
+        ('tiggo', 'TIGGO', 'SUV', ('TIGGO 2', 'TIGGO 3X', 'TIGGO 5X', 'TIGGO 7', 'TIGGO 8')),
+    )),
+    ('chevrolet', 'CHEVROLET', ('GM', 'CHEV'), (
+        ('celta', 'CELTA', 'HATCH', ()),
+        ('cruze', 'CRUZE', 'SEDAN', ()),
+        ('meriva', 'MERIVA', 'MINIVAN', ()),
+        ('onix', 'ONIX', 'HATCH', ()),
+        ('onix-plus', 'ONIX PLUS', 'SEDAN', ('ONIXPLUS',)),
+        ('tracker', 'TRACKER', 'SUV', ()),
+    )),
+    ('citroen', 'CITROEN', (), (
+        ('aircross', 'AIRCROSS', 'SUV', ('C3 AIRCROSS',)),
+        ('c3', 'C3', 'HATCH', ()),
+    )),
+    ('fiat', 'FIAT', (), (
+        ('freemont', 'FREEMONT', 'SUV', ()),
+        ('idea', 'IDEA', 'MINIVAN', ()),
+        ('mobi', 'MOBI', 'HATCH', ()),
+        ('palio', 'PALIO', 'HATCH', ()),
+        ('punto', 'PUNTO', 'HATCH', ()),
+        ('strada', 'STRADA', 'PICKUP', ()),
+        ('toro', 'TORO', 'PICKUP', ()),
+        ('uno', 'UNO', 'HATCH', ()),
+    )),
+    ('ford', 'FORD', (), (
+        ('ecosport', 'ECOSPORT', 'SUV', ('ECO SPORT',)),
+        ('fiesta', 'FIESTA', 'HATCH', ()),
+        ('focus', 'FOCUS', 'SEDAN', ()),
+        ('ka', 'KA', 'HATCH', ()),
+    )),
+    ('honda', 'HONDA', (), (
+        ('city', 'CITY', 'SEDAN', ()),
+        ('civic', 'CIVIC', 'SEDAN', ()),
+        ('hr-v', 'HR-V', 'SUV', ('HRV',)),
+    )),
+    ('hyundai', 'HYUNDAI', (), (
+        ('creta', 'CRETA', 'SUV', ()),
+        ('hb20', 'HB20', 'HATCH', ('HB 20',)),
+        ('hb20s', 'HB20S', 'SEDAN', ('HB 20S', 'HB20 S')),
+        ('tucson', 'TUCSON', 'SUV', ()),
+    )),
+    ('jeep', 'JEEP', (), (
+        ('compass', 'COMPASS', 'SUV', ()),
+        ('renegade', 'RENEGADE', 'SUV', ()),
+    )),
+    ('kia', 'KIA', ('KIA MOTORS',), (
+        ('soul', 'SOUL', 'HATCH', ()),
+        ('sportage', 'SPORTAGE', 'SUV', ()),
+        ('stonic', 'STONIC', 'SUV', ()),
+    )),
+    ('mitsubishi', 'MITSUBISHI', (), (
+        ('pajero', 'PAJERO', 'SUV', ()),
+    )),
+    ('nissan', 'NISSAN', (), (
+        ('grand-livina', 'GRAND LIVINA', 'SUV', ('GRANDLIVINA', 'LIVINA')),
+        ('sentra', 'SENTRA', 'SEDAN', ()),
+    )),
+    ('peugeot', 'PEUGEOT', (), (
+        ('207', '207', 'HATCH', ()),
+    )),
+    ('renault', 'RENAULT', (), (
+        ('duster', 'DUSTER', 'SUV', ()),
+        ('kwid', 'KWID', 'HATCH', ()),
+        ('logan', 'LOGAN', 'SEDAN', ()),
+    )),
+    ('ssangyong', 'SSANGYONG', ('SSANG YONG',), (
+        ('korando', 'KORANDO', 'SUV', ()),
+    )),
+    ('toyota', 'TOYOTA', (), (
+        ('corolla', 'COROLLA', 'SEDAN', ()),
+        ('corolla-cross', 'COROLLA CROSS', 'SUV', ('COROLLACROSS',)),
+        ('etios', 'ETIOS', 'HATCH', ()),
+        ('prius', 'PRIUS', 'SEDAN', ()),
+        ('rav4', 'RAV4', 'SUV', ('RAV 4',)),
+        ('yaris', 'YARIS', 'HATCH', ()),
+    )),
+    ('volkswagen', 'VOLKSWAGEN', ('VW', 'VOLKS'), (
+        ('fox', 'FOX', 'HATCH', ()),
+        ('t-cross', 'T-CROSS', 'SUV', ('TCROSS',)),
+        ('voyage', 'VOYAGE', 'SEDAN', ('NOVO VOYAGE',)),
+    )),
+    ('yamaha', 'YAMAHA', (), (
+        ('neo', 'NEO', 'MOTO', ('NEO 125',)),
+    )),
+)
+
+
+URL_SECTIONS = ('carros', 'motos')
+
+
+_SEPARATORS = re.compile(r'[^A-Z0-9]+')
+
+
+def normalize_key(text):
+    """'Caoa-Chery' -> 'CAOA CHERY': sem acento, maiúsculo, um espaço entre partes."""
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return _SEPARATORS.sub(' ', text.upper()).strip()
+
+
+class PrefixIndex:
+    """Trie de chaves normalizadas; busca exata e maior prefixo cadastrado."""
+
+    _VALUE = ''  # chave reservada no nó: nenhum caractere normalizado é vazio
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, key, value):
+        node = self._root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(self._VALUE, value)
+
+    def longest_prefix(self, key):
+        """(valor, comprimento) do maior prefixo cadastrado de ``key``."""
+        node = self._root
+        found = (None, 0)
+        for depth, char in enumerate(key):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._VALUE in node:
+                found = (node[self._VALUE], depth + 1)
+        return found
+
+
+def edit_distance(a, b, limit):
+    """Levenshtein de ``a`` e ``b``; devolve ``limit + 1`` assim que passar do limite."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Árvore BK (métrica de Levenshtein) para busca com distância limitada."""
+
+    def __init__(self):
+        self._root = None
+
+    def add(self, key, value):
+        if self._root is None:
+            self._root = (key, value, {})
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(key, node[0], len(key) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = (key, value, {})
+                return
+            node = child
+
+    def nearest(self, key, max_distance):
+        """(valor, distância) mais próximo dentro de ``max_distance``, ou (None, None)."""
+        best = (None, None)
+        limit = max_distance
+        stack = [self._root] if self._root else []
+        while stack:
+            node_key, value, children = stack.pop()
+            # Distância exata: a poda pela desigualdade triangular depende dela
+            distance = edit_distance(key, node_key, len(key) + len(node_key))
+            if distance <= limit and (best[1] is None or distance < best[1]):
+                best = (value, distance)
+                limit = distance
+            for edge, child in children.items():
+                if distance - limit <= edge <= distance + limit:
+                    stack.append(child)
+        return best
+
+
+@dataclass(frozen=True, slots=True)
+class Brand:
+    id: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class Model:
+    id: str
+    name: str
+    brand: Brand
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class Resolution:
+    brand: Brand | None
+    model: Model | None
+    method: str | None  # 'exact', 'prefix', 'fuzzy' ou None (não resolvido)
+
+    @property
+    def resolved(self):
+        return self.model is not None
+
+
+_UNRESOLVED = Resolution(None, None, None)
+
+
+class Catalog:
+    def __init__(self, entries=CATALOG, max_distance=2, cache_size=65536):
+        self.max_distance = max_distance
+        self._brands = PrefixIndex()
+        self._brand_words = {}  # apelido normalizado -> marca, para achar a marca repetida no modelo
+        self._models = {}    # id da marca -> PrefixIndex
+        self._fuzzy = {}     # id da marca -> BKTree
+        self._by_model = PrefixIndex()  # modelos de todas as marcas
+        for brand_id, brand_name, brand_aliases, models in entries:
+            brand = Brand(brand_id, brand_name)
+            for alias in (brand_name, brand_id) + tuple(brand_aliases):
+                key = normalize_key(alias)
+                self._brands.add(key, brand)
+                self._brand_words[key] = brand
+            index = self._models[brand_id] = PrefixIndex()
+            tree = self._fuzzy[brand_id] = BKTree()
+            for model_id, model_name, category, model_aliases in models:
+                model = Model(model_id, model_name, brand, category)
+                for alias in (model_name, model_id) + tuple(model_aliases):
+                    key = normalize_key(alias)
+                    index.add(key, model)
+                    tree.add(key, model)
+                    self._by_model.add(key, model)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+        self._resolve_path = lru_cache(maxsize=cache_size)(self._resolve)
+
+    @staticmethod
+    def _accept_prefix(key, length):
+        # Prefixo vale se termina numa fronteira ou sobra no máximo um
+        # caractere colado (RAV4H, HB20X); evita KA casar KAIRCROSS.
+        if length == len(key) or key[length] == ' ':
+            return True
+        rest = key[length:].split(' ', 1)[0]
+        return len(rest) <= 1
+
+    def _lookup(self, index, key):
+        value, length = index.longest_prefix(key)
+        if value is None or not self._accept_prefix(key, length):
+            return None, None
+        return value, 'exact' if length == len(key) else 'prefix'
+
+    def _brand(self, text):
+        key = normalize_key(text)
+        brand, _ = self._lookup(self._brands, key)
+        return brand
+
+    def _model(self, brand, key):
+        if brand is None:
+            model, method = self._lookup(self._by_model, key)
+            return (model, method) if model is not None else (None, None)
+        model, method = self._lookup(self._models[brand.id], key)
+        if model is not None:
+            return model, method
+        head = key.split(' ', 1)[0]
+        limit = min(self.max_distance, max(1, len(head) // 3))
+        model, _ = self._fuzzy[brand.id].nearest(head, limit)
+        return (model, 'fuzzy') if model is not None else (None, None)
+
+    def _resolve(self, brand, model):
+        found = self._brand(brand)
+        key = normalize_key(model)
+        # Feeds que repetem a marca no modelo ('KIA KIA SOUL', 'FIAT FIAT PALIO')
+        while found is not None and self._brand_words.get(key.split(' ', 1)[0]) == found:
+            key = key.partition(' ')[2]
+        match, method = self._model(found, key)
+        if match is None:
+            return Resolution(found, None, None) if found is not None else _UNRESOLVED
+        return Resolution(match.brand, match, method)
+
+    def resolve_url(self, detail_url):
+        """Resolve pela URL: ``.../carros/<Marca>/<Modelo>/<Versão>/...`` (ou ``/motos/``)."""
+        parts = detail_url.split('/')
+        for i, part in enumerate(parts):
+            if part in URL_SECTIONS:
+                parts = parts[i + 1:]
+                break
+        else:
+            return _UNRESOLVED
+        if len(parts) < 2:
+            return _UNRESOLVED
+        # O modelo da URL às vezes está quebrado entre os dois segmentos
+        # (Grand/Livina-18sl, Novo/Voyage-10), então vão os dois juntos.
+        return self._resolve_path(parts[0], ' '.join(parts[1:3]))
+
+    def resolve_many(self, records):
+        resolve = self.resolve
+        return [resolve(record['brand'], record['model']) for record in records]
+
+
+_default_catalog = None
+
+
+def default_catalog():
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = Catalog()
+    return _default_catalog
+
+
+def resolve(brand, model):
+    return default_catalog().resolve(brand, model)
+
+
+def resolve_url(detail_url):
+    return default_catalog().resolve_url(detail_url)
+
+
+def canonicalize(vehicles, catalog=None):
+    """Troca marca/modelo pelos nomes canônicos e a categoria pela do dicionário.
+
+    Devolve (veículos, contagem por método); não resolvidos ficam como estão
+    e entram na contagem como ``None``.
+    """
+    catalog = catalog or default_catalog()
+    counts = {}
+    result = []
+    for vehicle, found in zip(vehicles, catalog.resolve_many(vehicles)):
+        counts[found.method] = counts.get(found.method, 0) + 1
+        if found.resolved:
+            vehicle = replace(vehicle, brand=found.brand.name, model=found.model.name,
+                              category=found.model.category)
+        result.append(vehicle)
+    return result, counts
@@ -0,0 +1,95 @@
+"""Classificação de carroceria a partir do nome do modelo.
+
+As palavras-chave de todas as categorias são compiladas numa única regex de
+alternância, então cada modelo é varrido uma só vez em vez de seis laços de
+substring. A ordem de prioridade da tabela é preservada: se um modelo casa
+palavras de mais de uma categoria, vence a que aparece primeiro.
+"""
+
+import re
+from functools import lru_cache
+
+# Tabela declarativa (ordem = prioridade)
+CATEGORY_TABLE = (
+    ('MOTO', ('NEO',)),
+    ('PICKUP', ('TORO', 'STRADA')),
+    ('MINIVAN', ('MERIVA', 'IDEA')),
+    ('SUV', ('CRETA', 'COMPASS', 'RENEGADE', 'TRACKER', 'ECOSPORT', 'DUSTER',
+             'HR-V', 'TUCSON', 'SPORTAGE', 'RAV4', 'TIGGO', 'KORANDO',
+             'PAJERO', 'T-CROSS', 'T CROSS', 'AIRCROSS', 'STONIC', 'GRAND LIVINA', 'FREEMONT')),
+    ('SEDAN', ('CIVIC', 'COROLLA', 'CITY', 'CRUZE', 'HB20S', 'SENTRA',
+               'LOGAN', 'VOYAGE', 'FOCUS', 'PRIUS', 'ARRIZO')),
+    ('HATCH', ('ONIX', 'HB20', 'FIESTA', 'KA', 'CELTA', 'UNO', 'PALIO',
+               'FOX', 'MOBI', 'KWID', 'ETIOS', 'YARIS', 'C3', '207',
+               'PUNTO', 'SOUL')),
+)
+
+DEFAULT_CATEGORY = 'OUTROS'
+
+
+class CategoryClassifier:
+    """Classificador compilado uma vez a partir de uma tabela de categorias."""
+
+    def __init__(self, table=CATEGORY_TABLE, default=DEFAULT_CATEGORY):
+        self.default = default
+        self._priority = {}
+        ordered = []
+        for rank, (category, keywords) in enumerate(table):
+            for keyword in keywords:
+                keyword = keyword.upper()
+                if keyword not in self._priority:
+                    self._priority[keyword] = (rank, category)
+                    ordered.append(keyword)
+
+        # Alternativas ordenadas por prioridade: em cada posição o primeiro
+        # ramo que casa já é o de maior prioridade (ex.: HB20S antes de HB20).
+        ordered.sort(key=lambda kw: self._priority[kw][0])
+        self._pattern = re.compile('|'.join(re.escape(kw) for kw in ordered))
+        self._top_rank = min((rank for rank, _ in self._priority.values()), default=0)
+        self.classify = lru_cache(maxsize=4096)(self._match)
+
+    def _match(self, model):
+        text = model.upper()
+        search = self._pattern.search
+        best = None
+        match = search(text)
+        while match is not None:
+            rank, category = self._priority[match.group()]
+            if best is None or rank < best[0]:
+                best = (rank, category)
+                if rank == self._top_rank:
+                    break
+            # Recomeça uma posição à frente para não perder ocorrências
+            # sobrepostas (ex.: KA dentro de KAIRCROSS)
+            match = search(text, match.start() + 1)
+        return best[1] if best else self.default
+
+    def classify_many(self, models):
+        """Classifica uma sequência de modelos, reaproveitando repetidos."""
+        seen = {}
+        result = []
+        for model in models:
+            category = seen.get(model)
+            if category is None:
+                category = seen[model] = self._match(model)
+            result.append(category)
+        return result
+
+
+# Compilado no primeiro uso, não no import
+_default_classifier = None
+
+
+def default_classifier():
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = CategoryClassifier()
+    return _default_classifier
+
+
+def detect_category(model):
+    return default_classifier().classify(model)
+
+
+def classify_many(models):
+    return default_classifier().classify_many(models)
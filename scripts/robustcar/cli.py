@@ -0,0 +1,376 @@
+"""Linha de comando do pipeline: ``main()`` de ``robustcar-scraper.py`` e ``python -m robustcar``.
+
+Importar este módulo não coleta, não grava nem imprime nada, e os módulos do
+pipeline (coleta assíncrona, índices, banco...) só são importados dentro de
+``build_parser``/``main``: quem quer só ``extract_price`` ou
+``detect_category`` importa ``robustcar.normalize``/``robustcar.category``
+sem pagar pelo resto. ``benchmarks/importtime.py`` vigia esse custo.
+"""
+
+import sys
+
+
+def build_parser():
+    import argparse
+
+    from robustcar import embeddings, fetch, serialize, snapshot, sources
+
+    parser = argparse.ArgumentParser(description='Normaliza o estoque da Robustcar')
+    parser.add_argument('--ndjson-in', metavar='ARQUIVO',
+                        help="modo streaming: lê anúncios brutos em NDJSON ('-' = stdin)")
+    parser.add_argument('--ndjson-out', metavar='ARQUIVO', default='-',
+                        help="destino do NDJSON normalizado ('-' = stdout)")
+    parser.add_argument('--output', metavar='ARQUIVO',
+                        help='destino do snapshot (padrão: $ROBUSTCAR_OUTPUT ou robustcar-vehicles.json ao lado do '
+                             'script; .gz/.zst comprime)')
+    parser.add_argument('--compress', choices=snapshot.COMPRESSIONS,
+                        help='comprime o snapshot (acrescenta .gz/.zst ao destino)')
+    parser.add_argument('--keep', metavar='N', type=int, default=0,
+                        help='mantém as N últimas versões com carimbo; o destino vira o ponteiro latest')
+    parser.add_argument('--json-format', choices=serialize.FORMATS, default='pretty',
+                        help='pretty (padrão, indentado como antes) ou compact (sem espaços)')
+    parser.add_argument('--json-backend', choices=('auto', *serialize.BACKENDS), default='auto',
+                        help='codificador JSON do snapshot (auto: orjson > msgspec > stdlib)')
+    parser.add_argument('--stats', metavar='ARQUIVO',
+                        help='destino do JSON de estatísticas (padrão: ao lado do snapshot ou do --ndjson-out)')
+    parser.add_argument('--fetch', action='store_true',
+                        help='coleta as páginas do site em vez de usar robustcar/data/vehicles.json')
+    parser.add_argument('--source', dest='sources', metavar='LOJA', action='append',
+                        choices=sorted(sources.SOURCES),
+                        help='loja a coletar (repetível, implica --fetch; padrão: robustcar)')
+    parser.add_argument('--base-url', default=fetch.BASE_URL,
+                        help='origem da coleta da Robustcar (ex.: servidor local de fixtures)')
+    parser.add_argument('--pages', type=int,
+                        help='número de páginas de busca (padrão: até achar uma vazia)')
+    parser.add_argument('--details', action='store_true',
+                        help='visita cada detailUrl e descarta anúncios vendidos (404/410)')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='conexões simultâneas no total')
+    parser.add_argument('--per-host', type=int, default=4,
+                        help='conexões simultâneas por host')
+    parser.add_argument('--rate', type=float,
+                        help='limite global de requisições/s, somando todas as lojas')
+    parser.add_argument('--http-cache', metavar='ARQUIVO',
+                        help='arquivo de ETag/Last-Modified para requisições condicionais')
+    parser.add_argument('--state-db', metavar='ARQUIVO',
+                        help='banco SQLite com o estado dos anúncios entre execuções')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processos para a normalização (1 = sem paralelismo)')
+    parser.add_argument('--canonical', action='store_true',
+                        help='normaliza marca/modelo/categoria pelo dicionário canônico')
+    parser.add_argument('--dedup', action='store_true',
+                        help='remove anúncios quase duplicados (MinHash/LSH) e grava os clusters')
+    parser.add_argument('--columnar', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava também o snapshot colunar RCAR (padrão: ao lado do JSON)')
+    parser.add_argument('--facets', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava também o índice de facetas/faixas RFAC (padrão: ao lado do JSON)')
+    parser.add_argument('--text-index', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava também o índice BM25 RTXT de marca/modelo/versão (padrão: ao lado do JSON)')
+    parser.add_argument('--specs', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava a ficha técnica de cada versão (câmbio, motor, turbo, portas...) '
+                             '(padrão: ao lado do JSON)')
+    parser.add_argument('--eligibility', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava a elegibilidade Uber/99 por regras, sem LLM (padrão: ao lado do JSON)')
+    parser.add_argument('--embeddings', metavar='ARQUIVO', nargs='?', const='',
+                        help='calcula os embeddings das descrições com cache SQLite (padrão: ao lado do JSON)')
+    parser.add_argument('--embedding-backend', choices=sorted(embeddings.BACKENDS), default='local',
+                        help='backend dos embeddings (local = determinístico, sem rede)')
+    parser.add_argument('--vectors', metavar='ARQUIVO', nargs='?', const='',
+                        help='grava a matriz float32 normalizada .npy + ids (requer numpy; padrão: ao lado do JSON)')
+    parser.add_argument('--ivf', metavar='LISTAS', type=int, nargs='?', const=0,
+                        help='com --vectors, grava também o índice IVF (padrão: sqrt(veículos) listas)')
+    parser.add_argument('--load-db', metavar='URL',
+                        help='carrega o snapshot na tabela Vehicle (sqlite:///arquivo.db ou postgresql://...)')
+    parser.add_argument('--mark-unavailable', action='store_true',
+                        help='com --load-db, marca disponivel=false nos veículos que saíram do snapshot')
+    parser.add_argument('--profile', metavar='ARQUIVO', nargs='?', const='-',
+                        help="relatório JSON de tempo por etapa ('-' = stderr)")
+    parser.add_argument('--profile-pstats', metavar='ARQUIVO',
+                        help='grava também a saída do cProfile (pstats) da execução')
+    return parser
+
+
+def main(argv=None):
+    """Executa o pipeline com os argumentos de ``argv``; devolve o código de saída."""
+    import cProfile
+    import json
+    import os
+    from dataclasses import replace
+
+    from robustcar import (catalog, columnar, dedup, delta, eligibility, embeddings, facets, fetch, fixtures,
+                           loader, parallel, serialize, snapshot, sources, specs, stats, stream, textindex)
+    from robustcar.profiling import StageTimer, normalize_staged
+    # Normalização (preço, km, combustível, categoria) em robustcar/record.py
+    from robustcar.record import Vehicle
+    from robustcar.state import ListingStore, now_iso
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.ivf is not None and args.vectors is None:
+        parser.error('--ivf requer --vectors')
+
+    # Destino do snapshot: temporário + fsync + rename, compressão e versões opcionais
+    # (robustcar/snapshot.py); criado já aqui para falhar antes da coleta se faltar o zstd
+    writer = snapshot.SnapshotWriter(args.output or snapshot.default_output(),
+                                     compression=args.compress, keep=args.keep)
+    json_backend = serialize.resolve_backend(args.json_backend)
+
+    # Nenhum arquivo auxiliar pode cair em cima do snapshot (ex.: ids de --vectors x.npy)
+    snapshot_files = {os.path.abspath(writer.path), os.path.abspath(writer.logical_path)}
+    auxiliary = [args.stats, args.columnar, args.facets, args.text_index, args.specs, args.eligibility,
+                 args.embeddings]
+    if args.vectors:
+        from robustcar import vectors
+        auxiliary += [args.vectors, vectors.ids_path(args.vectors), vectors.ivf_path(args.vectors)]
+    for path in auxiliary:
+        if path and os.path.abspath(path) in snapshot_files:
+            parser.error(f'{path} sobrescreveria o snapshot {writer.path}')
+
+    # Instrumentação (robustcar/profiling.py)
+    timer = StageTimer()
+    profiler = None
+    if args.profile_pstats:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish_profile():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile_pstats)
+        if args.profile:
+            timer.write_report(args.profile)
+
+
+    # Modo streaming: memória constante, não materializa a lista de veículos
+    if args.ndjson_in:
+        store = ListingStore(args.state_db) if args.state_db else None
+        # Sem arquivo de destino (stdout), só grava as estatísticas com --stats
+        stats_output = args.stats or (stats.stats_path(args.ndjson_out) if args.ndjson_out != '-' else None)
+        snapshot_stats = stats.SnapshotStats() if stats_output else None
+        try:
+            timer.begin('stream')
+            total = stream.run(args.ndjson_in, args.ndjson_out, store=store,
+                               workers=args.workers, stats=snapshot_stats)
+            timer.end(total)
+        except BrokenPipeError:
+            # Consumidor fechou o pipe (ex.: `| head`)
+            sys.stderr.close()
+            return 1
+        finally:
+            if store is not None:
+                store.close()
+        if snapshot_stats is not None:
+            stats.write_stats(snapshot_stats, stats_output)
+            print(f"💾 Estatísticas salvas em: {stats_output}", file=sys.stderr)
+        print(f"✅ {total} veículos normalizados", file=sys.stderr)
+        finish_profile()
+        return 0
+
+    # Coleta assíncrona de todas as lojas sob um só orçamento (robustcar/sources.py, robustcar/fetch.py)
+    timer.begin('load')
+    fetched = None
+    if args.fetch or args.sources:
+        fetch_stats = fetch.FetchStats()
+        selected = [replace(sources.SOURCES[name], base_url=args.base_url) if name == 'robustcar'
+                    else sources.SOURCES[name] for name in dict.fromkeys(args.sources or ['robustcar'])]
+        fetched, per_source = sources.scrape_sources_sync(
+            selected, pages=args.pages, details=args.details, limit=args.concurrency,
+            limit_per_host=args.per_host, rate=args.rate,
+            cache=fetch.HttpCache(args.http_cache), stats=fetch_stats)
+        print(f"🌐 Coleta: {json.dumps(fetch_stats.summary())}")
+        if len(selected) > 1:
+            print(f"🏬 Lojas: {json.dumps(per_source)}")
+
+
+    # Processar os dados: coletados ou os anúncios das 4 páginas (robustcar/fixtures.py)
+    source = fetched if fetched is not None else fixtures.vehicles_data()
+    timer.end(len(source))
+    if args.workers > 1:
+        with timer.stage('normalize', len(source)):
+            vehicles = parallel.normalize_many(source, args.workers)
+    elif args.profile:
+        vehicles = normalize_staged(source, timer)
+    else:
+        vehicles = [Vehicle.from_raw(vehicle) for vehicle in source]
+
+    # Marca/modelo canônicos (robustcar/catalog.py)
+    if args.canonical:
+        with timer.stage('canonical', len(vehicles)):
+            vehicles, resolved = catalog.canonicalize(vehicles)
+        print(f"📚 Dicionário: {resolved.get('exact', 0)} exatos, {resolved.get('prefix', 0)} por prefixo, "
+              f"{resolved.get('fuzzy', 0)} aproximados, {resolved.get(None, 0)} sem correspondência")
+
+    # Quase duplicados entre lojas (robustcar/dedup.py)
+    clusters = None
+    if args.dedup:
+        with timer.stage('dedup', len(vehicles)):
+            all_vehicles = vehicles
+            vehicles, clusters = dedup.deduplicate(all_vehicles)
+
+    # Estado persistente (robustcar/state.py)
+    if args.state_db:
+        seen_at = now_iso()
+        with timer.stage('state', len(vehicles)), ListingStore(args.state_db) as store:
+            store.upsert_many(vehicles, seen_at=seen_at)
+            state_new = store.count_new(seen_at)
+            state_removed = store.mark_removed(seen_at)
+        print(f"🗄️  Estado: {state_new} anúncios novos, {state_removed} removidos desde a última coleta")
+
+    # Gerar estatísticas numa passada (robustcar/stats.py)
+    timer.begin('stats')
+    snapshot_stats = stats.SnapshotStats().update(vehicles)
+    total = snapshot_stats.total
+    categories = snapshot_stats.counts('byCategory')
+    timer.end(total)
+
+    # Salvar JSON (destino definido no início); arquivos auxiliares seguem o caminho lógico .json
+    output_path = writer.logical_path
+    stats_output = args.stats or stats.stats_path(output_path)
+
+    # Delta em relação ao snapshot anterior (robustcar/delta.py)
+    with timer.stage('delta', total):
+        changes = delta.compute_delta(delta.load_snapshot(writer.path), vehicles)
+        changes_path = delta.delta_path(output_path)
+        delta.write_delta(changes, changes_path)
+
+    if clusters is not None:
+        clusters_output = dedup.clusters_path(output_path)
+        dedup.write_clusters(clusters, all_vehicles, clusters_output)
+
+    # Serialização em blocos direto no arquivo (robustcar/serialize.py)
+    with timer.stage('write', total):
+        chunks = serialize.iter_json(vehicles, args.json_format, json_backend)
+        write_stats = writer.write(timer.timed('serialize', chunks, total))
+        stats.write_stats(snapshot_stats, stats_output)
+
+    # Snapshot colunar opcional (robustcar/columnar.py)
+    columnar_output = None
+    if args.columnar is not None:
+        columnar_output = args.columnar or columnar.columnar_path(output_path)
+        with timer.stage('columnar', total):
+            columnar.write_columnar(vehicles, columnar_output)
+
+    # Índice de facetas para a busca (robustcar/facets.py)
+    facets_output = None
+    if args.facets is not None:
+        facets_output = args.facets or facets.facets_path(output_path)
+        with timer.stage('facets', total):
+            facets.write_facets(vehicles, facets_output)
+
+    # Índice de texto para busca sem embeddings (robustcar/textindex.py)
+    text_index_output = None
+    if args.text_index is not None:
+        text_index_output = args.text_index or textindex.text_index_path(output_path)
+        with timer.stage('text_index', total):
+            textindex.write_text_index(vehicles, text_index_output)
+
+    # Ficha técnica por versão distinta (robustcar/specs.py)
+    specs_output = None
+    if args.specs is not None:
+        specs_output = args.specs or specs.specs_path(output_path)
+        with timer.stage('specs', total):
+            version_table = specs.version_specs(vehicles)
+            with open(specs_output, 'w', encoding='utf-8') as f:
+                json.dump(version_table, f, ensure_ascii=False, indent=2)
+
+    # Elegibilidade Uber/99 por regras; só combinações ambíguas iriam ao LLM (robustcar/eligibility.py)
+    eligibility_engine = eligibility.EligibilityEngine()
+    eligibility_output = None
+    if args.eligibility is not None:
+        eligibility_output = args.eligibility or eligibility.eligibility_path(output_path)
+        with timer.stage('eligibility', total):
+            eligibility_stats = eligibility.write_eligibility(vehicles, eligibility_output, eligibility_engine)
+        print(f"🚕 Uber/99: {eligibility_stats['aptoUber']} aptos, {eligibility_stats['aptoUberBlack']} Black, "
+              f"{eligibility_stats['review']} para revisão — {eligibility_stats['llmCalls']} chamadas ao LLM "
+              f"({eligibility_stats['llmCallsAvoided']} evitadas)")
+
+    # Embeddings das descrições do seed, só os textos novos vão ao backend (robustcar/embeddings.py)
+    embedding_stage = None
+    vectors_output = None
+    if args.embeddings is not None or args.vectors is not None:
+        embeddings_output = args.embeddings or embeddings.embeddings_cache_path(output_path)
+        with timer.stage('embeddings', total), embeddings.EmbeddingCache(embeddings_output) as cache:
+            backend = embeddings.BACKENDS[args.embedding_backend]()
+            embedding_stage = embeddings.EmbeddingStage(backend, cache)
+            embedded = embedding_stage.embed_vehicles(vehicles)
+            if args.vectors is None:
+                for _ in embedded:
+                    pass
+            else:
+                # Matriz para busca por cosseno sem JSON.parse (robustcar/vectors.py, requer numpy)
+                from robustcar import vectors
+                vectors_output = args.vectors or vectors.vectors_path(output_path)
+                matrix = vectors.write_vectors(embedded, vectors_output, total, backend.dimensions,
+                                               vectors.vehicle_ids(vehicles), backend.name)
+        if args.ivf is not None and vectors_output and total:
+            with timer.stage('ivf', total):
+                ivf_lists = vectors.build_ivf(matrix, vectors.ivf_path(vectors_output), args.ivf or None)
+            print(f"🧭 IVF: {ivf_lists} listas")
+
+    # Carga em lote na tabela Vehicle, no lugar do seed linha a linha (robustcar/loader.py)
+    load_stats = None
+    if args.load_db:
+        conn = loader.connect(args.load_db)
+        try:
+            with timer.stage('load_db', total):
+                load_stats = loader.BulkLoader(conn, eligibility=eligibility_engine).load(
+                    vehicles, retire_missing=args.mark_unavailable)
+        finally:
+            conn.close()
+        print(f"🗃️  Banco: {load_stats['inserted']} inseridos, {load_stats['updated']} atualizados, "
+              f"{load_stats['retired']} indisponíveis, {load_stats['skipped']} pulados "
+              f"({load_stats['rowsPerSec']:,.0f} linhas/s)")
+
+    print(f"✅ Scraping completo!")
+    print(f"\n📊 RESUMO:")
+    print(f"Total de veículos extraídos: {total}")
+    print(f"\n📈 Distribuição por categoria:")
+    for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+        print(f"  {cat}: {count}")
+
+    print(f"\n🔁 Mudanças desde o último snapshot:")
+    print(f"  Novos: {len(changes['added'])} | Alterados: {len(changes['changed'])} "
+          f"(quedas de preço: {sum(c['priceDrop'] for c in changes['changed'])}) | "
+          f"Removidos/vendidos: {len(changes['removed'])} | Sem mudança: {changes['unchanged']}")
+
+    print(f"\n💾 Arquivo salvo em: {writer.path}")
+    if writer.compression or writer.keep or args.json_format != 'pretty':
+        print(f"   {json_backend}/{args.json_format}: "
+              f"{write_stats['bytes']:,} → {write_stats['storedBytes']:,} bytes "
+              f"({writer.compression or 'sem compressão'}, "
+              f"{write_stats['storedBytes'] / write_stats['bytes']:.0%}), "
+              f"{write_stats['mbPerSec']:,.0f} MB/s"
+              + (f", versão {write_stats['path']}" if writer.keep else ''))
+    print(f"💾 Delta salvo em: {changes_path}")
+    print(f"💾 Estatísticas salvas em: {stats_output}")
+    if clusters is not None:
+        print(f"💾 Duplicatas ({len(all_vehicles) - total} removidas em {len(clusters)} clusters) "
+              f"salvas em: {clusters_output}")
+    if columnar_output:
+        print(f"💾 Snapshot colunar salvo em: {columnar_output}")
+    if facets_output:
+        print(f"💾 Índice de facetas salvo em: {facets_output}")
+    if text_index_output:
+        print(f"💾 Índice de texto salvo em: {text_index_output}")
+    if specs_output:
+        print(f"💾 Ficha técnica ({len(version_table)} versões) salva em: {specs_output}")
+    if eligibility_output:
+        print(f"💾 Elegibilidade Uber/99 salva em: {eligibility_output}")
+    if embedding_stage is not None:
+        print(f"💾 Embeddings ({embedding_stage.unique} textos, {embedding_stage.hit_rate:.0%} do cache, "
+              f"{embedding_stage.computed} calculados a {embedding_stage.vectors_per_second:,.0f} vetores/s) "
+              f"em: {embeddings_output}")
+    if vectors_output:
+        print(f"💾 Matriz de vetores salva em: {vectors_output}")
+
+    print(f"\n🚗 Exemplos de veículos:")
+    for i, v in enumerate(vehicles[:3], 1):
+        print(f"\n{i}. {v['brand']} {v['model']} {v['version']}")
+        print(f"   Ano: {v['year']} | KM: {v['mileage']:,}")
+        print(f"   Combustível: {v['fuel']} | Cor: {v['color']}")
+        print(f"   Preço: {'R$ {:,.2f}'.format(v['price']) if v['price'] else 'Consulte'}")
+        print(f"   Categoria: {v['category']}")
+        print(f"   URL: {v['detailUrl']}")
+
+    finish_profile()
+    return 0
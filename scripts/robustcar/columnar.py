@@ -0,0 +1,189 @@
+"""Snapshot colunar compacto (formato ``RCAR``) ao lado do JSON formatado.
+
+Layout (little-endian, todas as colunas alinhadas em 8 bytes)::
+
+    magic   b'RCAR'
+    u16     versão do formato (1)
+    u16     reservado
+    u32     tamanho do cabeçalho JSON
+    bytes   cabeçalho JSON (utf-8), com padding até múltiplo de 8
+    ...     blocos das colunas, nos offsets indicados no cabeçalho
+
+O cabeçalho traz ``rows`` e a lista ``columns``; cada coluna tem ``name`` e
+``kind``:
+
+- ``dict``: índices ``u8``/``u16``/``u32`` em ``data`` + ``dictionary`` (lista
+  de strings no próprio cabeçalho). Usado em brand/model/fuel/color/category.
+- ``num``: valores de tipo ``i16``/``i32``/``f64`` em ``data``. Preço ausente
+  ("Consulte") é gravado como NaN.
+- ``str``: ``offsets`` (``u32``, rows + 1) e ``data`` com o utf-8 concatenado.
+
+``data``/``offsets`` são pares ``[offset, tamanho]`` em bytes a partir do
+início do arquivo. Leitores podem fazer mmap e ler só as colunas que usam.
+"""
+
+import json
+import math
+import mmap
+import struct
+from array import array
+
+from robustcar.binfmt import TYPECODES, le_bytes, le_view, pad
+from robustcar.snapshot import sidecar_path
+
+MAGIC = b'RCAR'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<4sHHI')
+
+# (nome, kind, tipo) na ordem das chaves do JSON
+SCHEMA = (
+    ('brand', 'dict', None),
+    ('model', 'dict', None),
+    ('version', 'str', None),
+    ('year', 'num', 'i16'),
+    ('mileage', 'num', 'i32'),
+    ('fuel', 'dict', None),
+    ('color', 'dict', None),
+    ('price', 'num', 'f64'),
+    ('detailUrl', 'str', None),
+    ('category', 'dict', None),
+)
+
+_LIMITS = {'i16': (-2 ** 15, 2 ** 15 - 1), 'i32': (-2 ** 31, 2 ** 31 - 1)}
+
+
+def _index_type(cardinality):
+    if cardinality <= 0xFF:
+        return 'u8'
+    if cardinality <= 0xFFFF:
+        return 'u16'
+    return 'u32'
+
+
+def _encode_column(name, kind, dtype, values):
+    """Devolve (metadados da coluna, [blocos de bytes])."""
+    if kind == 'dict':
+        codes = {}
+        indices = [codes.setdefault(value, len(codes)) for value in values]
+        index_type = _index_type(len(codes))
+        meta = {'name': name, 'kind': kind, 'type': index_type, 'dictionary': list(codes)}
+        return meta, [le_bytes(array(TYPECODES[index_type], indices))]
+    if kind == 'num':
+        if dtype == 'f64':
+            values = [math.nan if value is None else value for value in values]
+        else:
+            low, high = _LIMITS[dtype]
+            if values and not (low <= min(values) and max(values) <= high):
+                raise OverflowError(f'coluna {name} fora do intervalo {dtype}')
+        return {'name': name, 'kind': kind, 'type': dtype}, [le_bytes(array(TYPECODES[dtype], values))]
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array('I', [0])
+    total = 0
+    for chunk in encoded:
+        total += len(chunk)
+        offsets.append(total)
+    if total > 0xFFFFFFFF:
+        raise OverflowError(f'coluna {name} excede 4 GiB')
+    return {'name': name, 'kind': kind}, [le_bytes(offsets), b''.join(encoded)]
+
+
+def write_columnar(vehicles, path):
+    """Grava a lista de veículos normalizados no formato RCAR; devolve o tamanho em bytes."""
+    metas, blocks = [], []
+    for name, kind, dtype in SCHEMA:
+        meta, column_blocks = _encode_column(name, kind, dtype, [v[name] for v in vehicles])
+        metas.append(meta)
+        blocks.append(column_blocks)
+
+    # Offsets dependem do tamanho do cabeçalho, que depende dos offsets:
+    # calcula com espaço reservado e repete até estabilizar.
+    header = {'rows': len(vehicles), 'columns': metas}
+    header_bytes = b''
+    while True:
+        position = _PREAMBLE.size + len(header_bytes) + pad(_PREAMBLE.size + len(header_bytes))
+        for meta, column_blocks in zip(metas, blocks):
+            spans = []
+            for block in column_blocks:
+                spans.append([position, len(block)])
+                position += len(block) + pad(len(block))
+            if meta['kind'] == 'str':
+                meta['offsets'], meta['data'] = spans
+            else:
+                meta['data'] = spans[0]
+        encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        stable = len(encoded) == len(header_bytes)
+        header_bytes = encoded
+        if stable:
+            break
+
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * pad(_PREAMBLE.size + len(header_bytes)))
+        for column_blocks in blocks:
+            for block in column_blocks:
+                f.write(block)
+                f.write(b'\0' * pad(len(block)))
+        return f.tell()
+
+
+class ColumnarSnapshot:
+    """Leitura via mmap; cada coluna só é decodificada quando pedida."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_len = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path}: não é um snapshot RCAR v{FORMAT_VERSION}')
+        header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        self.rows = header['rows']
+        self.meta = {column['name']: column for column in header['columns']}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _view(self, span, dtype):
+        offset, length = span
+        return le_view(self._map, offset, length, dtype)
+
+    def raw(self, name):
+        """Valores numéricos ou índices de dicionário, sem cópia (memoryview)."""
+        meta = self.meta[name]
+        return self._view(meta['data'], meta['type'])
+
+    def dictionary(self, name):
+        return self.meta[name]['dictionary']
+
+    def column(self, name):
+        """Coluna decodificada como lista Python (None para preço ausente)."""
+        meta = self.meta[name]
+        if meta['kind'] == 'dict':
+            dictionary = meta['dictionary']
+            return [dictionary[i] for i in self.raw(name)]
+        if meta['kind'] == 'num':
+            values = self.raw(name).tolist()
+            if meta['type'] == 'f64':
+                return [None if value != value else value for value in values]
+            return values
+        offsets = self._view(meta['offsets'], 'u32')
+        start = meta['data'][0]
+        data = self._map[start:start + meta['data'][1]]
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.rows)]
+
+    def records(self):
+        """Reconstrói os registros no formato do JSON."""
+        names = [name for name, _, _ in SCHEMA]
+        columns = [self.column(name) for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def columnar_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.rcar')
@@ -0,0 +1,139 @@
+"""Parse colunar (NumPy) de preço e quilometragem para lotes inteiros.
+
+Equivalente a ``extract_price`` / ``clean_mileage`` aplicados linha a linha,
+mas trabalhando sobre a matriz de code points das strings:
+
+- preço em pt-BR: ``.`` é separador de milhar (ignorado) e ``,`` é o decimal;
+  "R$ Consulte" e textos sem dígitos viram NaN com ``missing=True``;
+- quilometragem: ``.`` e ``,`` são separadores de milhar; sem dígitos vira 0.
+
+Linhas fora do formato simples (outros caracteres, mais de uma vírgula,
+dígitos demais, texto muito longo) caem na função escalar, então o resultado
+é sempre idêntico ao caminho linha a linha. NumPy é dependência opcional: só
+este módulo a importa.
+"""
+
+import numpy as np
+
+from robustcar.normalize import clean_mileage, extract_price
+
+MAX_WIDTH = 32
+BLOCK_ROWS = 65_536
+
+_ZERO = ord('0')
+_COMMA = ord(',')
+
+# Tabelas de caracteres aceitos no caminho vetorizado (índice = byte)
+_DIGITS = np.zeros(256, dtype=bool)
+_DIGITS[_ZERO:_ZERO + 10] = True
+_PRICE_CHARS = _DIGITS.copy()
+_PRICE_CHARS[[ord(c) for c in 'R$ .,']] = True
+_PRICE_CHARS[0] = True
+_MILEAGE_CHARS = _DIGITS.copy()
+_MILEAGE_CHARS[[ord(c) for c in '.,']] = True
+_MILEAGE_CHARS[0] = True
+
+# float64 representa inteiros exatamente até 2**53 (~15 dígitos com folga)
+_MAX_PRICE_DIGITS = 15
+_MAX_MILEAGE_DIGITS = 10
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+_POW10F = 10.0 ** np.arange(19)
+
+
+def _code_columns(texts):
+    """Matriz (largura, n) de bytes, uma linha por posição de caractere.
+
+    Textos ASCII viram ``S``; com acentos cai para ``U`` e os code points
+    acima de 255 são saturados (nunca são caracteres aceitos). Textos mais
+    longos que ``MAX_WIDTH`` saem vazios e marcados para o caminho escalar.
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    too_long = lengths > MAX_WIDTH
+    if too_long.any():
+        texts = ['' if flag else text for text, flag in zip(texts, too_long)]
+    width = max(1, int(lengths[~too_long].max(initial=0)))
+    try:
+        codes = np.array(texts, dtype=f'S{width}').view(np.uint8)
+    except UnicodeEncodeError:
+        codes = np.minimum(np.array(texts, dtype=f'<U{width}').view(np.uint32), 255)
+        codes = codes.astype(np.uint8)
+    return np.ascontiguousarray(codes.reshape(len(texts), width).T), too_long
+
+
+def _blocks(texts):
+    for start in range(0, len(texts), BLOCK_ROWS):
+        yield start, texts[start:start + BLOCK_ROWS]
+
+
+def parse_prices(texts):
+    """Lista de textos de preço -> (float64 com NaN, máscara ``missing``)."""
+    texts = list(texts)
+    values = np.full(len(texts), np.nan, dtype=np.float64)
+    missing = np.ones(len(texts), dtype=bool)
+    for start, block in _blocks(texts):
+        consulte = np.fromiter(('Consulte' in text for text in block), dtype=bool,
+                               count=len(block))
+        columns, fallback = _code_columns(block)
+        rows = len(block)
+        number = np.zeros(rows, dtype=np.int64)
+        n_digits = np.zeros(rows, dtype=np.int64)
+        decimals = np.zeros(rows, dtype=np.int64)
+        commas = np.zeros(rows, dtype=np.int64)
+        allowed = np.ones(rows, dtype=bool)
+        # Horner por coluna: dígitos depois da vírgula contam como casas decimais
+        for column in columns:
+            digit = _DIGITS[column]
+            number = np.where(digit, number * 10 + (column.astype(np.int64) - _ZERO), number)
+            n_digits += digit
+            commas += column == _COMMA
+            decimals += digit & (commas > 0)
+            allowed &= _PRICE_CHARS[column]
+        fallback |= ~allowed | (commas > 1) | (n_digits > _MAX_PRICE_DIGITS)
+        fallback &= ~consulte
+
+        # N / 10**k com N exato em float64 é arredondado corretamente,
+        # igual a float() do texto
+        ok = ~fallback & ~consulte & (n_digits > 0)
+        block_values = values[start:start + rows]
+        block_missing = missing[start:start + rows]
+        block_values[ok] = number[ok] / _POW10F[decimals[ok]]
+        block_missing[ok] = False
+
+        for i in np.flatnonzero(fallback):
+            price = extract_price(block[i])
+            if price is not None:
+                block_values[i] = price
+                block_missing[i] = False
+    return values, missing
+
+
+def parse_mileages(texts):
+    """Lista de textos de quilometragem -> int32 (0 quando não há número)."""
+    texts = list(texts)
+    values = np.zeros(len(texts), dtype=np.int32)
+    for start, block in _blocks(texts):
+        columns, fallback = _code_columns(block)
+        rows = len(block)
+        number = np.zeros(rows, dtype=np.int64)
+        n_digits = np.zeros(rows, dtype=np.int64)
+        allowed = np.ones(rows, dtype=bool)
+        for column in columns:
+            digit = _DIGITS[column]
+            number = np.where(digit, number * 10 + (column.astype(np.int64) - _ZERO), number)
+            n_digits += digit
+            allowed &= _MILEAGE_CHARS[column]
+        fallback |= ~allowed | (n_digits > _MAX_MILEAGE_DIGITS)
+
+        ok = ~fallback
+        if (number[ok] > _INT32_MAX).any():
+            raise OverflowError('quilometragem fora do intervalo int32')
+        block_values = values[start:start + rows]
+        block_values[ok] = number[ok]
+
+        for i in np.flatnonzero(fallback):
+            mileage = clean_mileage(block[i])
+            if not _INT32_MIN <= mileage <= _INT32_MAX:
+                raise OverflowError(f'quilometragem fora do intervalo int32: {block[i]!r}')
+            block_values[i] = mileage
+    return values
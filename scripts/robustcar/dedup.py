@@ -0,0 +1,257 @@
+"""Detecção de anúncios quase duplicados entre lojas (MinHash + LSH).
+
+O mesmo carro aparece em feeds diferentes com a versão escrita de outro jeito
+("1.0 TGDI AT6 PLATINUM" x "PLATINUM 1.0 TB AUT"), preço e km ligeiramente
+diferentes. Cada registro vira um conjunto de tokens de marca/modelo/versão
+(com sinônimos de câmbio/motor unificados) e uma assinatura MinHash.
+
+Para não comparar todos com todos:
+
+1. registros com o mesmo ano e a mesma assinatura formam um grupo;
+2. grupos diferentes só viram candidatos se caírem no mesmo balde de alguma
+   banda do LSH e a similaridade estimada passar de ``min_similarity``;
+3. dentro de um grupo (ou de um par de grupos candidatos) os registros são
+   ordenados por km e só os vizinhos dentro da tolerância são confirmados
+   pelas regras de km, cor e preço. Pares da mesma loja (mesmo host do
+   ``detailUrl``) nunca são duplicatas: são unidades diferentes em estoque.
+
+Os pares confirmados são unidos (union-find) em clusters, desde que a faixa
+de km do cluster continue dentro da tolerância e nenhuma loja apareça duas
+vezes no cluster, e cada cluster
+elege um registro canônico: o que tem preço, depois a versão mais descritiva,
+depois o primeiro na entrada.
+"""
+
+import hashlib
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from robustcar.snapshot import sidecar_path
+
+_TOKEN = re.compile(r'[A-Z0-9]+(?:\.[0-9]+)?')
+
+# Grafias equivalentes nos nomes de versão dos feeds
+SYNONYMS = {
+    'AUT': 'AT', 'AUTO': 'AT', 'AUTOMATICO': 'AT', 'CVT': 'AT',
+    'MEC': 'MT', 'MANUAL': 'MT',
+    'TB': 'TURBO', 'TGDI': 'TURBO', 'TSI': 'TURBO', 'TURBOFLEX': 'TURBO',
+}
+_GEAR = re.compile(r'^(AT|MT)\d$')
+
+_MERSENNE = (1 << 61) - 1
+
+
+def tokens(record):
+    """Conjunto de shingles (tokens) de marca, modelo e versão."""
+    shingles = {'B:' + record['brand'].upper()}
+    for prefix, text in (('M:', record['model']), ('', record['version'])):
+        for token in _TOKEN.findall(text.upper()):
+            token = SYNONYMS.get(token, token)
+            if _GEAR.match(token):
+                token = token[:2]
+            shingles.add(prefix + token)
+    return shingles
+
+
+class MinHasher:
+    """Assinaturas MinHash com ``num_perm`` funções ``(a*h + b) mod p``."""
+
+    def __init__(self, num_perm=32, seed=1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._coeffs = [(rng.randrange(1, _MERSENNE), rng.randrange(_MERSENNE))
+                        for _ in range(num_perm)]
+        self._cache = {}
+
+    def _token_hashes(self, token):
+        hashes = self._cache.get(token)
+        if hashes is None:
+            h = int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'little')
+            hashes = self._cache[token] = tuple((a * h + b) % _MERSENNE for a, b in self._coeffs)
+        return hashes
+
+    def signature(self, shingles):
+        return tuple(map(min, zip(*map(self._token_hashes, shingles))))
+
+
+def source_of(record):
+    """Loja do anúncio: o host do ``detailUrl`` (já absoluto após a normalização)."""
+    return urlsplit(record['detailUrl']).netloc
+
+
+def similarity(sig_a, sig_b):
+    """Jaccard estimado pela fração de posições iguais nas assinaturas."""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+@dataclass
+class Cluster:
+    canonical: int
+    members: list = field(default_factory=list)
+
+    def to_dict(self, records):
+        return {
+            'canonical': records[self.canonical]['detailUrl'],
+            'duplicates': [records[i]['detailUrl'] for i in self.members if i != self.canonical],
+        }
+
+
+class _UnionFind:
+    """Union-find que guarda a faixa de km e as lojas de cada cluster."""
+
+    def __init__(self, mileages, sources):
+        self.parent = list(range(len(mileages)))
+        self.low = list(mileages)
+        self.high = list(mileages)
+        self.sources = [{source} for source in sources]   # lojas de cada cluster (na raiz)
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j, window):
+        """Une se a faixa de km couber em ``window(km mínimo)`` e as lojas forem distintas."""
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return
+        # Duas unidades da mesma loja nunca são o mesmo carro, nem via um terceiro
+        if not self.sources[ri].isdisjoint(self.sources[rj]):
+            return
+        low = min(self.low[ri], self.low[rj])
+        high = max(self.high[ri], self.high[rj])
+        # Sem isso, vizinhos em cadeia (A~B~C...) viram um cluster enorme
+        if high - low > window(low):
+            return
+        root, child = min(ri, rj), max(ri, rj)
+        self.parent[child] = root
+        self.low[root], self.high[root] = low, high
+        self.sources[root] |= self.sources[child]
+
+
+class Deduplicator:
+    def __init__(self, num_perm=32, bands=8, min_similarity=0.5,
+                 km_tolerance=0.01, km_slack=500, price_tolerance=0.10, seed=1):
+        if num_perm % bands:
+            raise ValueError('num_perm precisa ser múltiplo de bands')
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_similarity = min_similarity
+        self.km_tolerance = km_tolerance
+        self.km_slack = km_slack
+        self.price_tolerance = price_tolerance
+
+    def _km_window(self, km):
+        return max(self.km_slack, km * self.km_tolerance)
+
+    def _same_car(self, a, b):
+        if a['color'] and b['color'] and a['color'] != b['color']:
+            return False
+        pa, pb = a['price'], b['price']
+        if pa is not None and pb is not None and abs(pa - pb) > self.price_tolerance * max(pa, pb):
+            return False
+        return True
+
+    def _distance(self, a, b):
+        """Quão parecidos são dois registros já confirmados: km e preço relativos às tolerâncias."""
+        distance = abs(a['mileage'] - b['mileage']) / self._km_window(min(a['mileage'], b['mileage']))
+        pa, pb = a['price'], b['price']
+        if pa is not None and pb is not None and max(pa, pb):
+            distance += abs(pa - pb) / (self.price_tolerance * max(pa, pb))
+        return distance
+
+    def _sweep(self, records, indices, sources, confirmed, other=None):
+        """Confirma pares vizinhos em km de lojas diferentes; com ``other`` só pares entre os dois grupos."""
+        entries = [(records[i]['mileage'], i, 0) for i in indices]
+        if other is not None:
+            entries += [(records[i]['mileage'], i, 1) for i in other]
+        entries.sort()
+        n = len(entries)
+        pairs = 0
+        for pos, (km, i, side) in enumerate(entries):
+            limit = km + self._km_window(km)
+            for nxt in range(pos + 1, n):
+                km_j, j, side_j = entries[nxt]
+                if km_j > limit:
+                    break
+                if other is not None and side == side_j:
+                    continue
+                if sources[i] == sources[j]:
+                    continue
+                pairs += 1
+                if self._same_car(records[i], records[j]):
+                    confirmed.append((self._distance(records[i], records[j]), i, j))
+        return pairs
+
+    def find_clusters(self, records):
+        """Clusters (2+ registros) de anúncios do mesmo carro físico."""
+        groups = {}
+        for i, record in enumerate(records):
+            key = (record['year'], self.hasher.signature(tokens(record)))
+            groups.setdefault(key, []).append(i)
+
+        sources = [source_of(record) for record in records]
+        confirmed = []
+        self.comparisons = 0
+        for members in groups.values():
+            if len(members) > 1:
+                self.comparisons += self._sweep(records, members, sources, confirmed)
+
+        keys = list(groups)
+        buckets = {}
+        for g, (year, sig) in enumerate(keys):
+            for band in range(self.bands):
+                chunk = sig[band * self.rows:(band + 1) * self.rows]
+                buckets.setdefault((year, band, chunk), []).append(g)
+
+        seen = set()
+        for candidates in buckets.values():
+            for x, g in enumerate(candidates):
+                for h in candidates[x + 1:]:
+                    if (g, h) in seen:
+                        continue
+                    seen.add((g, h))
+                    if similarity(keys[g][1], keys[h][1]) >= self.min_similarity:
+                        self.comparisons += self._sweep(records, groups[keys[g]], sources, confirmed,
+                                                           groups[keys[h]])
+
+        # Pares mais parecidos primeiro: com a regra de uma unidade por loja, um
+        # vizinho qualquer não toma o lugar da duplicata de verdade
+        uf = _UnionFind([record['mileage'] for record in records], sources)
+        confirmed.sort()
+        for _, i, j in confirmed:
+            uf.union(i, j, self._km_window)
+
+        by_root = {}
+        for i in range(len(records)):
+            by_root.setdefault(uf.find(i), []).append(i)
+        return [Cluster(self._canonical(records, members), members)
+                for members in by_root.values() if len(members) > 1]
+
+    @staticmethod
+    def _canonical(records, members):
+        return min(members, key=lambda i: (records[i]['price'] is None,
+                                           -len(records[i]['version']), i))
+
+
+def deduplicate(records, **options):
+    """(registros sem duplicatas, clusters); a ordem de entrada é mantida."""
+    clusters = Deduplicator(**options).find_clusters(records)
+    dropped = {i for c in clusters for i in c.members if i != c.canonical}
+    unique = [record for i, record in enumerate(records) if i not in dropped]
+    return unique, clusters
+
+
+def clusters_path(output_path):
+    return sidecar_path(output_path, '.clusters.json')
+
+
+def write_clusters(clusters, records, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump([c.to_dict(records) for c in clusters], f, ensure_ascii=False, indent=2)
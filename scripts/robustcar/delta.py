@@ -0,0 +1,101 @@
+"""Detecção de mudanças entre dois snapshots normalizados.
+
+Cada veículo é identificado pelo id numérico no fim do ``detailUrl``
+(``...-Sao-Paulo-7279276.html`` -> ``7279276``) e comparado pelo hash do
+registro normalizado, então os consumidores (seed, embeddings) podem
+processar só o que entrou, mudou ou saiu.
+"""
+
+import hashlib
+import json
+import re
+from datetime import datetime, timezone
+
+from robustcar.snapshot import read_snapshot, sidecar_path
+
+_LISTING_ID_RE = re.compile(r'(\d+)(?:\.html?)?/?$')
+
+
+def listing_id(detail_url):
+    # Caminho rápido para o formato do site: ...-7279276.html
+    tail = detail_url.rsplit('-', 1)[-1].split('.', 1)[0]
+    if tail.isdigit():
+        return tail
+    match = _LISTING_ID_RE.search(detail_url)
+    return match.group(1) if match else detail_url
+
+
+def record_hash(record):
+    """SHA-1 do registro em forma canônica (chaves ordenadas, preço como float)."""
+    canonical = dict(record)
+    if canonical.get('price') is not None:
+        canonical['price'] = float(canonical['price'])
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def index_by_id(records):
+    return {listing_id(record['detailUrl']): record for record in records}
+
+
+def compute_delta(previous, current):
+    """Compara duas listas de registros normalizados.
+
+    Devolve ``added``, ``changed`` (com os campos alterados e ``priceDrop``)
+    e ``removed`` (vendidos ou retirados do site).
+    """
+    before = index_by_id(previous)
+    after = index_by_id(current)
+    added, changed, removed = [], [], []
+
+    for vid, record in after.items():
+        old = before.get(vid)
+        digest = record_hash(record)
+        if old is None:
+            added.append({"id": vid, "hash": digest, "record": record})
+            continue
+        old_digest = record_hash(old)
+        if digest == old_digest:
+            continue
+        changes = {key: [old.get(key), value] for key, value in record.items()
+                   if old.get(key) != value}
+        changed.append({
+            "id": vid,
+            "hash": digest,
+            "previousHash": old_digest,
+            "changes": changes,
+            "priceDrop": (old.get('price') is not None and record.get('price') is not None
+                          and record['price'] < old['price']),
+            "record": record,
+        })
+
+    for vid, record in before.items():
+        if vid not in after:
+            removed.append({"id": vid, "hash": record_hash(record), "record": record})
+
+    return {
+        "generatedAt": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "previousTotal": len(before),
+        "currentTotal": len(after),
+        "unchanged": len(after) - len(added) - len(changed),
+        "added": added,
+        "changed": changed,
+        "removed": removed,
+    }
+
+
+def delta_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.delta.json')
+
+
+def load_snapshot(path):
+    """Snapshot anterior (comprimido ou não), ou lista vazia na primeira execução."""
+    try:
+        return read_snapshot(path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def write_delta(delta, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, indent=2, default=dict)
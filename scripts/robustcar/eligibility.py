@@ -0,0 +1,180 @@
+"""Elegibilidade Uber/99 por regras, memorizada por combinação de atributos.
+
+``UberEligibilityValidator`` (src/services/uber-eligibility-validator.service.ts)
+pergunta ao LLM, veículo a veículo, algo que os próprios critérios do prompt
+decidem: ano mínimo, tipo de carroceria, portas e ar-condicionado. Aqui esses
+critérios são avaliados uma vez por chave ``(modelo canônico, ano,
+carroceria, portas, câmbio, ar)`` e o resultado é espalhado para todas as
+linhas com a mesma chave. Só fica para o LLM o que as regras não decidem:
+
+- carroceria desconhecida (``OUTROS``);
+- sedan fora das tabelas de porte, quando o ano já permitiria Comfort/Black
+  (o prompt separa "sedan compacto" de "médio/grande"/"premium").
+
+``aptoUber`` = Uber X/99Pop ou Comfort; ``aptoUberBlack`` = Black. Casos
+ambíguos ficam ``False`` (o prompt pede "em caso de dúvida, marque false").
+Sem "2P"/"4P" na versão, vale 4 portas, o mesmo padrão do schema.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+
+from robustcar.catalog import default_catalog
+from robustcar.delta import listing_id
+from robustcar.normalize import detect_features, detect_transmission
+from robustcar.snapshot import sidecar_path
+from robustcar.specs import parse_version
+
+# Critérios oficiais citados no prompt (2024)
+MIN_YEAR = {'uberX': 2012, 'uberComfort': 2015, 'uberBlack': 2018}
+
+# Porte dos sedans do catálogo: (marca, modelo) canônicos
+COMPACT_SEDANS = frozenset({
+    ('renault', 'logan'), ('volkswagen', 'voyage'), ('hyundai', 'hb20s'), ('chevrolet', 'prisma'),
+    ('chevrolet', 'cobalt'), ('fiat', 'cronos'), ('fiat', 'grand-siena'), ('toyota', 'etios'),
+    ('nissan', 'versa'), ('ford', 'ka'), ('chevrolet', 'onix-plus'),
+})
+MIDSIZE_SEDANS = frozenset({
+    ('toyota', 'corolla'), ('honda', 'civic'), ('chevrolet', 'cruze'), ('nissan', 'sentra'),
+    ('volkswagen', 'jetta'), ('ford', 'focus'), ('ford', 'fusion'), ('toyota', 'prius'),
+    ('caoa-chery', 'arrizo'), ('honda', 'accord'), ('toyota', 'camry'), ('kia', 'cerato'),
+    ('hyundai', 'elantra'), ('volkswagen', 'passat'),
+})
+# Whitelist Black de scripts/update-uber-eligibility.ts
+BLACK_SEDANS = frozenset({
+    ('honda', 'civic'), ('toyota', 'corolla'), ('chevrolet', 'cruze'), ('volkswagen', 'jetta'),
+    ('volkswagen', 'passat'), ('nissan', 'sentra'),
+})
+# "SUVs grandes (Pajero, SW4, Grand Cherokee)": nunca aceitos
+LARGE_SUVS = frozenset({
+    ('mitsubishi', 'pajero'), ('toyota', 'sw4'), ('jeep', 'grand-cherokee'), ('toyota', 'hilux-sw4'),
+})
+
+
+@dataclass(slots=True, frozen=True)
+class Eligibility:
+    uber_x: bool
+    uber_comfort: bool
+    uber_black: bool
+    review: tuple        # categorias que só o LLM decide
+
+    @property
+    def apto_uber(self):
+        return self.uber_x or self.uber_comfort
+
+    @property
+    def apto_uber_black(self):
+        return self.uber_black
+
+    def to_dict(self):
+        return {
+            'aptoUber': self.apto_uber,
+            'aptoUberBlack': self.apto_uber_black,
+            'uberX': self.uber_x,
+            'uberComfort': self.uber_comfort,
+            'uberBlack': self.uber_black,
+            'review': list(self.review),
+        }
+
+
+NOT_ELIGIBLE = Eligibility(False, False, False, ())
+
+
+@lru_cache(maxsize=65_536)
+def _version_key(version):
+    """Portas, câmbio e ar-condicionado dependem só da versão."""
+    specs = parse_version(version)
+    return (specs.portas or 4, specs.cambio or detect_transmission(version),
+            detect_features(version)['arCondicionado'])
+
+
+def evaluate(model_key, year, body, doors, transmission, air_conditioning):
+    """Critérios do prompt para uma combinação de atributos.
+
+    ``transmission`` não entra em nenhum critério publicado; faz parte da
+    chave para que uma regra nova de câmbio não exija refazer o memo.
+    """
+    if body in ('PICKUP', 'MOTO') or doors < 4 or not air_conditioning or year < MIN_YEAR['uberX']:
+        return NOT_ELIGIBLE
+    comfort_year = year >= MIN_YEAR['uberComfort']
+    black_year = year >= MIN_YEAR['uberBlack']
+    if body == 'HATCH':
+        return Eligibility(True, False, False, ())
+    if body == 'MINIVAN':
+        return Eligibility(False, comfort_year, False, ())
+    if body == 'SUV':
+        return Eligibility(False, comfort_year and model_key not in LARGE_SUVS, False, ())
+    if body == 'SEDAN':
+        if model_key in MIDSIZE_SEDANS:
+            return Eligibility(True, comfort_year, black_year and model_key in BLACK_SEDANS, ())
+        if model_key in COMPACT_SEDANS:
+            return Eligibility(True, False, False, ())
+        review = tuple(name for name, wanted in (('uberComfort', comfort_year), ('uberBlack', black_year))
+                       if wanted)
+        return Eligibility(True, False, False, review)
+    # OUTROS: tudo o que o ano permitiria fica para o LLM
+    review = tuple(name for name, minimum in MIN_YEAR.items() if year >= minimum)
+    return Eligibility(False, False, False, review)
+
+
+class EligibilityEngine:
+    """Avalia lotes inteiros com memo por chave; conta as chamadas ao LLM evitadas."""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or default_catalog()
+        self._memo = {}
+
+    def key(self, vehicle):
+        resolution = self.catalog.resolve(vehicle['brand'], vehicle['model'])
+        if resolution.model is not None:
+            model_key = (resolution.brand.id, resolution.model.id)
+            body = resolution.model.category
+        else:
+            model_key = (vehicle['brand'], vehicle['model'])
+            body = vehicle['category']
+        return (model_key, vehicle['year'], body, *_version_key(vehicle['version']))
+
+    def classify(self, vehicle):
+        key = self.key(vehicle)
+        result = self._memo.get(key)
+        if result is None:
+            result = self._memo[key] = evaluate(*key)
+        return result
+
+    def classify_many(self, vehicles):
+        """Uma ``Eligibility`` por veículo e o resumo do lote."""
+        memo = self._memo
+        keys = [self.key(vehicle) for vehicle in vehicles]
+        distinct = set(keys)
+        for key in distinct.difference(memo):
+            memo[key] = evaluate(*key)
+        results = [memo[key] for key in keys]
+        # O validador TS faz uma chamada por veículo; aqui, uma por chave ambígua
+        review_keys = [key for key in distinct if memo[key].review]
+        summary = {
+            'vehicles': len(results),
+            'aptoUber': sum(r.apto_uber for r in results),
+            'aptoUberBlack': sum(r.uber_black for r in results),
+            'review': sum(bool(r.review) for r in results),
+            'distinctKeys': len(distinct),
+            'llmCalls': len(review_keys),
+            'llmCallsAvoided': len(results) - len(review_keys),
+        }
+        return results, summary
+
+
+def write_eligibility(vehicles, path, engine=None):
+    """Grava ``{summary, vehicles: {id: elegibilidade}}``; devolve o resumo."""
+    results, summary = (engine or EligibilityEngine()).classify_many(vehicles)
+    payload = {
+        'summary': summary,
+        'vehicles': {listing_id(v['detailUrl']): r.to_dict() for v, r in zip(vehicles, results)},
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def eligibility_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.eligibility.json')
@@ -0,0 +1,306 @@
+"""Preparação dos embeddings do estoque: texto, cache em disco e lotes para o backend.
+
+O texto é o mesmo ``descricao`` que ``generateDescription`` grava no seed
+(prisma/seed-robustcar.ts), caractere por caractere. Cada texto é
+identificado pelo SHA-256 do UTF-8; o cache SQLite guarda ``(modelo, hash)
+-> vetor float32``, então uma nova coleta só envia ao backend os textos que
+mudaram. Textos repetidos no mesmo bloco (mesmo carro em lojas diferentes,
+preço e URL não entram na descrição) também vão uma vez só.
+
+Backends implementam ``name``, ``dimensions`` e ``embed_batch(texts)`` (lista
+de vetores na mesma ordem). ``LocalBackend`` é determinístico e não usa rede
+(hashing de palavras e trigramas, normalizado em L2); ``OpenAIBackend`` chama
+``text-embedding-3-small`` como ``src/lib/embeddings.ts``.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import time
+import urllib.error
+import urllib.request
+from array import array
+from itertools import islice
+
+from robustcar.normalize import detect_features, detect_transmission
+from robustcar.snapshot import sidecar_path
+
+DEFAULT_BATCH = 256
+DEFAULT_CHUNK = 10_000
+_SQLITE_VARS = 500
+
+# Ordem de generateDescription
+FEATURE_LABELS = (
+    ('arCondicionado', 'Ar-condicionado'),
+    ('direcaoHidraulica', 'Direção hidráulica'),
+    ('airbag', 'Airbag'),
+    ('abs', 'Freios ABS'),
+    ('vidroEletrico', 'Vidros elétricos'),
+    ('travaEletrica', 'Travas elétricas'),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    model   TEXT NOT NULL,
+    hash    TEXT NOT NULL,
+    vector  BLOB NOT NULL,
+    PRIMARY KEY (model, hash)
+) WITHOUT ROWID;
+"""
+
+
+def format_km(mileage):
+    """``toLocaleString('pt-BR')`` de um inteiro: 51985 -> '51.985'."""
+    return f'{mileage:,}'.replace(',', '.')
+
+
+def describe(vehicle):
+    """Descrição do veículo, idêntica a ``generateDescription`` do seed."""
+    version = vehicle['version']
+    detected = detect_features(version)
+    features = [label for key, label in FEATURE_LABELS if detected[key]]
+    return (f"{vehicle['brand']} {vehicle['model']} {version} {vehicle['year']}. "
+            f"{vehicle['fuel']}, {detect_transmission(version)}, {vehicle['color'].lower()}. "
+            f"{format_km(vehicle['mileage'])} km rodados. "
+            + (f"Equipado com: {', '.join(features)}. " if features else '')
+            + 'Veículo em ótimo estado de conservação.')
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def pack(vector):
+    """Vetor -> bytes float32 little-endian (formato do cache)."""
+    data = vector if isinstance(vector, array) and vector.typecode == 'f' else array('f', vector)
+    if data.itemsize != 4:
+        raise ValueError('float32 indisponível nesta plataforma')
+    if sys.byteorder == 'big':
+        data = array('f', data)
+        data.byteswap()
+    return data.tobytes()
+
+
+def unpack(blob):
+    data = array('f')
+    data.frombytes(blob)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+class LocalBackend:
+    """Stand-in determinístico: mesmas entradas, mesmos vetores, sem rede.
+
+    Cada palavra e cada trigrama de caracteres cai numa dimensão (com sinal)
+    via blake2b; textos que compartilham termos ficam próximos no cosseno.
+    Serve para testar o pipeline e medir o custo fora do backend, não para
+    qualidade de busca.
+    """
+
+    _WORDS = re.compile(r'\w+(?:[.,]\w+)*')
+
+    def __init__(self, dimensions=1536):
+        self.name = f'local-hash-{dimensions}'
+        self.dimensions = dimensions
+        self._slots = {}
+
+    def _slot(self, term):
+        slot = self._slots.get(term)
+        if slot is None:
+            h = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+            slot = self._slots[term] = (h % self.dimensions, 1.0 if h >> 63 else -1.0)
+        return slot
+
+    def embed_batch(self, texts):
+        vectors = []
+        zeros = array('f', bytes(4 * self.dimensions))
+        for text in texts:
+            # Acumula só as dimensões tocadas; o vetor denso é montado no fim
+            weights = {}
+            for word in self._WORDS.findall(text.lower()):
+                index, sign = self._slot(word)
+                weights[index] = weights.get(index, 0.0) + sign
+                padded = f'#{word}#'
+                for i in range(len(padded) - 2):
+                    index, sign = self._slot(padded[i:i + 3])
+                    weights[index] = weights.get(index, 0.0) + 0.5 * sign
+            norm = math.sqrt(sum(x * x for x in weights.values())) or 1.0
+            vector = array('f', zeros)
+            for index, value in weights.items():
+                vector[index] = value / norm
+            vectors.append(vector)
+        return vectors
+
+
+class OpenAIBackend:
+    """``POST /v1/embeddings`` com retry em 429/5xx; chave em ``OPENAI_API_KEY``."""
+
+    URL = 'https://api.openai.com/v1/embeddings'
+    MAX_INPUTS = 2048
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, model='text-embedding-3-small', dimensions=1536, api_key=None,
+                 timeout=60.0, retries=4, backoff=1.0):
+        self.name = model
+        self.dimensions = dimensions
+        self.api_key = api_key or os.environ.get('OPENAI_API_KEY')
+        if not self.api_key:
+            raise RuntimeError('OPENAI_API_KEY não definida')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def embed_batch(self, texts):
+        vectors = []
+        for start in range(0, len(texts), self.MAX_INPUTS):
+            vectors.extend(self._request(texts[start:start + self.MAX_INPUTS]))
+        return vectors
+
+    def _request(self, texts):
+        body = json.dumps({'model': self.name, 'input': texts}).encode('utf-8')
+        for attempt in range(self.retries + 1):
+            request = urllib.request.Request(self.URL, data=body, headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json',
+            })
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    data = json.load(response)['data']
+                return [item['embedding'] for item in sorted(data, key=lambda item: item['index'])]
+            except urllib.error.HTTPError as error:
+                if error.code not in self.RETRY_STATUSES or attempt == self.retries:
+                    raise
+            except urllib.error.URLError:
+                if attempt == self.retries:
+                    raise
+            time.sleep(self.backoff * 2 ** attempt)
+
+
+BACKENDS = {'local': LocalBackend, 'openai': OpenAIBackend}
+
+
+class EmbeddingCache:
+    """Cache SQLite (WAL) ``(modelo, hash do texto) -> vetor float32``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get_many(self, model, hashes):
+        """Vetores (bytes) já calculados, por hash."""
+        found = {}
+        hashes = list(hashes)
+        for start in range(0, len(hashes), _SQLITE_VARS):
+            chunk = hashes[start:start + _SQLITE_VARS]
+            marks = ','.join('?' * len(chunk))
+            found.update(self.conn.execute(
+                f'SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({marks})',
+                (model, *chunk)))
+        return found
+
+    def put_many(self, model, items):
+        """Grava pares ``(hash, vetor em bytes)`` numa transação."""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)',
+                ((model, h, blob) for h, blob in items))
+
+    def count(self, model=None):
+        if model is None:
+            return self.conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+        return self.conn.execute('SELECT COUNT(*) FROM embeddings WHERE model = ?',
+                                 (model,)).fetchone()[0]
+
+
+class EmbeddingStage:
+    """Texto -> hash -> cache; só as faltas vão ao backend, em lotes de ``batch_size``.
+
+    Os vetores saem como bytes float32 little-endian, na ordem de entrada.
+    Contadores: ``texts`` (entradas), ``unique`` (textos distintos por bloco),
+    ``hits`` (achados no cache), ``computed`` (enviados ao backend) e
+    ``backend_seconds``.
+    """
+
+    def __init__(self, backend, cache=None, batch_size=DEFAULT_BATCH):
+        self.backend = backend
+        self.cache = cache
+        self.batch_size = batch_size
+        self.texts = self.unique = self.hits = self.computed = self.batches = 0
+        self.backend_seconds = 0.0
+
+    def embed_texts(self, texts):
+        hashes = [text_hash(text) for text in texts]
+        pending = dict(zip(hashes, texts))
+        self.texts += len(texts)
+        self.unique += len(pending)
+
+        model = self.backend.name
+        vectors = self.cache.get_many(model, pending) if self.cache is not None else {}
+        self.hits += len(vectors)
+        misses = [(h, text) for h, text in pending.items() if h not in vectors]
+
+        for start in range(0, len(misses), self.batch_size):
+            batch = misses[start:start + self.batch_size]
+            began = time.perf_counter()
+            result = self.backend.embed_batch([text for _, text in batch])
+            self.backend_seconds += time.perf_counter() - began
+            if len(result) != len(batch):
+                raise ValueError(f'backend devolveu {len(result)} vetores para {len(batch)} textos')
+            computed = [(h, pack(vector)) for (h, _), vector in zip(batch, result)]
+            if self.cache is not None:
+                self.cache.put_many(model, computed)
+            vectors.update(computed)
+            self.computed += len(batch)
+            self.batches += 1
+        return [vectors[h] for h in hashes]
+
+    def embed_vehicles(self, vehicles, chunk_size=DEFAULT_CHUNK):
+        """Gerador: um vetor por veículo, processando ``chunk_size`` por vez."""
+        vehicles = iter(vehicles)
+        while True:
+            chunk = list(islice(vehicles, chunk_size))
+            if not chunk:
+                return
+            yield from self.embed_texts([describe(vehicle) for vehicle in chunk])
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.unique if self.unique else 0.0
+
+    @property
+    def vectors_per_second(self):
+        return self.computed / self.backend_seconds if self.backend_seconds else 0.0
+
+    def summary(self):
+        return {
+            'model': self.backend.name,
+            'texts': self.texts,
+            'unique': self.unique,
+            'hits': self.hits,
+            'computed': self.computed,
+            'batches': self.batches,
+            'hitRate': round(self.hit_rate, 4),
+            'vectorsPerSec': round(self.vectors_per_second, 1),
+        }
+
+
+def embeddings_cache_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.embeddings.db')
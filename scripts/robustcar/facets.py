@@ -0,0 +1,267 @@
+"""Índice de facetas e faixas (formato ``RFAC``) gravado junto com o snapshot.
+
+Hoje a busca do bot carrega todos os veículos disponíveis e filtra na
+aplicação. Este índice é montado na exportação para responder filtros
+combinados ("SUV, flex, < R$100k, >= 2020") sem varrer os registros:
+
+- facetas (category, fuel, brand, transmission, color): um bitmap por valor,
+  bit ``i`` = linha ``i`` do snapshot;
+- faixas (price, year, mileage): valores ordenados + ids das linhas nessa
+  ordem, e bitmaps cumulativos "valor >= limite" em limites redondos
+  (a cada R$ 5.000, 10.000 km e ano a ano).
+
+Uma consulta vira AND/OR de inteiros Python. Filtros em limites redondos
+usam só bitmaps prontos; limites quebrados somam as linhas do trecho entre
+o limite pedido e o próximo redondo, lidas do array ordenado.
+
+Layout (little-endian)::
+
+    magic   b'RFAC'
+    u16     versão do formato (1)
+    u16     reservado
+    u32     tamanho do cabeçalho JSON
+    bytes   cabeçalho JSON (utf-8), com padding até múltiplo de 8
+    ...     blocos de dados; ``[offset, tamanho]`` no cabeçalho são relativos
+            ao início desta seção
+
+Preço ausente ("Consulte") fica fora do índice de preço: qualquer filtro de
+preço exclui essas linhas.
+"""
+
+import json
+import math
+import mmap
+import re
+import struct
+from array import array
+from bisect import bisect_left
+
+from robustcar.binfmt import TYPECODES, le_bytes, le_view, pad
+from robustcar.normalize import detect_transmission
+from robustcar.snapshot import sidecar_path
+
+MAGIC = b'RFAC'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<4sHHI')
+
+FACETS = ('category', 'fuel', 'brand', 'transmission', 'color')
+# (campo, tipo, passo dos limites)
+RANGES = (('price', 'f64', 5_000), ('year', 'i16', 1), ('mileage', 'i32', 10_000))
+MAX_EDGES = 512
+_NONZERO = re.compile(rb'[^\x00]')
+
+
+def _facet_value(vehicle, name):
+    if name == 'transmission':
+        return detect_transmission(vehicle['version'])
+    return vehicle[name]
+
+
+def _bitmap(rows, nbytes):
+    bits = bytearray(nbytes)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return bits
+
+
+def _edges(low, high, step):
+    while (high - low) / step > MAX_EDGES:
+        step *= 2
+    first = math.floor(low / step) * step
+    return [first + k * step for k in range(int((high - first) // step) + 1)]
+
+
+def write_facets(vehicles, path):
+    """Grava o índice RFAC dos veículos; devolve o tamanho em bytes."""
+    rows = len(vehicles)
+    nbytes = (rows + 7) // 8
+    blocks = []
+    position = 0
+
+    def add(block):
+        nonlocal position
+        span = [position, len(block)]
+        blocks.append(block)
+        position += len(block) + pad(len(block))
+        return span
+
+    facets = {}
+    for name in FACETS:
+        postings = {}
+        for row, vehicle in enumerate(vehicles):
+            postings.setdefault(_facet_value(vehicle, name), []).append(row)
+        facets[name] = {value: add(_bitmap(ids, nbytes)) for value, ids in sorted(postings.items())}
+
+    ranges = {}
+    for name, dtype, step in RANGES:
+        pairs = sorted((v[name], row) for row, v in enumerate(vehicles) if v[name] is not None)
+        values = array(TYPECODES[dtype], [value for value, _ in pairs])
+        ids = array('I', [row for _, row in pairs])
+        edges = _edges(values[0], values[-1], step) if pairs else []
+        positions = [bisect_left(values, edge) for edge in edges]
+
+        # Bitmaps "valor >= edge", do maior limite para o menor
+        bits = bytearray(nbytes)
+        spans = [None] * len(edges)
+        filled = len(pairs)
+        for k in range(len(edges) - 1, -1, -1):
+            for row in ids[positions[k]:filled]:
+                bits[row >> 3] |= 1 << (row & 7)
+            filled = positions[k]
+            spans[k] = add(bytes(bits))
+        ranges[name] = {
+            'type': dtype,
+            'values': add(le_bytes(values)),
+            'rows': add(le_bytes(ids)),
+            'edges': edges,
+            'positions': positions,
+            'bitmaps': spans,
+        }
+
+    header = json.dumps({'rows': rows, 'bitmapBytes': nbytes, 'facets': facets, 'ranges': ranges},
+                        ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(header)))
+        f.write(header)
+        f.write(b'\0' * pad(_PREAMBLE.size + len(header)))
+        for block in blocks:
+            f.write(block)
+            f.write(b'\0' * pad(len(block)))
+        return f.tell()
+
+
+class FacetIndex:
+    """Consulta via mmap; cada bitmap é convertido para ``int`` na primeira vez que é usado.
+
+    ``query`` devolve um bitmap (``int``); use ``count`` e ``row_ids`` para
+    ler o resultado. As linhas são as posições no snapshot JSON/RCAR.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_len = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path}: não é um índice RFAC v{FORMAT_VERSION}')
+        header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        self._base = _PREAMBLE.size + header_len + pad(_PREAMBLE.size + header_len)
+        self.rows = header['rows']
+        self.facets = header['facets']
+        self.ranges = header['ranges']
+        self._bitmaps = {}
+        self._arrays = {}
+        self.all = (1 << self.rows) - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._arrays.clear()
+        self._map.close()
+        self._file.close()
+
+    def _load(self, span):
+        offset, length = span
+        offset += self._base
+        bits = self._bitmaps.get(offset)
+        if bits is None:
+            bits = self._bitmaps[offset] = int.from_bytes(self._map[offset:offset + length], 'little')
+        return bits
+
+    def _array(self, name, key, dtype):
+        view = self._arrays.get((name, key))
+        if view is None:
+            offset, length = self.ranges[name][key]
+            view = self._arrays[(name, key)] = le_view(self._map, offset + self._base, length, dtype)
+        return view
+
+    def values(self, name):
+        """Valores cadastrados de uma faceta."""
+        return list(self.facets[name])
+
+    def facet(self, name, values):
+        """Linhas com ``name`` igual a um dos ``values`` (str ou lista = OR)."""
+        if isinstance(values, str):
+            values = (values,)
+        postings = self.facets[name]
+        bits = 0
+        for value in values:
+            span = postings.get(value)
+            if span is not None:
+                bits |= self._load(span)
+        return bits
+
+    def at_least(self, name, threshold):
+        """Linhas com ``name >= threshold``."""
+        meta = self.ranges[name]
+        edges = meta['edges']
+        if not edges:
+            return 0
+        k = bisect_left(edges, threshold)
+        if k == 0 or (k < len(edges) and edges[k] == threshold):
+            return self._load(meta['bitmaps'][k])
+        bits = self._load(meta['bitmaps'][k]) if k < len(edges) else 0
+        # Trecho entre ``threshold`` e o próximo limite redondo
+        values = self._array(name, 'values', meta['type'])
+        end = meta['positions'][k] if k < len(edges) else len(values)
+        start = bisect_left(values, threshold, meta['positions'][k - 1], end)
+        if start < end:
+            ids = self._array(name, 'rows', 'u32')[start:end]
+            bits |= int.from_bytes(_bitmap(ids, (self.rows + 7) // 8), 'little')
+        return bits
+
+    def between(self, name, low=None, high=None):
+        """Linhas com ``low <= name < high``; ``None`` deixa o lado aberto."""
+        bits = self.at_least(name, low if low is not None else -math.inf)
+        if high is not None:
+            bits &= ~self.at_least(name, high)
+        return bits
+
+    def query(self, **filters):
+        """AND dos filtros: facetas por valor(es), faixas por tupla ``(mín, máx)`` semiaberta.
+
+        ``query(category='SUV', fuel='FLEX', price=(None, 100_000), year=(2020, None))``
+        """
+        bits = None
+        # Facetas primeiro: bitmaps prontos e, em geral, os mais seletivos
+        for name, value in filters.items():
+            if name in self.facets:
+                selected = self.facet(name, value)
+                bits = selected if bits is None else bits & selected
+        for name, value in filters.items():
+            if name in self.facets:
+                continue
+            if name not in self.ranges:
+                raise KeyError(f'filtro desconhecido: {name}')
+            if bits == 0:
+                break
+            selected = self.between(name, *value)
+            bits = selected if bits is None else bits & selected
+        return self.all if bits is None else bits
+
+    @staticmethod
+    def count(bits):
+        return bits.bit_count()
+
+    def row_ids(self, bits, limit=None):
+        """Ids das linhas do bitmap, em ordem crescente (até ``limit``)."""
+        data = bits.to_bytes((self.rows + 7) // 8, 'little')
+        result = []
+        # Varre só os bytes não nulos (busca em C), bit a bit dentro de cada um
+        for match in _NONZERO.finditer(data):
+            base = match.start() << 3
+            byte = data[match.start()]
+            while byte:
+                low = byte & -byte
+                result.append(base + low.bit_length() - 1)
+                if len(result) == limit:
+                    return result
+                byte ^= low
+        return result
+
+
+def facets_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.rfac')
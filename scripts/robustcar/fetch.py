@@ -0,0 +1,388 @@
+"""Coleta assíncrona das páginas de listagem e de detalhe da Robustcar.
+
+Usa apenas asyncio + biblioteca padrão: um pool de conexões HTTP/1.1
+keep-alive com limite global e por host, retry com backoff exponencial,
+limite opcional de requisições/s e requisições condicionais (ETag /
+If-Modified-Since). A saída são anúncios
+brutos no mesmo formato de ``vehicles_data``, prontos para
+``normalize_vehicle``.
+"""
+
+import asyncio
+import html
+import json
+import random
+import re
+import ssl
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+BASE_URL = 'https://robustcar.com.br'
+LISTING_PATH = '/busca//pag/{page}/ordem/ano-desc/'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+GONE_STATUSES = {404, 410}
+
+# Marcas e modelos com mais de uma palavra no título do anúncio
+MULTIWORD_BRANDS = ('CAOA CHERY', 'LAND ROVER', 'ASTON MARTIN')
+MULTIWORD_MODELS = ('GRAND LIVINA', 'GRAND SIENA', 'GRAND CHEROKEE', 'SPACE FOX')
+
+
+class FetchError(Exception):
+    pass
+
+
+@dataclass
+class Response:
+    url: str
+    status: int
+    headers: dict
+    body: str
+    from_cache: bool = False
+
+
+@dataclass
+class FetchStats:
+    pages: int = 0
+    not_modified: int = 0
+    retries: int = 0
+    failures: int = 0
+    latencies: list = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float = None
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def pages_per_sec(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def p95_latency(self):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, -(-len(ordered) * 95 // 100) - 1)]
+
+    def summary(self):
+        return {
+            'pages': self.pages,
+            'not_modified': self.not_modified,
+            'retries': self.retries,
+            'failures': self.failures,
+            'elapsed_s': round(self.elapsed, 3),
+            'pages_per_sec': round(self.pages_per_sec, 1),
+            'p95_latency_ms': round(self.p95_latency * 1000, 1),
+        }
+
+
+class HttpCache:
+    """Validadores (ETag / Last-Modified) e corpo da última resposta 200 por URL."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except FileNotFoundError:
+                pass
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, response):
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if etag or last_modified:
+            self.entries[response.url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': response.body,
+            }
+
+    def body(self, url):
+        return self.entries[url]['body']
+
+    def save(self):
+        if self.path:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+
+
+class ConnectionPool:
+    """Conexões keep-alive reaproveitadas, com limite total e por host."""
+
+    def __init__(self, limit=16, limit_per_host=4, timeout=15.0):
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self._total = asyncio.Semaphore(limit)
+        self._per_host = {}
+        self._idle = {}
+        self._ssl = ssl.create_default_context()
+
+    def _host_slot(self, key):
+        if key not in self._per_host:
+            self._per_host[key] = asyncio.Semaphore(self.limit_per_host)
+        return self._per_host[key]
+
+    async def _connect(self, key):
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        scheme, host, port = key
+        return await asyncio.open_connection(
+            host, port, ssl=self._ssl if scheme == 'https' else None)
+
+    async def request(self, url, headers=None):
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        async with self._host_slot(key), self._total:
+            reader, writer = await self._connect(key)
+            try:
+                lines = [f'GET {path} HTTP/1.1', f'Host: {parts.netloc}',
+                         f'User-Agent: {USER_AGENT}', 'Connection: keep-alive']
+                lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                await writer.drain()
+                status, resp_headers, body, reusable = await asyncio.wait_for(
+                    _read_response(reader), self.timeout)
+            except BaseException:
+                writer.close()
+                raise
+            if reusable:
+                self._idle.setdefault(key, []).append((reader, writer))
+            else:
+                writer.close()
+        charset = 'utf-8'
+        match = re.search(r'charset=([\w-]+)', resp_headers.get('content-type', ''))
+        if match:
+            charset = match.group(1)
+        return Response(url, status, resp_headers, body.decode(charset, 'replace'))
+
+    async def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError('conexão encerrada pelo servidor')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = headers.get('connection', '').lower() != 'close'
+    if status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        reusable = False
+    return status, headers, body, reusable
+
+
+class RateLimiter:
+    """No máximo ``rate`` requisições/s, somando todas as tarefas que o compartilham.
+
+    Cada ``acquire`` reserva o próximo horário livre, espaçado de ``1/rate``;
+    sem lock porque a reserva não tem ``await`` no meio.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+
+    async def acquire(self):
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class Fetcher:
+    """GET com retry/backoff e cache condicional sobre um ConnectionPool."""
+
+    def __init__(self, pool, cache=None, retries=3, backoff=0.5, stats=None, rate_limiter=None):
+        self.pool = pool
+        self.cache = cache or HttpCache()
+        self.retries = retries
+        self.backoff = backoff
+        self.stats = stats or FetchStats()
+        self.rate_limiter = rate_limiter
+
+    async def get(self, url):
+        start = time.perf_counter()
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            try:
+                response = await self.pool.request(url, self.cache.conditional_headers(url))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+                if attempt == self.retries:
+                    self.stats.failures += 1
+                    raise FetchError(f'{url}: {error}') from error
+            else:
+                if response.status not in RETRY_STATUSES or attempt == self.retries:
+                    break
+            self.stats.retries += 1
+            await asyncio.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+
+        self.stats.latencies.append(time.perf_counter() - start)
+        self.stats.pages += 1
+        if response.status == 304:
+            self.stats.not_modified += 1
+            response.status = 200
+            response.body = self.cache.body(url)
+            response.from_cache = True
+        elif response.status == 200:
+            self.cache.store(response)
+        elif response.status not in GONE_STATUSES:
+            self.stats.failures += 1
+            raise FetchError(f'{url}: HTTP {response.status}')
+        return response
+
+
+# Cartões da página de busca (mesmo markup usado por scrape-robustcar.ts)
+_CARD_SPLIT = re.compile(r'<div[^>]+class="[^"]*\bresultado-busca\b[^"]*"[^>]*>')
+_TITLE_RE = re.compile(r'<h3[^>]*>.*?<a[^>]+href="([^"]+)"[^>]*>(.*?)</a>', re.S)
+_SPECS_RE = re.compile(r'<ul[^>]+class="[^"]*\blist-unstyled\b[^"]*"[^>]*>(.*?)</ul>', re.S)
+_LI_RE = re.compile(r'<li[^>]*>(.*?)</li>', re.S)
+_PRICE_RE = re.compile(r'<[^>]+class="[^"]*\bpreco\b[^"]*"[^>]*>(.*?)</', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def _text(fragment):
+    return ' '.join(html.unescape(_TAG_RE.sub(' ', fragment)).split())
+
+
+def split_title(title):
+    """'2025 CAOA CHERY TIGGO 5X PRO' -> (brand, model, version)."""
+    rest = title.split(' ', 1)[1] if title[:4].isdigit() else title
+    brand = next((b for b in MULTIWORD_BRANDS if rest.upper().startswith(b + ' ')),
+                 rest.split(' ', 1)[0])
+    rest = rest[len(brand):].strip()
+    model = next((m for m in MULTIWORD_MODELS if rest.upper().startswith(m)),
+                 rest.split(' ', 1)[0])
+    return brand, model, rest[len(model):].strip()
+
+
+def parse_listing_page(page_html):
+    """Extrai os anúncios brutos (strings, como em vehicles_data) de uma página."""
+    listings = []
+    for card in _CARD_SPLIT.split(page_html)[1:]:
+        title = _TITLE_RE.search(card)
+        specs = _SPECS_RE.search(card)
+        prices = _PRICE_RE.findall(card)
+        if not title or not specs:
+            continue
+        items = [_text(li) for li in _LI_RE.findall(specs.group(1))]
+        if len(items) < 4:
+            continue
+        brand, model, version = split_title(_text(title.group(2)))
+        listings.append({
+            "brand": brand,
+            "model": model,
+            "version": version,
+            "year": items[2],
+            "mileage": items[3],
+            "fuel": items[0],
+            "color": items[1],
+            "price": _text(prices[-1]) if prices else 'R$ Consulte',
+            "detailUrl": html.unescape(title.group(1)),
+        })
+    return listings
+
+
+async def crawl(fetcher, base_url, listing_path=LISTING_PATH, parse_page=parse_listing_page,
+                pages=None, details=False, window=4):
+    """Páginas de busca de um site (e opcionalmente as de detalhe) via ``fetcher``.
+
+    Com ``pages=None`` as páginas são buscadas em janelas de ``window`` até
+    aparecer uma página vazia. Com ``details=True`` cada ``detailUrl`` é
+    visitado e anúncios que respondem 404/410 (vendidos) são descartados.
+    Devolve a lista de anúncios brutos na ordem do site.
+    """
+    async def listing(page):
+        response = await fetcher.get(urljoin(base_url, listing_path.format(page=page)))
+        return parse_page(response.body) if response.status == 200 else []
+
+    results = []
+    if pages:
+        results = await asyncio.gather(*(listing(p) for p in range(1, pages + 1)))
+    else:
+        page = 1
+        while True:
+            batch = await asyncio.gather(*(listing(p) for p in range(page, page + window)))
+            results.extend(batch)
+            if any(not found for found in batch):
+                break
+            page += window
+    raw = [item for page_items in results for item in page_items]
+
+    if details:
+        async def alive(item):
+            response = await fetcher.get(urljoin(base_url, item['detailUrl']))
+            return response.status not in GONE_STATUSES
+        keep = await asyncio.gather(*(alive(item) for item in raw))
+        raw = [item for item, ok in zip(raw, keep) if ok]
+    return raw
+
+
+async def scrape(base_url=BASE_URL, pages=None, details=False, limit=16,
+                 limit_per_host=4, retries=3, backoff=0.5, cache=None, stats=None):
+    """Coleta da Robustcar com pool próprio (várias lojas: ``robustcar.sources``)."""
+    pool = ConnectionPool(limit=limit, limit_per_host=limit_per_host)
+    fetcher = Fetcher(pool, cache=cache, retries=retries, backoff=backoff, stats=stats)
+    try:
+        return await crawl(fetcher, base_url, pages=pages, details=details, window=limit_per_host)
+    finally:
+        fetcher.stats.finished = time.perf_counter()
+        await pool.close()
+        fetcher.cache.save()
+
+
+def scrape_sync(**kwargs):
+    return asyncio.run(scrape(**kwargs))
@@ -0,0 +1,17 @@
+"""Anúncios extraídos das 4 páginas da Robustcar (o antigo ``vehicles_data``).
+
+Ficam em ``data/vehicles.json``, na ordem das páginas, e só são lidos quando
+alguém pede: importar o pacote não custa os ~800 literais que o script
+avaliava a cada execução, nem quando a coleta vinha do site (``--fetch``).
+"""
+
+import json
+import os
+
+VEHICLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'vehicles.json')
+
+
+def vehicles_data():
+    """Lista nova a cada chamada: quem normaliza pode alterar os dicts à vontade."""
+    with open(VEHICLES_PATH, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,310 @@
+"""Carga em lote do snapshot na tabela ``Vehicle`` (Prisma) via DB-API.
+
+Substitui o laço de ``prisma.vehicle.create()`` de prisma/seed-robustcar.ts:
+os veículos viram linhas já no formato das colunas do schema (mesmas regras
+do seed: pula preço "Consulte" e MOTO, ``CATEGORY_TO_CARROCERIA``,
+``normalizeFuel``, opcionais e descrição), vão para uma tabela temporária em
+blocos (``COPY`` com psycopg 3, ``executemany`` nos demais drivers) e entram
+em ``Vehicle`` numa transação só:
+
+1. ``UPDATE ... FROM`` das linhas cuja ``url`` já existe (embedding zerado se
+   a descrição mudou);
+2. ``INSERT ... SELECT`` das URLs novas, com id UUIDv5 da URL;
+3. opcionalmente, ``disponivel = false`` para URLs que saíram do snapshot,
+   só nas lojas do próprio snapshot (prefixos de ``robustcar.sources``):
+   estoque de outras lojas na mesma tabela não é tocado.
+
+``aptoUber``/``aptoUberBlack`` saem das regras de ``robustcar.eligibility``
+(sem LLM; casos ambíguos ficam ``false``).
+
+Recomendações apontam para ``Vehicle.id``, então nada é apagado. Funciona em
+SQLite (``sqlite:///caminho.db``, cria a tabela se faltar) e PostgreSQL
+(``postgresql://...``, requer psycopg).
+"""
+
+import hashlib
+import sqlite3
+import sys
+import time
+import uuid
+from functools import lru_cache
+from itertools import islice
+from json.encoder import encode_basestring
+
+from robustcar.eligibility import EligibilityEngine
+from robustcar.embeddings import describe
+from robustcar.normalize import detect_features, detect_transmission
+from robustcar.sources import prefixes_for
+
+DEFAULT_CHUNK = 10_000
+STAGING = 'vehicle_staging'
+_URL_NAMESPACE = uuid.NAMESPACE_URL.bytes
+
+CATEGORY_TO_CARROCERIA = {
+    'SUV': 'SUV',
+    'SEDAN': 'Sedan',
+    'HATCH': 'Hatchback',
+    'PICKUP': 'Picape',
+    'MINIVAN': 'Minivan',
+    'MOTO': 'Moto',
+    'OUTROS': 'Outros',
+}
+
+FUEL_MAP = {
+    'FLEX': 'Flex',
+    'DIESEL': 'Diesel',
+    'HÍBRIDO': 'Híbrido',
+    'ELÉTRICO': 'Elétrico',
+    'GASOLINA': 'Gasolina',
+}
+
+# Colunas de ``Vehicle`` preenchidas pela carga, na ordem das tuplas de ``vehicle_row``
+COLUMNS = (
+    'id', 'marca', 'modelo', 'versao', 'ano', 'km', 'preco', 'cor', 'carroceria',
+    'combustivel', 'cambio', 'arCondicionado', 'direcaoHidraulica', 'airbag', 'abs',
+    'vidroEletrico', 'travaEletrica', 'alarme', 'rodaLigaLeve', 'som', 'portas',
+    'url', 'fotoUrl', 'fotosUrls', 'descricao', 'disponivel', 'aptoUber', 'aptoUberBlack',
+)
+# Colunas que saem de detectFeatures, na ordem de ``COLUMNS``
+_FEATURES = ('arCondicionado', 'direcaoHidraulica', 'airbag', 'abs', 'vidroEletrico',
+             'travaEletrica', 'alarme', 'rodaLigaLeve', 'som', 'portas')
+# Não mudam num UPDATE: id (referenciado por Recommendation) e a chave
+_UPDATED = tuple(c for c in COLUMNS if c not in ('id', 'url'))
+
+# Mesmas colunas e padrões do schema.prisma, para testes locais em SQLite
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS "Vehicle" (
+    "id" TEXT PRIMARY KEY,
+    "marca" TEXT NOT NULL,
+    "modelo" TEXT NOT NULL,
+    "versao" TEXT,
+    "ano" INTEGER NOT NULL,
+    "km" INTEGER NOT NULL,
+    "preco" REAL NOT NULL,
+    "cor" TEXT NOT NULL,
+    "carroceria" TEXT NOT NULL,
+    "combustivel" TEXT NOT NULL DEFAULT 'Flex',
+    "cambio" TEXT NOT NULL DEFAULT 'Manual',
+    "arCondicionado" BOOLEAN NOT NULL DEFAULT false,
+    "direcaoHidraulica" BOOLEAN NOT NULL DEFAULT false,
+    "airbag" BOOLEAN NOT NULL DEFAULT false,
+    "abs" BOOLEAN NOT NULL DEFAULT false,
+    "vidroEletrico" BOOLEAN NOT NULL DEFAULT false,
+    "travaEletrica" BOOLEAN NOT NULL DEFAULT false,
+    "alarme" BOOLEAN NOT NULL DEFAULT false,
+    "rodaLigaLeve" BOOLEAN NOT NULL DEFAULT false,
+    "som" BOOLEAN NOT NULL DEFAULT false,
+    "portas" INTEGER NOT NULL DEFAULT 4,
+    "fotoUrl" TEXT,
+    "fotosUrls" TEXT NOT NULL DEFAULT '',
+    "url" TEXT,
+    "descricao" TEXT,
+    "embedding" TEXT,
+    "embeddingModel" TEXT DEFAULT 'text-embedding-3-small',
+    "embeddingGeneratedAt" DATETIME,
+    "disponivel" BOOLEAN NOT NULL DEFAULT true,
+    "aptoUber" BOOLEAN NOT NULL DEFAULT false,
+    "aptoUberBlack" BOOLEAN NOT NULL DEFAULT false,
+    "aptoFamilia" BOOLEAN NOT NULL DEFAULT true,
+    "aptoTrabalho" BOOLEAN NOT NULL DEFAULT true,
+    "economiaCombustivel" TEXT,
+    "createdAt" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS "Vehicle_url_idx" ON "Vehicle" ("url");
+"""
+
+
+def _quote(names, prefix=''):
+    return ', '.join(f'{prefix}"{name}"' for name in names)
+
+
+def _like_prefix(prefix):
+    """Padrão LIKE (escape ``\\``) que casa só com URLs começando por ``prefix``."""
+    return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def should_load(vehicle):
+    """O seed pula anúncios sem preço e motos."""
+    return vehicle['price'] is not None and vehicle['category'] != 'MOTO'
+
+
+@lru_cache(maxsize=65_536)
+def _version_columns(version):
+    """Câmbio e opcionais dependem só da versão, que se repete entre anúncios."""
+    features = detect_features(version)
+    return (detect_transmission(version), *(features[name] for name in _FEATURES))
+
+
+def listing_uuid(url):
+    """``str(uuid.uuid5(uuid.NAMESPACE_URL, url))`` sem montar o objeto ``UUID``."""
+    digest = bytearray(hashlib.sha1(_URL_NAMESPACE + url.encode('utf-8')).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # versão 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # variante RFC 4122
+    x = digest.hex()
+    return f'{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}'
+
+
+@lru_cache(maxsize=1)
+def _default_eligibility():
+    return EligibilityEngine()
+
+
+def vehicle_row(vehicle, eligibility=None):
+    """Veículo normalizado -> tupla na ordem de ``COLUMNS`` (mesmo mapeamento do seed)."""
+    url = vehicle['detailUrl']
+    apto = (eligibility or _default_eligibility()).classify(vehicle)
+    return (
+        listing_uuid(url),
+        vehicle['brand'],
+        vehicle['model'],
+        vehicle['version'],
+        vehicle['year'],
+        vehicle['mileage'],
+        vehicle['price'],
+        vehicle['color'],
+        CATEGORY_TO_CARROCERIA.get(vehicle['category'], 'Outros'),
+        FUEL_MAP.get(vehicle['fuel'], 'Flex'),
+        *_version_columns(vehicle['version']),
+        url,
+        url,
+        # Mesmo texto de JSON.stringify([url])
+        f'[{encode_basestring(url)}]',
+        describe(vehicle),
+        True,
+        apto.apto_uber,
+        apto.apto_uber_black,
+    )
+
+
+def connect(url):
+    """``sqlite:///caminho.db`` ou ``postgresql://...`` -> conexão DB-API."""
+    if url.startswith('sqlite:///'):
+        conn = sqlite3.connect(url[len('sqlite:///'):], isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # Índices de "Vehicle" e da tabela temporária em memória durante a carga
+        conn.execute('PRAGMA cache_size=-262144')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.executescript(SQLITE_SCHEMA)
+        return conn
+    if url.startswith(('postgresql://', 'postgres://')):
+        try:
+            import psycopg
+        except ImportError:
+            raise RuntimeError('PostgreSQL requer o pacote psycopg (pip install "psycopg[binary]")')
+        return psycopg.connect(url)
+    raise ValueError(f'banco não suportado: {url}')
+
+
+class BulkLoader:
+    """Carga em blocos via tabela temporária; ``load`` devolve contadores e linhas/s."""
+
+    def __init__(self, conn, chunk_size=DEFAULT_CHUNK, eligibility=None):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.eligibility = eligibility or _default_eligibility()
+        style = sys.modules[type(conn).__module__.partition('.')[0]].paramstyle
+        if style == 'qmark':
+            self.mark = '?'
+        elif style in ('format', 'pyformat'):
+            self.mark = '%s'
+        else:
+            raise ValueError(f'paramstyle não suportado: {style}')
+        self.sqlite = isinstance(conn, sqlite3.Connection)
+
+    @staticmethod
+    def _execute(cursor, sql, params=()):
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+    def _stage(self, cursor, rows):
+        """Copia as linhas para a tabela temporária em blocos; devolve quantas."""
+        insert = f'INSERT INTO {STAGING} ({_quote(COLUMNS)}) VALUES ({", ".join([self.mark] * len(COLUMNS))})'
+        copy = getattr(cursor, 'copy', None)
+        total = 0
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return total
+            if copy is not None:
+                with copy(f'COPY {STAGING} ({_quote(COLUMNS)}) FROM STDIN') as stream:
+                    for row in chunk:
+                        stream.write_row(row)
+            else:
+                cursor.executemany(insert, chunk)
+            total += len(chunk)
+
+    def load(self, vehicles, retire_missing=False, retire_prefixes=None):
+        """``retire_prefixes`` limita ``retire_missing`` às URLs com esses prefixos;
+        por padrão, os das lojas registradas que aparecem no snapshot."""
+        start = time.perf_counter()
+        # URL repetida no snapshot: vale a última ocorrência
+        rows = {}
+        skipped = 0
+        for vehicle in vehicles:
+            if should_load(vehicle):
+                rows[vehicle['detailUrl']] = vehicle
+            else:
+                skipped += 1
+
+        cursor = self.conn.cursor()
+        if self.sqlite:
+            cursor.execute('BEGIN')
+        try:
+            cursor.execute(f'DROP TABLE IF EXISTS {STAGING}')
+            # Tabela temporária com os mesmos tipos de "Vehicle"
+            cursor.execute(f'CREATE TEMP TABLE {STAGING} AS SELECT {_quote(COLUMNS)} FROM "Vehicle" WHERE 1 = 0')
+            staged = self._stage(cursor, (vehicle_row(v, self.eligibility) for v in rows.values()))
+            cursor.execute(f'CREATE INDEX {STAGING}_url ON {STAGING} ("url")')
+
+            assignments = ', '.join(f'"{c}" = s."{c}"' for c in _UPDATED)
+            updated = self._execute(cursor, f"""
+                UPDATE "Vehicle" SET {assignments},
+                    "embedding" = CASE WHEN "Vehicle"."descricao" IS NOT DISTINCT FROM s."descricao"
+                                       THEN "Vehicle"."embedding" END,
+                    "embeddingGeneratedAt" = CASE WHEN "Vehicle"."descricao" IS NOT DISTINCT FROM s."descricao"
+                                                  THEN "Vehicle"."embeddingGeneratedAt" END,
+                    "updatedAt" = CURRENT_TIMESTAMP
+                FROM {STAGING} AS s
+                WHERE "Vehicle"."url" = s."url"
+            """)
+            inserted = self._execute(cursor, f"""
+                INSERT INTO "Vehicle" ({_quote(COLUMNS)}, "createdAt", "updatedAt")
+                SELECT {_quote(COLUMNS, 's.')}, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM {STAGING} AS s
+                WHERE NOT EXISTS (SELECT 1 FROM "Vehicle" AS v WHERE v."url" = s."url")
+            """)
+            retired = 0
+            if retire_missing:
+                if retire_prefixes is None:
+                    retire_prefixes = prefixes_for(rows)
+                if retire_prefixes:
+                    prefixed = ' OR '.join([f""""url" LIKE {self.mark} ESCAPE '\\'"""] * len(retire_prefixes))
+                    retired = self._execute(cursor, f"""
+                        UPDATE "Vehicle" SET "disponivel" = false, "updatedAt" = CURRENT_TIMESTAMP
+                        WHERE "disponivel" AND ({prefixed})
+                          AND NOT EXISTS (SELECT 1 FROM {STAGING} AS s WHERE s."url" = "Vehicle"."url")
+                    """, [_like_prefix(prefix) for prefix in retire_prefixes])
+            cursor.execute(f'DROP TABLE {STAGING}')
+        except BaseException:
+            if self.sqlite:
+                cursor.execute('ROLLBACK')
+            else:
+                self.conn.rollback()
+            raise
+        if self.sqlite:
+            cursor.execute('COMMIT')
+        else:
+            self.conn.commit()
+        elapsed = time.perf_counter() - start
+        return {
+            'rows': staged,
+            'inserted': inserted,
+            'updated': updated,
+            'retired': retired,
+            'skipped': skipped,
+            'seconds': round(elapsed, 3),
+            'rowsPerSec': round(staged / elapsed, 1) if elapsed else 0.0,
+        }
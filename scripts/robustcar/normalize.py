@@ -0,0 +1,84 @@
+"""Normalização de um anúncio bruto da Robustcar para o formato do JSON final."""
+
+import re
+
+from robustcar.category import detect_category
+
+BASE_URL = 'https://robustcar.com.br'
+
+
+# Função para extrair preço
+def extract_price(price_text):
+    if 'Consulte' in price_text:
+        return None
+
+    # Remove R$ e pontos, mantém apenas números
+    price_clean = re.sub(r'[R$\s.]', '', price_text)
+    price_clean = price_clean.replace(',', '.')
+
+    try:
+        return float(price_clean)
+    except:
+        return None
+
+# Função para limpar quilometragem
+def clean_mileage(mileage_text):
+    mileage_clean = mileage_text.replace('.', '').replace(',', '').strip()
+    try:
+        return int(mileage_clean)
+    except:
+        return 0
+
+# Normalizar combustível
+def normalize_fuel(fuel_text):
+    fuel = fuel_text.upper()
+    if 'ELÉTRICO' in fuel or 'ELETRICO' in fuel:
+        fuel = 'ELÉTRICO'
+    elif 'HÍBRIDO' in fuel or 'HIBRIDO' in fuel:
+        fuel = 'HÍBRIDO'
+    return fuel
+
+# Câmbio a partir da versão (mesma regra de detectTransmission no seed)
+def detect_transmission(version):
+    version = version.upper()
+    if 'AUT' in version or 'AUTOMATICO' in version or 'CVT' in version:
+        return 'Automático'
+    return 'Manual'
+
+# Opcionais a partir da versão (mesma regra de detectFeatures no seed)
+def detect_features(version):
+    version = version.upper()
+    complete = 'BASE' not in version
+    return {
+        "arCondicionado": complete,
+        "direcaoHidraulica": True,
+        "airbag": True,
+        "abs": True,
+        "vidroEletrico": complete,
+        "travaEletrica": complete,
+        "alarme": True,
+        "rodaLigaLeve": 'LTZ' in version or 'EX' in version or 'LIMITED' in version,
+        "som": True,
+        "portas": 4
+    }
+
+# URL absoluta do anúncio (o site entrega caminhos relativos)
+def absolute_url(detail_url):
+    if detail_url.startswith('http'):
+        return detail_url
+    return BASE_URL + detail_url
+
+# Anúncio bruto -> registro normalizado (mesmas chaves e ordem do JSON)
+def normalize_vehicle(vehicle):
+    return {
+        "brand": vehicle['brand'],
+        "model": vehicle['model'],
+        "version": vehicle['version'],
+        "year": int(vehicle['year']),
+        "mileage": clean_mileage(vehicle['mileage']),
+        "fuel": normalize_fuel(vehicle['fuel']),
+        "color": vehicle['color'],
+        "price": extract_price(vehicle['price']),
+        "detailUrl": absolute_url(vehicle['detailUrl']),
+        "category": detect_category(vehicle['model'])
+    }
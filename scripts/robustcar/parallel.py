@@ -0,0 +1,112 @@
+"""Normalização em paralelo com ProcessPoolExecutor (``--workers N``).
+
+A entrada é dividida em blocos e cada bloco trafega entre processos como um
+único payload compacto — bytes NDJSON no modo streaming, tuplas de colunas no
+modo lista — em vez de um dict picklado por anúncio. Os resultados voltam na
+ordem da entrada, com no máximo ``2 * workers`` blocos em voo para manter a
+memória limitada.
+
+Os workers usam o método de início padrão da plataforma: o pipeline fica
+atrás de ``main()`` (``robustcar/cli.py``), então spawn/forkserver
+reimportam o script sem executá-lo.
+"""
+
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from robustcar.normalize import normalize_vehicle
+from robustcar.record import Vehicle
+from robustcar.stats import SnapshotStats
+
+DEFAULT_CHUNK = 5_000
+
+RAW_FIELDS = ('brand', 'model', 'version', 'year', 'mileage', 'fuel', 'color', 'price', 'detailUrl')
+OUT_FIELDS = ('brand', 'model', 'version', 'year', 'mileage', 'fuel', 'color', 'price',
+              'detailUrl', 'category')
+
+
+def normalize_ndjson_chunk(blob, stats=None):
+    """Worker: bloco de linhas NDJSON brutas -> bloco NDJSON normalizado."""
+    out = []
+    for line in blob.splitlines():
+        if line.strip():
+            record = normalize_vehicle(json.loads(line))
+            if stats is not None:
+                stats.add(record)
+            out.append(json.dumps(record, ensure_ascii=False))
+    if not out:
+        return b''
+    return ('\n'.join(out) + '\n').encode('utf-8')
+
+
+def normalize_ndjson_chunk_stats(blob):
+    """Worker: bloco normalizado e o agregado parcial do bloco (``SnapshotStats``)."""
+    stats = SnapshotStats()
+    return normalize_ndjson_chunk(blob, stats), stats.compress()
+
+
+def normalize_column_chunk(columns):
+    """Worker: tupla de colunas brutas -> tupla de colunas normalizadas."""
+    records = [normalize_vehicle(dict(zip(RAW_FIELDS, row))) for row in zip(*columns)]
+    return tuple(tuple(r[field] for r in records) for field in OUT_FIELDS)
+
+
+def to_columns(records):
+    return tuple(tuple(r[field] for r in records) for field in RAW_FIELDS)
+
+
+def from_columns(columns):
+    return [Vehicle.from_row(row) for row in zip(*columns)]
+
+
+def ordered_map(executor, fn, payloads, window):
+    """Como ``executor.map``, mas consumindo a entrada sob demanda."""
+    pending = deque()
+    for payload in payloads:
+        pending.append(executor.submit(fn, payload))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def line_chunks(src, chunk_size=DEFAULT_CHUNK):
+    """Agrupa as linhas de um arquivo binário em blocos de bytes."""
+    while True:
+        lines = list(islice(src, chunk_size))
+        if not lines:
+            return
+        yield b''.join(lines)
+
+
+def run_ndjson(src, dst, workers, chunk_size=DEFAULT_CHUNK, on_chunk=None, stats=None):
+    """Streaming paralelo: ``src``/``dst`` binários. Devolve o total de registros.
+
+    Com ``stats`` (um ``SnapshotStats``), cada worker agrega o seu bloco e os
+    parciais são mesclados aqui.
+    """
+    total = 0
+    worker = normalize_ndjson_chunk if stats is None else normalize_ndjson_chunk_stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for blob in ordered_map(executor, worker, line_chunks(src, chunk_size), 2 * workers):
+            if stats is not None:
+                blob, partial = blob
+                stats.merge(partial)
+            dst.write(blob)
+            total += blob.count(b'\n')
+            if on_chunk is not None:
+                on_chunk(blob)
+    return total
+
+
+def normalize_many(records, workers, chunk_size=DEFAULT_CHUNK):
+    """Lista de anúncios brutos -> lista de ``Vehicle``, na mesma ordem."""
+    records = iter(records)
+    chunks = iter(lambda: to_columns(list(islice(records, chunk_size))), to_columns([]))
+    vehicles = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for columns in ordered_map(executor, normalize_column_chunk, chunks, 2 * workers):
+            vehicles.extend(from_columns(columns))
+    return vehicles
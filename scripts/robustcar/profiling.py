@@ -0,0 +1,124 @@
+"""Instrumentação por etapa do pipeline (``--profile``).
+
+``StageTimer`` mede cada etapa com ``perf_counter`` e conta registros; o
+relatório em JSON traz tempo de parede, registros/s e pico de RSS, para
+comparar execuções. ``normalize_staged`` faz a mesma normalização de
+``Vehicle.from_raw``, mas coluna a coluna, para que combustível, preço,
+quilometragem e categoria apareçam como etapas separadas.
+"""
+
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from robustcar.category import classify_many
+from robustcar.normalize import absolute_url, clean_mileage, extract_price, normalize_fuel
+from robustcar.record import Vehicle
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KiB, macOS em bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = []
+        self._current = None
+        self._nested = 0.0  # tempo de etapas ``timed`` dentro da etapa atual
+        self._started = time.perf_counter()
+
+    def begin(self, name):
+        self.end()
+        self._current = (name, time.perf_counter())
+        self._nested = 0.0
+
+    def end(self, records=None):
+        if self._current is None:
+            return
+        name, start = self._current
+        self._current = None
+        self.stages.append((name, time.perf_counter() - start - self._nested, records))
+        self._nested = 0.0
+
+    @contextmanager
+    def stage(self, name, records=None):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(records)
+
+    def timed(self, name, iterable, records=None):
+        """Repassa ``iterable`` medindo só o tempo de produzir os itens (ex.: a
+        codificação dentro de ``write``); vira a etapa ``name`` e sai da atual."""
+        seconds = 0.0
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                seconds += time.perf_counter() - start
+            yield item
+        self._nested += seconds
+        self.stages.append((name, seconds, records))
+
+    def report(self):
+        self.end()
+        stages = []
+        for name, seconds, records in self.stages:
+            entry = {'stage': name, 'seconds': round(seconds, 6)}
+            if records is not None:
+                entry['records'] = records
+                entry['recordsPerSec'] = round(records / seconds, 1) if seconds else None
+            stages.append(entry)
+        return {
+            'generatedAt': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'totalSeconds': round(time.perf_counter() - self._started, 6),
+            'peakRssBytes': peak_rss_bytes(),
+            'stages': stages,
+        }
+
+    def write_report(self, path):
+        payload = json.dumps(self.report(), ensure_ascii=False, indent=2)
+        if path in (None, '-'):
+            print(payload, file=sys.stderr)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(payload + '\n')
+
+
+def normalize_staged(source, timer):
+    """Lista de anúncios brutos -> lista de ``Vehicle``, uma etapa por campo."""
+    n = len(source)
+    with timer.stage('fuel', n):
+        fuels = [normalize_fuel(v['fuel']) for v in source]
+    with timer.stage('price', n):
+        prices = [extract_price(v['price']) for v in source]
+    with timer.stage('mileage', n):
+        mileages = [clean_mileage(v['mileage']) for v in source]
+    with timer.stage('category', n):
+        categories = classify_many([v['model'] for v in source])
+    with timer.stage('build', n):
+        vehicles = [
+            Vehicle.from_row((v['brand'], v['model'], v['version'], int(v['year']), mileage,
+                              fuel, v['color'], price, absolute_url(v['detailUrl']), category))
+            for v, fuel, price, mileage, category
+            in zip(source, fuels, prices, mileages, categories)
+        ]
+    return vehicles
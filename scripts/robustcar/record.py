@@ -0,0 +1,85 @@
+"""Registro de veículo compacto (``__slots__``) para lotes grandes em memória.
+
+Um dict de 10 chaves por veículo custa algumas centenas de bytes, e marca,
+modelo, combustível, cor e categoria se repetem em milhares de registros.
+``Vehicle`` usa slots e internaliza esses campos de baixa cardinalidade (e o
+ano), então registros iguais apontam para as mesmas strings.
+
+``Vehicle`` também se comporta como um mapping somente leitura
+(``v['price']``, ``v.get``, ``dict(v)``), então os módulos que recebem dicts
+(delta, state, columnar) aceitam os dois. Para JSON use ``to_dict`` ou
+``json.dump(..., default=Vehicle.to_dict)`` — o formato é o mesmo.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from robustcar.normalize import absolute_url, clean_mileage, extract_price, normalize_fuel
+from robustcar.category import detect_category
+
+FIELDS = ('brand', 'model', 'version', 'year', 'mileage', 'fuel', 'color', 'price',
+          'detailUrl', 'category')
+
+_intern = sys.intern
+_years = {}
+
+
+@dataclass(slots=True, frozen=True)
+class Vehicle(Mapping):
+    brand: str
+    model: str
+    version: str
+    year: int
+    mileage: int
+    fuel: str
+    color: str
+    price: float | None
+    detailUrl: str
+    category: str
+
+    @classmethod
+    def from_raw(cls, vehicle):
+        """Mesmo resultado de ``normalize_vehicle``, já no formato compacto."""
+        year = int(vehicle['year'])
+        model = _intern(vehicle['model'])
+        return cls(
+            _intern(vehicle['brand']),
+            model,
+            vehicle['version'],
+            _years.setdefault(year, year),
+            clean_mileage(vehicle['mileage']),
+            _intern(normalize_fuel(vehicle['fuel'])),
+            _intern(vehicle['color']),
+            extract_price(vehicle['price']),
+            absolute_url(vehicle['detailUrl']),
+            detect_category(model),
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        """Tupla já normalizada, na ordem de ``FIELDS`` -> Vehicle."""
+        brand, model, version, year, mileage, fuel, color, price, detail_url, category = row
+        return cls(
+            _intern(brand), _intern(model), version, _years.setdefault(year, year),
+            mileage, _intern(fuel), _intern(color), price, detail_url, _intern(category),
+        )
+
+    @classmethod
+    def from_dict(cls, record):
+        """Registro normalizado (dict do JSON) -> Vehicle."""
+        return cls.from_row([record[name] for name in FIELDS])
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
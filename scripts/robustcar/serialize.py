@@ -0,0 +1,93 @@
+"""Serialização do snapshot em streaming, com orjson/msgspec quando instalados.
+
+``iter_json`` gera o array JSON em pedaços de ``bytes``, um bloco de
+registros por vez, então o snapshot nunca existe inteiro como string e a
+gravação (``SnapshotWriter.write``) começa antes de o último registro ser
+codificado. Cada bloco é codificado como uma lista pelo backend e emendado
+aos demais sem os colchetes.
+
+- ``pretty``: bytes idênticos a ``json.dumps(..., ensure_ascii=False, indent=2)``,
+  o formato que o seed lê hoje;
+- ``compact``: sem espaços (``separators=(',', ':')``).
+
+Backends, em ordem de preferência: ``orjson``, ``msgspec``, ``stdlib``.
+orjson e msgspec serializam ``Vehicle`` (dataclass) direto; o stdlib usa
+``Vehicle.to_dict``. Os preços ficam bem abaixo de 1e16, faixa em que os três
+escrevem floats da mesma forma (``62990.0``).
+"""
+
+import json
+
+from robustcar.record import Vehicle
+
+BACKENDS = ('orjson', 'msgspec', 'stdlib')
+FORMATS = ('pretty', 'compact')
+CHUNK = 1_000
+
+
+def _stdlib(pretty):
+    if pretty:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2, default=Vehicle.to_dict)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=Vehicle.to_dict)
+    return lambda records: encoder.encode(records).encode('utf-8')
+
+
+def _orjson(pretty):
+    import orjson
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return lambda records: orjson.dumps(records, option=option)
+
+
+def _msgspec(pretty):
+    import msgspec
+    encode = msgspec.json.Encoder(enc_hook=Vehicle.to_dict).encode
+    if pretty:
+        return lambda records: msgspec.json.format(encode(records), indent=2)
+    return encode
+
+
+_FACTORIES = {'orjson': _orjson, 'msgspec': _msgspec, 'stdlib': _stdlib}
+
+
+def resolve_backend(name='auto'):
+    """``auto`` -> o primeiro backend instalado; nome explícito ausente -> RuntimeError."""
+    if name not in ('auto', *BACKENDS):
+        raise ValueError(f'backend JSON desconhecido: {name}')
+    for candidate in (BACKENDS if name == 'auto' else (name,)):
+        if candidate == 'stdlib':
+            return candidate
+        try:
+            __import__(candidate)
+            return candidate
+        except ImportError:
+            if name != 'auto':
+                raise RuntimeError(f'backend JSON {name} não instalado (pip install {name})')
+
+
+def iter_json(records, fmt='pretty', backend='auto', chunk_size=CHUNK):
+    """Array JSON de ``records`` (``Vehicle`` ou dicts) em pedaços de bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f'formato JSON desconhecido: {fmt}')
+    pretty = fmt == 'pretty'
+    encode = _FACTORIES[resolve_backend(backend)](pretty)
+    # pretty: '[\n  {...},\n  {...}\n]'; compact: '[{...},{...}]'
+    head, strip, separator, tail = (b'[\n', 2, b',\n', b'\n]') if pretty else (b'[', 1, b',', b']')
+    records = iter(records)
+    first = True
+    while True:
+        block = []
+        for record in records:
+            block.append(record)
+            if len(block) == chunk_size:
+                break
+        if not block:
+            break
+        body = encode(block)[strip:-strip]
+        yield (head if first else separator) + body
+        first = False
+    yield b'[]' if first else tail
+
+
+def dumps(records, fmt='pretty', backend='auto'):
+    return b''.join(iter_json(records, fmt, backend))
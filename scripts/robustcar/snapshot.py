@@ -0,0 +1,223 @@
+"""Gravação atômica do snapshot, com compressão opcional e versões.
+
+Quem lê o snapshot (seed-on-start, rotas de admin) nunca vê um arquivo pela
+metade: o conteúdo vai em blocos para um temporário no mesmo diretório
+(passando por gzip ou zstd, se pedido), recebe ``fsync`` e só então substitui
+o destino com ``os.replace``, que é atômico no mesmo sistema de arquivos.
+
+Com ``keep > 0`` cada execução grava ``<nome>.<carimbo>.json[.gz|.zst]`` e o
+destino vira o ponteiro ``latest``: um symlink (ou hard link, onde symlink
+não é permitido) trocado atomicamente para a versão nova; sobram as ``keep``
+versões mais recentes.
+
+zstd usa ``compression.zstd`` (Python 3.14+) ou o pacote ``zstandard``.
+"""
+
+import gzip
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+
+COMPRESSIONS = ('gzip', 'zstd')
+SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+BLOCK = 1 << 20
+
+_MAGIC = {b'\x1f\x8b': 'gzip', b'\x28\xb5': 'zstd'}
+
+
+# scripts/, onde o seed e as rotas de admin procuram o snapshot
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_output(directory=SCRIPTS_DIR):
+    """``$ROBUSTCAR_OUTPUT`` ou ``robustcar-vehicles.json`` em ``directory``."""
+    return os.environ.get('ROBUSTCAR_OUTPUT') or os.path.join(directory, 'robustcar-vehicles.json')
+
+
+def sidecar_path(snapshot_path, suffix):
+    """Arquivo auxiliar ao lado do snapshot: ``x.json`` + ``.stats.json`` -> ``x.stats.json``.
+
+    Só ``.json`` é trocado; outros nomes (``saida.ndjson``) ganham o sufixo inteiro.
+    """
+    root = snapshot_path[:-5] if snapshot_path.endswith('.json') else snapshot_path
+    return root + suffix
+
+
+def split_compression(path, compression=None):
+    """``x.json.gz`` -> (``x.json``, 'gzip'); o sufixo do caminho vale se não houver ``compression``."""
+    for name, suffix in SUFFIXES.items():
+        if path.endswith(suffix):
+            return path[:-len(suffix)], compression or name
+    return path, compression
+
+
+def _zstd():
+    try:
+        from compression import zstd
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise RuntimeError('zstd requer Python 3.14+ ou o pacote zstandard (pip install zstandard)')
+
+
+def _compressed_writer(raw, compression):
+    if compression is None:
+        return raw
+    if compression == 'gzip':
+        # mtime=0: mesmo conteúdo, mesmos bytes
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    zstd = _zstd()
+    if hasattr(zstd, 'ZstdFile'):
+        return zstd.ZstdFile(raw, 'wb', level=ZSTD_LEVEL)
+    return zstd.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+
+
+def open_snapshot(path):
+    """Abre o snapshot para leitura como texto, descomprimindo pelo cabeçalho."""
+    raw = open(path, 'rb')
+    compression = _MAGIC.get(raw.peek(2)[:2])
+    if compression == 'gzip':
+        binary = gzip.GzipFile(fileobj=raw, mode='rb')
+    elif compression == 'zstd':
+        zstd = _zstd()
+        binary = (zstd.ZstdFile(raw, 'rb') if hasattr(zstd, 'ZstdFile')
+                  else zstd.ZstdDecompressor().stream_reader(raw))
+    else:
+        binary = raw
+    return io.TextIOWrapper(binary, encoding='utf-8')
+
+
+def read_snapshot(path):
+    with open_snapshot(path) as f:
+        return json.load(f)
+
+
+def _fsync_directory(directory):
+    # Garante que o rename sobreviva a uma queda de energia (não existe no Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path, chunks, compression=None):
+    """Grava os pedaços (``str`` ou ``bytes`` UTF-8) em ``path`` via temporário + fsync + rename.
+
+    Devolve ``(bytes sem compressão, bytes no disco)``.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    temp = os.path.join(directory, f'.{os.path.basename(path)}.{os.getpid()}.tmp')
+    # os.open com 0o666 respeita o umask, como o open() que isto substitui
+    fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o666)
+    written = 0
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            out = _compressed_writer(raw, compression)
+            pending = []
+            size = 0
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                pending.append(chunk)
+                size += len(chunk)
+                if size >= BLOCK:
+                    data = b''.join(pending)
+                    out.write(data)
+                    written += len(data)
+                    pending = []
+                    size = 0
+            data = b''.join(pending)
+            out.write(data)
+            written += len(data)
+            if out is not raw:
+                out.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+            stored = os.fstat(raw.fileno()).st_size
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+    return written, stored
+
+
+def _point(link, target):
+    """Troca ``link`` atomicamente para apontar para ``target`` (mesmo diretório)."""
+    temp = f'{link}.{os.getpid()}.link'
+    if os.path.lexists(temp):
+        os.remove(temp)
+    try:
+        os.symlink(os.path.basename(target), temp)
+    except (OSError, NotImplementedError):
+        os.link(target, temp)
+    os.replace(temp, link)
+
+
+class SnapshotWriter:
+    """Destino do snapshot: caminho lógico ``.json``, compressão e versões mantidas.
+
+    ``path`` é o arquivo que os leitores abrem (com o sufixo da compressão);
+    os arquivos auxiliares (delta, stats...) seguem o caminho lógico.
+    """
+
+    def __init__(self, path, compression=None, keep=0):
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f'compressão não suportada: {compression}')
+        self.logical_path, self.compression = split_compression(path, compression)
+        if self.compression == 'zstd':
+            _zstd()
+        self.path = self.logical_path + SUFFIXES.get(self.compression, '')
+        # Diretório criado já aqui: sem ele a execução coletaria e atualizaria o
+        # estado para só então falhar ao gravar delta e snapshot
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.keep = keep
+        self.version_path = None
+
+    def _versions(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        root, ext = os.path.splitext(os.path.basename(self.logical_path))
+        ext += SUFFIXES.get(self.compression, '')
+        # O carimbo tem largura fixa, então a ordem alfabética é a cronológica
+        pattern = re.compile(re.escape(root) + r'\.\d{8}T\d{12}Z' + re.escape(ext) + '$')
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if pattern.match(name))
+
+    def write(self, chunks):
+        """Grava e devolve ``{path, bytes, storedBytes, seconds, mbPerSec}``."""
+        start = time.perf_counter()
+        if self.keep > 0:
+            root, ext = os.path.splitext(self.logical_path)
+            stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+            self.version_path = f'{root}.{stamp}{ext}{SUFFIXES.get(self.compression, "")}'
+            written, stored = atomic_write(self.version_path, chunks, self.compression)
+            _point(self.path, self.version_path)
+            for old in self._versions()[:-self.keep]:
+                os.remove(old)
+        else:
+            written, stored = atomic_write(self.path, chunks, self.compression)
+        elapsed = time.perf_counter() - start
+        return {
+            'path': self.version_path or self.path,
+            'bytes': written,
+            'storedBytes': stored,
+            'seconds': round(elapsed, 3),
+            'mbPerSec': round(written / 1e6 / elapsed, 1) if elapsed else 0.0,
+        }
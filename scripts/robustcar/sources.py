@@ -0,0 +1,107 @@
+"""Registro de lojas (fontes) que compartilham a mesma coleta e normalização.
+
+Cada loja fornece só o que é dela: caminho da busca, o parser da página e,
+se o site usar outros nomes, o mapeamento para o formato de
+``fixtures.vehicles_data()``. Coleta (pool, retry, cache condicional), normalização
+(``extract_price``, ``clean_mileage``, combustível, categoria), dedup e
+exportação são as mesmas para todas.
+
+``scrape_sources`` coleta todas as lojas ao mesmo tempo sobre um único
+``ConnectionPool`` (limite global de conexões e por host) e um único
+``RateLimiter`` (requisições/s somadas), então o tempo total fica perto do
+da loja mais lenta, não da soma.
+
+Nova loja::
+
+    sources.register(sources.Source('loja', 'https://loja.com.br', '/estoque?p={page}', parse_estoque))
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from urllib.parse import urljoin
+
+from robustcar import fetch
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    base_url: str
+    listing_path: str                # com ``{page}``
+    parse_page: object               # HTML da busca -> anúncios brutos
+    map_listing: object = None       # anúncio do site -> chaves de ``fixtures.vehicles_data()``
+    # normalize_vehicle completa URLs relativas com o domínio da Robustcar;
+    # nas demais lojas o ``detailUrl`` sai absoluto daqui
+    absolute_urls: bool = True
+
+
+SOURCES = {}
+
+
+def register(source):
+    SOURCES[source.name] = source
+    return source
+
+
+register(Source('robustcar', fetch.BASE_URL, fetch.LISTING_PATH, fetch.parse_listing_page,
+                absolute_urls=False))
+
+
+def url_prefix(source):
+    """Início comum das ``detailUrl`` da loja: ``https://loja.com.br/``."""
+    return source.base_url.rstrip('/') + '/'
+
+
+def prefixes_for(urls):
+    """Prefixos das lojas registradas que aparecem em ``urls``, na ordem do registro."""
+    prefixes = [url_prefix(source) for source in SOURCES.values()]
+    found = set()
+    for url in urls:
+        for prefix in prefixes:
+            if url.startswith(prefix):
+                found.add(prefix)
+                break
+    return [prefix for prefix in prefixes if prefix in found]
+
+
+def _finish(source, raw):
+    if source.map_listing is not None:
+        raw = [source.map_listing(item) for item in raw]
+    if source.absolute_urls:
+        for item in raw:
+            item['detailUrl'] = urljoin(source.base_url, item['detailUrl'])
+    return raw
+
+
+async def scrape_sources(sources, pages=None, details=False, limit=16, limit_per_host=4, rate=None,
+                         retries=3, backoff=0.5, cache=None, stats=None):
+    """Coleta as lojas em paralelo sob um orçamento só de conexões e requisições/s.
+
+    Devolve os anúncios brutos (loja a loja, na ordem de ``sources``) e, por
+    loja, ``{listings, seconds}``.
+    """
+    pool = fetch.ConnectionPool(limit=limit, limit_per_host=limit_per_host)
+    fetcher = fetch.Fetcher(pool, cache=cache, retries=retries, backoff=backoff, stats=stats,
+                            rate_limiter=fetch.RateLimiter(rate) if rate else None)
+
+    async def one(source):
+        start = time.perf_counter()
+        raw = await fetch.crawl(fetcher, source.base_url, source.listing_path, source.parse_page,
+                                pages=pages, details=details, window=limit_per_host)
+        return _finish(source, raw), time.perf_counter() - start
+
+    try:
+        results = await asyncio.gather(*(one(source) for source in sources))
+    finally:
+        fetcher.stats.finished = time.perf_counter()
+        await pool.close()
+        fetcher.cache.save()
+    raw = [item for items, _ in results for item in items]
+    per_source = {source.name: {'listings': len(items), 'seconds': round(seconds, 3)}
+                  for source, (items, seconds) in zip(sources, results)}
+    return raw, per_source
+
+
+def scrape_sources_sync(sources, **kwargs):
+    return asyncio.run(scrape_sources(sources, **kwargs))
@@ -0,0 +1,144 @@
+"""Ficha técnica a partir da versão do anúncio (câmbio, motor, turbo, portas, válvulas, acabamento).
+
+A versão concentra tudo: "HATCH PREM. 1.0 12V TB FLEX 5P AUT.",
+"5X PRO 1.5 TURBO FLEX AUT", e variações coladas como "XEI18FLEX", "1016V",
+"16SE" ou "125CC". ``parse_version`` faz uma única passada de ``finditer``
+com uma regex combinada (um grupo nomeado por tipo de termo) e memoriza o
+resultado por string distinta: no estoque as versões se repetem muito.
+
+Ao contrário de ``detect_transmission``/``detect_features`` (regras do seed,
+mantidas para o JSON e a descrição), aqui só entra o que está escrito: sem
+marcador de câmbio, ``cambio`` é ``None``; sem "4P", ``portas`` é ``None``.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from robustcar.snapshot import sidecar_path
+
+CACHE_SIZE = 65_536
+
+# Início/fim de termo: não colado em letra, dígito (nem ponto, no início)
+_B = r'(?<![A-Z0-9.])'
+_E = r'(?![A-Z0-9])'
+
+# Compilada no primeiro uso: a regex custa alguns ms e importar o módulo não deve pagar isso
+_PATTERN_SOURCE = rf"""
+    (?=[A-Z0-9])  # espaço e pontuação falham aqui, sem testar cada alternativa
+  (?:
+    {_B}(?P<ev_engine>[1-3]\d)(?P<ev_valves>8|12|16|20|24)V{_E}           # 1016V = 1.0 16V
+  | {_B}(?P<engine>\d[.,]\d)(?:L|(?P<engine_gear>[AM]))?{_E}             # 1.0, 1.0L, 1.6A, 1.0M
+  | {_B}(?P<cc>\d{{2,4}})\s?CC{_E}                                       # 125CC
+  | {_B}(?P<valves>8|12|16|20|24|32)V{_E}
+  | {_B}(?P<doors>[2-5])P{_E}
+  | {_B}(?P<automatic>AUT(?:OMATIC[OA]?|O)?\.?|AT\d?|CVT|POWER\s?SHIFT|DCT|TIPTRONIC){_E}
+  | {_B}(?P<manual>MANUAL|MEC(?:ANICO)?\.?|MT\d?){_E}
+  | {_B}(?P<turbo>TURBO(?:FLEX)?|TB|TGDI|TSI|TFSI|THP|T\d{{3}}){_E}
+  | (?<![\d.])(?P<glued>[1-3]\d)(?=L{_E}|[A-Z]{{2}})                     # 18 em XEI18FLEX, 16SE, 25L
+  | (?P<code>\d+[A-Z]+\d*){_E}                                            # 5X, 4WD, 4X4, 90M
+  | (?P<word>[A-Z]+(?:\d+(?![A-Z0-9]))?\.?)                            # PREM., TR4, EX2
+  )"""
+
+
+_compiled_pattern = None
+
+
+def _pattern():
+    global _compiled_pattern
+    if _compiled_pattern is None:
+        _compiled_pattern = re.compile(_PATTERN_SOURCE, re.VERBOSE)
+    return _compiled_pattern
+
+
+# Abreviações do site -> nome do acabamento
+TRIM_ALIASES = {
+    'PREM': 'PREMIER', 'COMF': 'COMFORT', 'LGTD': 'LIMITED', 'PREC': 'PRECISION',
+    'EXPR': 'EXPRESSION',
+}
+# Palavras da versão que não são acabamento (combustível, carroceria, injeção)
+NOT_TRIM = frozenset({
+    'FLEX', 'GASOLINA', 'DIESEL', 'ALCOOL', 'HYBRID', 'HIBRIDO', 'ELETRICO', 'GNV',
+    'HATCH', 'SEDAN', 'MPI', 'MPFI', 'MSI', 'VHC', 'FIRE', 'EVO', 'NOVO', 'L', 'CC',
+})
+
+
+@dataclass(slots=True, frozen=True)
+class VersionSpecs:
+    cambio: str | None          # 'Automático' / 'Manual'
+    motor_litros: float | None
+    turbo: bool
+    portas: int | None
+    valvulas: int | None
+    trim: tuple
+
+    def to_dict(self):
+        return {
+            'cambio': self.cambio,
+            'motorLitros': self.motor_litros,
+            'turbo': self.turbo,
+            'portas': self.portas,
+            'valvulas': self.valvulas,
+            'trim': list(self.trim),
+        }
+
+
+def _parse(version):
+    text = version.upper()
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    cambio = motor = portas = valvulas = None
+    turbo = False
+    trim = []
+    for match in _pattern().finditer(text):
+        kind = match.lastgroup
+        if kind == 'word':
+            word = match.group('word').rstrip('.')
+            if word not in NOT_TRIM:
+                trim.append(TRIM_ALIASES.get(word, word))
+        elif kind == 'code':
+            trim.append(match.group('code'))
+        elif kind == 'engine' or kind == 'engine_gear':
+            motor = motor or float(match.group('engine').replace(',', '.'))
+            gear = match.group('engine_gear')
+            if gear and cambio is None:
+                # Hyundai: "1.6A" automático, "1.0M" manual
+                cambio = 'Automático' if gear == 'A' else 'Manual'
+        elif kind == 'ev_valves':
+            engine = match.group('ev_engine')
+            motor = motor or int(engine) / 10
+            valvulas = valvulas or int(match.group('ev_valves'))
+        elif kind == 'glued':
+            motor = motor or int(match.group('glued')) / 10
+        elif kind == 'cc':
+            motor = motor or int(match.group('cc')) / 1000
+        elif kind == 'valves':
+            valvulas = valvulas or int(match.group('valves'))
+        elif kind == 'doors':
+            portas = portas or int(match.group('doors'))
+        elif kind == 'automatic':
+            cambio = 'Automático'
+        elif kind == 'manual':
+            cambio = cambio or 'Manual'
+        elif kind == 'turbo':
+            turbo = True
+    return VersionSpecs(cambio, motor, turbo, portas, valvulas, tuple(trim))
+
+
+parse_version = lru_cache(maxsize=CACHE_SIZE)(_parse)
+parse_version.__doc__ = 'Versão -> ``VersionSpecs`` (memorizado por string).'
+
+
+def version_specs(vehicles):
+    """Ficha de cada versão distinta do lote, em ordem de primeira aparição."""
+    table = {}
+    for vehicle in vehicles:
+        version = vehicle['version']
+        if version not in table:
+            table[version] = parse_version(version).to_dict()
+    return table
+
+
+def specs_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.specs.json')
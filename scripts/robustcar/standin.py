@@ -0,0 +1,127 @@
+"""Servidor HTTP local que imita as páginas da Robustcar a partir de anúncios brutos.
+
+Serve ``/busca//pag/N/ordem/ano-desc/`` e cada ``detailUrl`` com ETag e
+Last-Modified, respondendo 304 a requisições condicionais. Serve para
+exercitar ``robustcar.fetch`` sem acessar o site real.
+"""
+
+import hashlib
+import html
+import re
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_LISTING_RE = re.compile(r'^/busca//pag/(\d+)/ordem/ano-desc/$')
+
+LAST_MODIFIED = formatdate(0, usegmt=True)
+
+
+def render_card(item):
+    e = html.escape
+    title = f"{item['year']} {item['brand']} {item['model']} {item['version']}".strip()
+    return (
+        '<div class="resultado-busca">'
+        f'<h3><a href="{e(item["detailUrl"])}">{e(title)}</a></h3>'
+        '<ul class="list-unstyled">'
+        f'<li>{e(item["fuel"])}</li><li>{e(item["color"])}</li>'
+        f'<li>{e(item["year"])}</li><li>{e(item["mileage"])}</li>'
+        '</ul>'
+        f'<h4 class="preco">{e(item["price"])}</h4>'
+        '</div>'
+    )
+
+
+def render_listing_page(items):
+    cards = ''.join(render_card(item) for item in items)
+    return f'<!DOCTYPE html><html><body><div class="lista">{cards}</div></body></html>'
+
+
+class StandInServer:
+    """Roda em thread própria; use como context manager.
+
+    ``fail_first`` faz o primeiro acesso a cada caminho responder 503 (para
+    exercitar o retry) e ``sold`` é um conjunto de ``detailUrl`` que
+    respondem 404.
+    """
+
+    def __init__(self, listings, per_page=20, fail_first=False, sold=(), delay=0.0):
+        self.listings = listings
+        self.per_page = per_page
+        self.fail_first = fail_first
+        self.sold = set(sold)
+        self.delay = delay
+        self.requests = 0
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._details = {item['detailUrl']: item for item in listings}
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def page(self, number):
+        start = (number - 1) * self.per_page
+        return self.listings[start:start + self.per_page]
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path
+            with server._lock:
+                server.requests += 1
+                first = path not in server._seen
+                server._seen.add(path)
+            if server.delay:
+                threading.Event().wait(server.delay)
+            if server.fail_first and first:
+                return self._send(503, b'')
+
+            match = _LISTING_RE.match(path)
+            if match:
+                body = render_listing_page(server.page(int(match.group(1))))
+            elif path in server._details and path not in server.sold:
+                item = server._details[path]
+                body = f'<html><body><h1>{html.escape(item["model"])}</h1></body></html>'
+            else:
+                return self._send(404, b'')
+
+            payload = body.encode('utf-8')
+            etag = '"%s"' % hashlib.md5(payload).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, b'', etag)
+            self._send(200, payload, etag)
+
+        def _send(self, status, payload, etag=None):
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', LAST_MODIFIED)
+            if status != 304:
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            if payload:
+                self.wfile.write(payload)
+
+    return Handler
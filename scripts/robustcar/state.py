@@ -0,0 +1,148 @@
+"""Estado persistente dos anúncios entre execuções (SQLite embutido).
+
+Guarda cada veículo normalizado pelo id do anúncio com ``first_seen`` /
+``last_seen`` e um histórico de preços. As gravações são feitas em lote
+(``executemany`` por blocos, uma transação por bloco) com o banco em modo WAL.
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from itertools import islice
+
+from robustcar.delta import listing_id, record_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id          TEXT PRIMARY KEY,
+    hash        TEXT NOT NULL,
+    brand       TEXT,
+    model       TEXT,
+    version     TEXT,
+    year        INTEGER,
+    mileage     INTEGER,
+    fuel        TEXT,
+    color       TEXT,
+    price       REAL,
+    detail_url  TEXT,
+    category    TEXT,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    removed_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS price_history (
+    id       TEXT NOT NULL,
+    price    REAL,
+    seen_at  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS price_history_id ON price_history (id, seen_at);
+CREATE INDEX IF NOT EXISTS listings_last_seen ON listings (last_seen);
+"""
+
+# Histórico só ganha linha quando o preço muda (ou o anúncio é novo)
+_INSERT_PRICE = """
+INSERT INTO price_history (id, price, seen_at)
+SELECT ?, ?, ?
+WHERE NOT EXISTS (SELECT 1 FROM listings WHERE id = ? AND price IS ?)
+"""
+
+_UPSERT = """
+INSERT INTO listings (id, hash, brand, model, version, year, mileage, fuel, color,
+                      price, detail_url, category, first_seen, last_seen, removed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+ON CONFLICT (id) DO UPDATE SET
+    hash = excluded.hash, brand = excluded.brand, model = excluded.model,
+    version = excluded.version, year = excluded.year, mileage = excluded.mileage,
+    fuel = excluded.fuel, color = excluded.color, price = excluded.price,
+    detail_url = excluded.detail_url, category = excluded.category,
+    last_seen = excluded.last_seen, removed_at = NULL
+"""
+
+DEFAULT_CHUNK = 10_000
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat(timespec='microseconds')
+
+
+class ListingStore:
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def upsert_many(self, records, seen_at=None):
+        """Grava registros normalizados em blocos; devolve quantos foram gravados."""
+        seen_at = seen_at or now_iso()
+        records = iter(records)
+        total = 0
+        while True:
+            chunk = list(islice(records, self.chunk_size))
+            if not chunk:
+                return total
+            self._write_chunk(chunk, seen_at)
+            total += len(chunk)
+
+    def tap(self, records, seen_at=None):
+        """Gerador que repassa os registros e os grava em blocos pelo caminho."""
+        seen_at = seen_at or now_iso()
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= self.chunk_size:
+                self._write_chunk(chunk, seen_at)
+                chunk = []
+            yield record
+        if chunk:
+            self._write_chunk(chunk, seen_at)
+
+    def _write_chunk(self, chunk, seen_at):
+        rows = []
+        prices = []
+        for r in chunk:
+            vid = listing_id(r['detailUrl'])
+            rows.append((vid, record_hash(r), r['brand'], r['model'], r['version'],
+                         r['year'], r['mileage'], r['fuel'], r['color'], r['price'],
+                         r['detailUrl'], r['category'], seen_at, seen_at))
+            prices.append((vid, r['price'], seen_at, vid, r['price']))
+        with self.conn:
+            self.conn.execute('BEGIN')
+            self.conn.executemany(_INSERT_PRICE, prices)
+            self.conn.executemany(_UPSERT, rows)
+
+    def mark_removed(self, seen_at, removed_at=None):
+        """Marca como removidos os anúncios que não apareceram na execução ``seen_at``."""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            cursor = self.conn.execute(
+                'UPDATE listings SET removed_at = ? WHERE last_seen < ? AND removed_at IS NULL',
+                (removed_at or seen_at, seen_at))
+        return cursor.rowcount
+
+    def count_new(self, seen_at):
+        return self.conn.execute(
+            'SELECT COUNT(*) FROM listings WHERE first_seen = ?', (seen_at,)).fetchone()[0]
+
+    def get(self, vid):
+        self.conn.row_factory = sqlite3.Row
+        try:
+            row = self.conn.execute('SELECT * FROM listings WHERE id = ?', (vid,)).fetchone()
+        finally:
+            self.conn.row_factory = None
+        return dict(row) if row else None
+
+    def price_history(self, vid):
+        return self.conn.execute(
+            'SELECT price, seen_at FROM price_history WHERE id = ? ORDER BY seen_at',
+            (vid,)).fetchall()
@@ -0,0 +1,307 @@
+"""Estatísticas do snapshot numa passada, com memória constante e agregados mescláveis.
+
+``SnapshotStats.add`` consome um veículo normalizado por vez e mantém, por
+categoria, marca e combustível, contagem, anúncios "Consulte" e a
+distribuição de preço, km e ano; por modelo/ano, a mediana de preço. As
+distribuições são t-digests (centróides ordenados com o limite de tamanho
+da função de escala k1, Dunning & Ertl): o tamanho não depende do número de
+veículos e dois digests se mesclam juntando os centróides, então cada worker
+de ``--workers`` agrega o seu bloco e o processo principal só chama
+``merge``. Com poucos valores (menos que ``compression``) cada valor é um
+centróide e os quantis são exatos.
+"""
+
+import json
+import math
+
+from robustcar.snapshot import sidecar_path
+
+DEFAULT_COMPRESSION = 100
+# Um digest por modelo/ano: menos centróides, só a mediana interessa
+MODEL_YEAR_COMPRESSION = 25
+# Valores acumulados (em múltiplos de ``compression``) antes de comprimir
+BUFFER_FACTOR = 5
+QUANTILES = (('p10', 0.1), ('p25', 0.25), ('p50', 0.5), ('p75', 0.75), ('p90', 0.9))
+GROUPINGS = (('byCategory', 'category'), ('byBrand', 'brand'), ('byFuel', 'fuel'))
+
+
+class TDigest:
+    """Quantis aproximados em memória limitada; ``merge`` junta digests parciais."""
+
+    __slots__ = ('compression', 'means', 'weights', 'count', 'total', 'min', 'max', '_buffer', '_limit')
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = []
+        self.weights = []
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer = []
+        self._limit = BUFFER_FACTOR * compression
+
+    def add(self, value):
+        # Só o append no caminho quente; contagem, soma e extremos saem em ``compress``
+        buffer = self._buffer
+        buffer.append(value)
+        if len(buffer) >= self._limit:
+            self.compress()
+
+    def add_many(self, values):
+        buffer = self._buffer
+        buffer.extend(values)
+        if len(buffer) >= self._limit:
+            self.compress()
+
+    def merge(self, other):
+        other.compress()
+        if not other.count:
+            return self
+        self.compress()
+        self.means.extend(other.means)
+        self.weights.extend(other.weights)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge_centroids(sorted(zip(self.means, self.weights)))
+        return self
+
+    def compress(self):
+        buffer = self._buffer
+        if buffer:
+            buffer.sort()
+            self.count += len(buffer)
+            self.total += sum(buffer)
+            self.min = min(self.min, buffer[0])
+            self.max = max(self.max, buffer[-1])
+            points = list(zip(self.means, self.weights))
+            points.extend(zip(buffer, [1] * len(buffer)))
+            points.sort()
+            self._buffer = []
+            self._merge_centroids(points)
+
+    def _merge_centroids(self, points):
+        """Funde vizinhos enquanto o centróide não passa de uma unidade de k1."""
+        count = self.count
+        scale = self.compression / (2 * math.pi)
+        means, weights = [], []
+        mean, weight = points[0]
+        done = 0
+        limit = self._q_limit(0.0, scale)
+        for value, w in points[1:]:
+            if done + weight + w <= limit * count:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._q_limit(done / count, scale)
+                mean, weight = value, w
+        means.append(mean)
+        weights.append(weight)
+        self.means = means
+        self.weights = weights
+
+    @staticmethod
+    def _q_limit(q, scale):
+        # k1(q) = scale * asin(2q - 1); próximo limite = k1⁻¹(k1(q) + 1)
+        k = scale * math.asin(max(-1.0, min(1.0, 2 * q - 1))) + 1
+        if k >= scale * math.pi / 2:
+            return 1.0
+        return (math.sin(k / scale) + 1) / 2
+
+    def quantile(self, q):
+        self.compress()
+        if not self.count:
+            return None
+        means, weights = self.means, self.weights
+        target = q * self.count
+        # Cada centróide representa o ponto no meio do seu peso acumulado
+        center = weights[0] / 2
+        if target <= center:
+            if weights[0] == 1:
+                return means[0]
+            return self.min + (means[0] - self.min) * target / center
+        for i in range(len(means) - 1):
+            following = center + (weights[i] + weights[i + 1]) / 2
+            if target <= following:
+                return means[i] + (means[i + 1] - means[i]) * (target - center) / (following - center)
+            center = following
+        if weights[-1] == 1:
+            return means[-1]
+        tail = self.count - center
+        return means[-1] + (self.max - means[-1]) * (target - center) / tail if tail else means[-1]
+
+    def summary(self, digits=2):
+        self.compress()
+        if not self.count:
+            return None
+        # digits=0: inteiros (km, ano)
+        rounded = (lambda value: round(value, digits)) if digits else round
+        result = {'min': rounded(self.min)}
+        for name, q in QUANTILES:
+            result[name] = rounded(self.quantile(q))
+        result['max'] = rounded(self.max)
+        result['mean'] = rounded(self.total / self.count)
+        return result
+
+
+class GroupStats:
+    """Contagem, "Consulte" e distribuições de preço/km/ano de um grupo.
+
+    Os valores se acumulam em listas simples e entram nos digests em blocos
+    de ``BLOCK``: no caminho quente só há ``append``.
+    """
+
+    __slots__ = ('count', 'consult', 'price', 'mileage', 'year', '_prices', '_mileages', '_years')
+
+    BLOCK = 1_024
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.count = 0
+        self.consult = 0
+        self.price = TDigest(compression)
+        self.mileage = TDigest(compression)
+        self.year = TDigest(compression)
+        self._prices = []
+        self._mileages = []
+        self._years = []
+
+    def add(self, price, mileage, year):
+        self.count += 1
+        if price is None:
+            self.consult += 1
+        else:
+            self._prices.append(price)
+        self._mileages.append(mileage)
+        self._years.append(year)
+        if len(self._mileages) >= self.BLOCK:
+            self.flush()
+
+    def flush(self):
+        self.price.add_many(self._prices)
+        self.mileage.add_many(self._mileages)
+        self.year.add_many(self._years)
+        self._prices = []
+        self._mileages = []
+        self._years = []
+
+    def merge(self, other):
+        self.flush()
+        other.flush()
+        self.count += other.count
+        self.consult += other.consult
+        self.price.merge(other.price)
+        self.mileage.merge(other.mileage)
+        self.year.merge(other.year)
+
+    def compress(self):
+        self.flush()
+        self.price.compress()
+        self.mileage.compress()
+        self.year.compress()
+
+    def to_dict(self):
+        self.flush()
+        return {
+            'count': self.count,
+            'consulte': self.consult,
+            'price': self.price.summary(),
+            'mileage': self.mileage.summary(0),
+            'year': self.year.summary(0),
+        }
+
+
+class SnapshotStats:
+    """Agregador de uma passada; ``merge`` combina os parciais dos workers."""
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.overall = GroupStats(compression)
+        self.groups = {name: {} for name, _ in GROUPINGS}
+        self.model_year = {}
+
+    def add(self, vehicle):
+        price, mileage, year = vehicle['price'], vehicle['mileage'], vehicle['year']
+        self.overall.add(price, mileage, year)
+        for name, field in GROUPINGS:
+            groups = self.groups[name]
+            key = vehicle[field]
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = GroupStats(self.compression)
+            group.add(price, mileage, year)
+        if price is not None:
+            key = (vehicle['brand'], vehicle['model'], year)
+            digest = self.model_year.get(key)
+            if digest is None:
+                digest = self.model_year[key] = TDigest(MODEL_YEAR_COMPRESSION)
+            digest.add(price)
+
+    def update(self, vehicles):
+        for vehicle in vehicles:
+            self.add(vehicle)
+        return self
+
+    def tap(self, records):
+        """Repassa os registros de um gerador, agregando cada um no caminho."""
+        for record in records:
+            self.add(record)
+            yield record
+
+    def merge(self, other):
+        self.overall.merge(other.overall)
+        for name, _ in GROUPINGS:
+            groups = self.groups[name]
+            for key, group in other.groups[name].items():
+                if key in groups:
+                    groups[key].merge(group)
+                else:
+                    groups[key] = group
+        for key, digest in other.model_year.items():
+            if key in self.model_year:
+                self.model_year[key].merge(digest)
+            else:
+                self.model_year[key] = digest
+        return self
+
+    def compress(self):
+        """Reduz os buffers a centróides (antes de picklar um parcial)."""
+        self.overall.compress()
+        for groups in self.groups.values():
+            for group in groups.values():
+                group.compress()
+        for digest in self.model_year.values():
+            digest.compress()
+        return self
+
+    @property
+    def total(self):
+        return self.overall.count
+
+    def counts(self, name):
+        """``{chave: veículos}`` de um agrupamento, em ordem de primeira aparição."""
+        return {key: group.count for key, group in self.groups[name].items()}
+
+    def to_dict(self):
+        result = {'vehicles': self.total, **self.overall.to_dict()}
+        del result['count']
+        for name, _ in GROUPINGS:
+            result[name] = {key: group.to_dict() for key, group in self.groups[name].items()}
+        by_model = {}
+        for (brand, model, year), digest in sorted(self.model_year.items()):
+            by_model.setdefault(f'{brand} {model}', {})[str(year)] = round(digest.quantile(0.5), 2)
+        result['medianPriceByModelYear'] = by_model
+        return result
+
+
+def write_stats(stats, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(stats.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+
+
+def stats_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.stats.json')
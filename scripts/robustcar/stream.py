@@ -0,0 +1,92 @@
+"""Modo streaming: NDJSON bruto -> NDJSON normalizado, um registro por vez.
+
+Cada etapa é um gerador, então só um anúncio fica em memória por vez e
+dumps de vários GB podem passar por pipe sem serem carregados inteiros.
+"""
+
+import json
+import sys
+
+from robustcar.normalize import normalize_vehicle
+from robustcar.state import now_iso
+
+
+def read_ndjson(lines):
+    """Gera um dict por linha não vazia."""
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def normalize_stream(records):
+    for record in records:
+        yield normalize_vehicle(record)
+
+
+def write_ndjson(records, out):
+    """Escreve cada registro numa linha e devolve quantos foram escritos."""
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def open_input(path, binary=False):
+    if path in (None, '-'):
+        if binary:
+            return sys.stdin.buffer
+        sys.stdin.reconfigure(encoding='utf-8')
+        return sys.stdin
+    if binary:
+        return open(path, 'rb')
+    return open(path, encoding='utf-8')
+
+
+def open_output(path, binary=False):
+    if path in (None, '-'):
+        if binary:
+            return sys.stdout.buffer
+        sys.stdout.reconfigure(encoding='utf-8')
+        return sys.stdout
+    if binary:
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8')
+
+
+def run(input_path='-', output_path='-', store=None, workers=1, stats=None):
+    """Executa o pipeline completo e devolve o total de registros.
+
+    Com ``store`` (um ``ListingStore``) os registros também são gravados no
+    estado SQLite, em blocos, à medida que passam. Com ``stats`` (um
+    ``SnapshotStats``) cada registro é agregado no caminho. Com ``workers > 1``
+    a normalização roda em paralelo (robustcar/parallel.py).
+    """
+    parallel_mode = workers > 1
+    src = open_input(input_path, binary=parallel_mode)
+    dst = open_output(output_path, binary=parallel_mode)
+    try:
+        if parallel_mode:
+            from robustcar import parallel
+            on_chunk = None
+            if store is not None:
+                seen_at = now_iso()
+                def on_chunk(blob):
+                    store.upsert_many(read_ndjson(blob.decode('utf-8').splitlines()),
+                                      seen_at=seen_at)
+            return parallel.run_ndjson(src, dst, workers, on_chunk=on_chunk, stats=stats)
+        records = normalize_stream(read_ndjson(src))
+        if store is not None:
+            records = store.tap(records)
+        if stats is not None:
+            records = stats.tap(records)
+        return write_ndjson(records, dst)
+    finally:
+        if src not in (sys.stdin, sys.stdin.buffer):
+            src.close()
+        if dst not in (sys.stdout, sys.stdout.buffer):
+            dst.close()
+        else:
+            dst.flush()
@@ -0,0 +1,31 @@
+"""Estágio de embeddings com o backend local e o cache SQLite."""
+
+from robustcar.embeddings import EmbeddingCache, EmbeddingStage, LocalBackend
+from robustcar.fixtures import vehicles_data
+from robustcar.normalize import normalize_vehicle
+
+
+def test_second_pass_is_served_from_cache(tmp_path):
+    vehicles = [normalize_vehicle(item) for item in vehicles_data()]
+    backend = LocalBackend(dimensions=64)
+
+    with EmbeddingCache(str(tmp_path / 'embeddings.db')) as cache:
+        cold = EmbeddingStage(backend, cache)
+        first = list(cold.embed_vehicles(vehicles))
+        assert len(first) == len(vehicles)
+        assert cold.hits == 0
+        assert cold.computed == cold.unique
+        assert cache.count(backend.name) == cold.unique
+
+        warm = EmbeddingStage(backend, cache)
+        second = list(warm.embed_vehicles(vehicles))
+        assert second == first
+        assert warm.computed == 0
+        assert warm.hit_rate == 1.0
+
+        # Um texto alterado volta ao backend; o resto continua no cache
+        changed = [dict(vehicles[0], mileage=vehicles[0]['mileage'] + 1000), *vehicles[1:]]
+        partial = EmbeddingStage(backend, cache)
+        third = list(partial.embed_vehicles(changed))
+        assert partial.computed == 1
+        assert third[1:] == first[1:]
@@ -0,0 +1,30 @@
+"""Coleta assíncrona contra o servidor local (robustcar.standin)."""
+
+from robustcar.fetch import FetchStats, HttpCache, scrape_sync
+from robustcar.fixtures import vehicles_data
+from robustcar.normalize import normalize_vehicle
+from robustcar.standin import StandInServer
+
+
+def test_crawl_matches_listings_with_retries_and_etags():
+    listings = vehicles_data()
+    sold = {listings[i]['detailUrl'] for i in range(0, len(listings), 10)}
+    expected = [normalize_vehicle(item) for item in listings if item['detailUrl'] not in sold]
+
+    with StandInServer(listings, fail_first=True, sold=sold) as server:
+        cache = HttpCache()
+        stats = FetchStats()
+        raw = scrape_sync(base_url=server.base_url, details=True, backoff=0.01,
+                          cache=cache, stats=stats)
+        assert [normalize_vehicle(item) for item in raw] == expected
+        # Todo caminho responde 503 na primeira vez
+        assert stats.retries > 0
+        assert stats.failures == 0
+
+        # Segunda passada com o mesmo cache: condicionais, mesma saída
+        stats = FetchStats()
+        raw = scrape_sync(base_url=server.base_url, details=True, backoff=0.01,
+                          cache=cache, stats=stats)
+        assert [normalize_vehicle(item) for item in raw] == expected
+        assert stats.not_modified > 0
+        assert stats.retries == 0
@@ -0,0 +1,42 @@
+"""Carga em blocos (robustcar.loader) num SQLite temporário."""
+
+from robustcar.fixtures import vehicles_data
+from robustcar.loader import BulkLoader, connect, listing_uuid, should_load
+from robustcar.normalize import normalize_vehicle
+
+
+def test_insert_then_upsert(tmp_path):
+    vehicles = [normalize_vehicle(item) for item in vehicles_data()]
+    loadable = [v for v in vehicles if should_load(v)]
+    conn = connect(f'sqlite:///{tmp_path / "vehicles.db"}')
+    loader = BulkLoader(conn, chunk_size=16)
+
+    first = loader.load(vehicles)
+    assert first['inserted'] == len(loadable)
+    assert first['updated'] == 0
+    assert first['skipped'] == len(vehicles) - len(loadable)
+
+    # Mesma URL: atualiza no lugar, mantém o id e não duplica
+    changed = dict(loadable[0], price=loadable[0]['price'] + 1000)
+    second = loader.load([changed, *loadable[1:]])
+    assert second['inserted'] == 0
+    assert second['updated'] == len(loadable)
+    assert conn.execute('SELECT COUNT(*) FROM "Vehicle"').fetchone()[0] == len(loadable)
+    row = conn.execute('SELECT "id", "preco" FROM "Vehicle" WHERE "url" = ?',
+                       (changed['detailUrl'],)).fetchone()
+    assert row == (listing_uuid(changed['detailUrl']), changed['price'])
+
+    # Estoque de outra loja na mesma tabela, como o de seed-renatinhu-real.ts
+    conn.execute('INSERT INTO "Vehicle" ("id", "marca", "modelo", "ano", "km", "preco", "cor", '
+                 '"carroceria", "url", "updatedAt") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)',
+                 ('renatinhu-661', 'FIAT', 'UNO', 2015, 90000, 29990.0, 'Branco', 'Hatch',
+                  'https://www.renatinhuscars.com.br/?id=661'))
+
+    # Quem sumiu do snapshot fica indisponível; a outra loja não é tocada
+    third = loader.load(loadable[1:], retire_missing=True)
+    assert third['retired'] == 1
+    assert conn.execute('SELECT "disponivel" FROM "Vehicle" WHERE "url" = ?',
+                        (changed['detailUrl'],)).fetchone() == (0,)
+    assert conn.execute('SELECT "disponivel" FROM "Vehicle" WHERE "id" = ?',
+                        ('renatinhu-661',)).fetchone() == (1,)
+    conn.close()
@@ -0,0 +1,20 @@
+"""Top-k MaxScore do índice BM25 contra a acumulação sem poda."""
+
+import pytest
+
+from robustcar.benchmarks.synthetic import ListingGenerator
+from robustcar.benchmarks.textindex import QUERIES
+from robustcar.record import Vehicle
+from robustcar.textindex import TextIndex, write_text_index
+
+
+@pytest.mark.parametrize('n', [500, 5_000])
+def test_search_matches_exhaustive(tmp_path, n):
+    vehicles = [Vehicle.from_raw(item) for chunk in ListingGenerator().chunks(n) for item in chunk]
+    path = str(tmp_path / 'index.rtxt')
+    write_text_index(vehicles, path)
+    with TextIndex(path) as index:
+        for query in QUERIES:
+            for k in (1, 10, 50):
+                # Mesmos docs, mesmos scores e empates pelo menor doc
+                assert index.search(query, k) == index.search_exhaustive(query, k), (query, k)
@@ -0,0 +1,328 @@
+"""Índice invertido BM25 sobre marca/modelo/versão (formato ``RTXT``).
+
+Quando não há embeddings a busca do bot cai num scan SQL, e texto livre como
+"onix premier automático" funciona mal. Este índice é montado na exportação
+e consultado sem banco:
+
+- ``tokenize`` separa versão em tokens úteis: "1.0", "12V", "AUT." -> AUT,
+  "TB"/"TGDI" -> TURBO, abreviações do site ("PREM.", "COMF", "LGTD") e
+  tokens colados ("XEI18FLEX" -> XEI, 1.8, FLEX);
+- cada termo guarda a lista de documentos (``u32`` crescente), a frequência
+  (``u8``) e o maior score BM25 que pode dar a um documento;
+- ``TextIndex.search`` faz top-k com MaxScore: termos cujo teto somado não
+  alcança o k-ésimo score atual deixam de gerar candidatos e só são
+  consultados (busca binária) nos documentos que os outros termos trazem.
+  Cada lista também guarda o teto de cada bloco de 64 postings, e trechos
+  cujos blocos não alcançam o k-ésimo score são pulados inteiros.
+
+Layout igual ao de ``facets.py`` (preâmbulo, cabeçalho JSON, blocos
+alinhados em 8 bytes com offsets relativos ao fim do cabeçalho). As listas
+ficam sem compressão para permitir busca binária direto no mmap.
+"""
+
+import heapq
+import json
+import math
+import mmap
+import re
+import struct
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from robustcar.binfmt import le_bytes, le_view, pad
+from robustcar.snapshot import sidecar_path
+
+MAGIC = b'RTXT'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<4sHHI')
+
+K1 = 1.2
+B = 0.75
+BLOCK = 64  # postings por bloco com teto próprio
+_NEAR = 1 + 1e-9  # abaixo de threshold * _NEAR a soma corrida não basta para podar
+
+_WORD = re.compile(r'[A-Z0-9]+(?:\.[0-9]+)?')
+_RUNS = re.compile(r'[A-Z]+|[0-9]+')
+_GEAR = re.compile(r'^(?:AT|MT)\d$')
+
+# Um token pode virar mais de um termo (CVT também é automático)
+SYNONYMS = {
+    'AUTOMATICO': ('AUT',), 'AUTOMATICA': ('AUT',), 'AUTOMATIC': ('AUT',), 'AT': ('AUT',),
+    'CVT': ('CVT', 'AUT'), 'POWERSHIFT': ('POWERSHIFT', 'AUT'),
+    'MT': ('MANUAL',), 'MEC': ('MANUAL',), 'MECANICO': ('MANUAL',),
+    'TB': ('TURBO',), 'TGDI': ('TURBO',), 'TSI': ('TSI', 'TURBO'),
+    'HIBRIDO': ('HYBRID',),
+    'PREM': ('PREMIER',), 'COMF': ('COMFORT',), 'LGTD': ('LIMITED',), 'PREC': ('PRECISION',),
+    'EXPR': ('EXPRESSION',),
+}
+# Sufixos que indicam válvulas/portas/cilindrada, não motor em litros
+_NOT_ENGINE = {'V', 'P', 'CC', 'L'}
+
+
+def _expand(word):
+    if _GEAR.match(word):
+        word = word[:2]
+    return SYNONYMS.get(word, (word,))
+
+
+def tokenize(text):
+    """Texto livre -> lista de termos (com repetição, para tf)."""
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    terms = []
+    for word in _WORD.findall(text.upper()):
+        terms.extend(_expand(word))
+        if '.' in word or word.isalpha() or word.isdigit() or _GEAR.match(word):
+            continue
+        # Token colado: também as partes ("XEI18FLEX" -> XEI, 1.8, FLEX)
+        runs = _RUNS.findall(word)
+        for i, run in enumerate(runs):
+            if run.isdigit():
+                following = runs[i + 1] if i + 1 < len(runs) else ''
+                if len(run) == 2 and following not in _NOT_ENGINE and '10' <= run <= '30':
+                    terms.append(f'{run[0]}.{run[1]}')
+            elif len(run) > 1:
+                terms.extend(_expand(run))
+    return terms
+
+
+def document_text(vehicle):
+    return f"{vehicle['brand']} {vehicle['model']} {vehicle['version']}"
+
+
+def _term_score(idf, tf, norm):
+    return idf * tf * (K1 + 1) / (tf + norm)
+
+
+def _ordered_sum(values):
+    """Soma da esquerda para a direita (``sum`` compensa o erro a partir do 3.12)."""
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+def _idf(df, docs):
+    return math.log(1 + (docs - df + 0.5) / (df + 0.5))
+
+
+def write_text_index(vehicles, path):
+    """Grava o índice RTXT dos veículos; devolve o tamanho em bytes."""
+    postings = {}
+    lengths = array('H')
+    for doc, vehicle in enumerate(vehicles):
+        terms = tokenize(document_text(vehicle))
+        lengths.append(min(len(terms), 0xFFFF))
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            postings.setdefault(term, []).append((doc, min(tf, 0xFF)))
+
+    docs = len(lengths)
+    avgdl = sum(lengths) / docs if docs else 0.0
+    blocks = []
+    position = 0
+
+    def add(block):
+        nonlocal position
+        span = [position, len(block)]
+        blocks.append(block)
+        position += len(block) + pad(len(block))
+        return span
+
+    terms = {}
+    for term in sorted(postings):
+        entries = postings[term]
+        idf = _idf(len(entries), docs)
+        scores = [_term_score(idf, tf, K1 * (1 - B + B * lengths[doc] / avgdl)) for doc, tf in entries]
+        block_max = array('d', [max(scores[i:i + BLOCK]) for i in range(0, len(scores), BLOCK)])
+        terms[term] = {
+            'df': len(entries),
+            'max': max(block_max),
+            'blocks': add(le_bytes(block_max)),
+            'docs': add(le_bytes(array('I', [doc for doc, _ in entries]))),
+            'tf': add(array('B', [tf for _, tf in entries]).tobytes()),
+        }
+    header = {'docs': docs, 'avgdl': avgdl, 'k1': K1, 'b': B,
+              'lengths': add(le_bytes(lengths)), 'terms': terms}
+
+    encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, len(encoded)))
+        f.write(encoded)
+        f.write(b'\0' * pad(_PREAMBLE.size + len(encoded)))
+        for block in blocks:
+            f.write(block)
+            f.write(b'\0' * pad(len(block)))
+        return f.tell()
+
+
+class TextIndex:
+    """Busca BM25 top-k via mmap; ids de documento = posições no snapshot."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_len = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path}: não é um índice RTXT v{FORMAT_VERSION}')
+        header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        self._base = _PREAMBLE.size + header_len + pad(_PREAMBLE.size + header_len)
+        self.docs = header['docs']
+        self.terms = header['terms']
+        self._k1, self._b, avgdl = header['k1'], header['b'], header['avgdl']
+        lengths = self._view(header['lengths'], 'u16')
+        # norm[d] = k1 * (1 - b + b * |d| / avgdl), calculado uma vez por comprimento
+        by_length = {n: self._k1 * (1 - self._b + self._b * n / avgdl) for n in set(lengths)}
+        self._norm = [by_length[n] for n in lengths]
+        del lengths
+        self._lists = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._lists.clear()
+        self._map.close()
+        self._file.close()
+
+    def _view(self, span, dtype):
+        offset, length = span
+        return le_view(self._map, offset + self._base, length, dtype)
+
+    def _postings(self, query):
+        """[(teto, idf, docs, tfs, tetos por bloco)] dos termos da consulta presentes no índice."""
+        lists = []
+        for term in dict.fromkeys(tokenize(query)):
+            meta = self.terms.get(term)
+            if meta is None:
+                continue
+            views = self._lists.get(term)
+            if views is None:
+                views = self._lists[term] = (self._view(meta['docs'], 'u32'), self._view(meta['tf'], 'u8'),
+                                             self._view(meta['blocks'], 'f64'))
+            lists.append((meta['max'], _idf(meta['df'], self.docs)) + views)
+        return lists
+
+    def search(self, query, k=10):
+        """Top-k ``[(doc, score)]`` por score decrescente (empate: menor doc primeiro).
+
+        Scores e tetos somam as parcelas sempre na ordem dos termos da consulta,
+        como ``search_exhaustive``: o score não depende de quais listas estão
+        essenciais e, como o arredondamento é monótono, um teto nunca fica
+        abaixo do score que limita (empates exatos com o k-ésimo são podados).
+        """
+        postings = self._postings(query)
+        if not postings or k <= 0:
+            return []
+        # Listas por teto crescente; ``terms[i]`` é a posição da lista na consulta
+        terms = sorted(range(len(postings)), key=lambda i: postings[i][0])
+        lists = [postings[i] for i in terms]
+        norm = self._norm
+        uppers = [item[0] for item in lists]
+        prefix = list(uppers)
+        for i in range(1, len(prefix)):
+            prefix[i] += prefix[i - 1]
+        # reach[i]: teto de um doc que só está em lists[:i + 1], somado na ordem da consulta
+        reach = []
+        caps = [0.0] * len(lists)
+        for i, upper in enumerate(uppers):
+            caps[terms[i]] = upper
+            reach.append(_ordered_sum(caps))
+
+        heap = []            # (score, -doc): o menor é o k-ésimo atual
+        threshold = 0.0
+        first = 0            # lists[first:] são essenciais (geram candidatos)
+        cursors = [0] * len(lists)
+        checked_end, checked_threshold = -1, None  # trecho cujo teto por bloco já passou
+        while True:
+            # Próximo candidato: menor doc entre as listas essenciais
+            doc = None
+            for i in range(first, len(lists)):
+                docs = lists[i][2]
+                if cursors[i] < len(docs) and (doc is None or docs[cursors[i]] < doc):
+                    doc = docs[cursors[i]]
+            if doc is None:
+                break
+            if len(heap) == k and (doc > checked_end or threshold != checked_threshold):
+                # Teto por bloco: se nem os blocos atuais das listas essenciais
+                # (mais todas as não essenciais) passam do k-ésimo, pula o trecho
+                # até o fim do primeiro bloco que termina.
+                end = None
+                for i in range(first, len(lists)):
+                    docs, c = lists[i][2], cursors[i]
+                    if c < len(docs):
+                        last = docs[min(len(docs), (c // BLOCK + 1) * BLOCK) - 1]
+                        end = last if end is None or last < end else end
+                caps = [0.0] * len(lists)
+                for i in range(first):
+                    caps[terms[i]] = uppers[i]
+                for i in range(first, len(lists)):
+                    docs, c = lists[i][2], cursors[i]
+                    if c < len(docs) and docs[c] <= end:
+                        caps[terms[i]] = lists[i][4][c // BLOCK]
+                if _ordered_sum(caps) <= threshold:
+                    for i in range(first, len(lists)):
+                        cursors[i] = bisect_left(lists[i][2], end + 1, cursors[i])
+                    continue
+                checked_end, checked_threshold = end, threshold
+            parts = [0.0] * len(lists)  # parcela de cada termo, na ordem da consulta
+            partial = 0.0
+            n = norm[doc]
+            for i in range(first, len(lists)):
+                docs = lists[i][2]
+                c = cursors[i]
+                if c < len(docs) and docs[c] == doc:
+                    tf = lists[i][3][c]
+                    part = parts[terms[i]] = lists[i][1] * tf * (K1 + 1) / (tf + n)
+                    partial += part
+                    cursors[i] = c + 1
+            # Não essenciais, do maior teto para o menor, enquanto ainda pode entrar.
+            # A soma corrida só decide quando está longe do k-ésimo; perto dele o
+            # teto é refeito na ordem da consulta.
+            for i in range(first - 1, -1, -1):
+                if partial + prefix[i] <= threshold * _NEAR:
+                    caps = list(parts)
+                    for j in range(i + 1):
+                        caps[terms[j]] = uppers[j]
+                    if _ordered_sum(caps) <= threshold:
+                        break
+                docs = lists[i][2]
+                c = bisect_left(docs, doc, cursors[i])
+                cursors[i] = c
+                if c < len(docs) and docs[c] == doc:
+                    tf = lists[i][3][c]
+                    part = parts[terms[i]] = lists[i][1] * tf * (K1 + 1) / (tf + n)
+                    partial += part
+            else:
+                score = _ordered_sum(parts)
+                if len(heap) < k:
+                    heapq.heappush(heap, (score, -doc))
+                elif score > threshold:
+                    heapq.heapreplace(heap, (score, -doc))
+                else:
+                    continue
+                if len(heap) == k:
+                    threshold = heap[0][0]
+                    while first < len(lists) and reach[first] <= threshold:
+                        first += 1
+        return [(-neg, score) for score, neg in sorted(heap, key=lambda item: (-item[0], -item[1]))]
+
+    def search_exhaustive(self, query, k=10):
+        """Mesmo ranking por acumulação termo a termo, sem poda (referência)."""
+        scores = {}
+        norm = self._norm
+        for _, idf, docs, tfs, _ in self._postings(query):
+            for doc, tf in zip(docs, tfs):
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / (tf + norm[doc])
+        return heapq.nsmallest(k, ((doc, score) for doc, score in scores.items()),
+                               key=lambda item: (-item[1], item[0]))
+
+
+def text_index_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.rtxt')
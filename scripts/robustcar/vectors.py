@@ -0,0 +1,218 @@
+"""Matriz de embeddings float32 normalizada (``.npy``) e índice IVF para top-k por cosseno.
+
+Os serviços de busca guardam cada embedding como JSON numa coluna de texto e
+fazem ``JSON.parse`` de todos na carga. Aqui a exportação grava:
+
+- ``robustcar-vehicles.vectors.npy``: matriz ``(linhas, dimensões)`` ``<f4``
+  com linhas de norma 1, linha ``i`` = veículo ``i`` do snapshot; abre com
+  ``np.load(..., mmap_mode='r')`` sem copiar nada;
+- ``robustcar-vehicles.vectors.ids.json``: modelo, dimensões e o id de cada linha
+  (número do anúncio, o mesmo de ``delta.listing_id``);
+- ``robustcar-vehicles.vectors.ivf.npz`` (opcional): centróides de k-means
+  esférico, e as linhas agrupadas por lista (``offsets`` + ``rows``).
+
+Com linhas normalizadas o cosseno é o produto interno. ``exact`` varre a matriz
+em blocos; ``ivf`` compara a consulta com os centróides e só varre as
+``nprobe`` listas mais próximas. NumPy é dependência opcional: só este módulo
+(e ``columns.py``) a importam.
+"""
+
+import json
+import math
+import os
+
+import numpy as np
+
+from robustcar.delta import listing_id
+from robustcar.snapshot import sidecar_path
+
+BLOCK_ROWS = 65_536
+DEFAULT_NPROBE = 8
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 32
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def write_vectors(vectors, path, rows, dimensions, ids, model):
+    """Grava a matriz a partir de vetores float32 em bytes (saída de ``EmbeddingStage``).
+
+    ``vectors`` é consumido em blocos de ``BLOCK_ROWS``; devolve a matriz
+    (memmap) já gravada.
+    """
+    matrix = np.lib.format.open_memmap(path, mode='w+', dtype='<f4', shape=(rows, dimensions))
+    row = 0
+    chunk = []
+    for blob in vectors:
+        chunk.append(blob)
+        if len(chunk) == BLOCK_ROWS:
+            row = _write_block(matrix, row, chunk, dimensions)
+            chunk = []
+    if chunk:
+        row = _write_block(matrix, row, chunk, dimensions)
+    if row != rows:
+        raise ValueError(f'{path}: esperava {rows} vetores, recebeu {row}')
+    matrix.flush()
+    # IVF de uma exportação anterior não vale para a matriz nova
+    if os.path.exists(ivf_path(path)):
+        os.remove(ivf_path(path))
+    with open(ids_path(path), 'w', encoding='utf-8') as f:
+        json.dump({'model': model, 'dimensions': dimensions, 'ids': list(ids)}, f, ensure_ascii=False)
+    return matrix
+
+
+def _write_block(matrix, row, chunk, dimensions):
+    block = np.frombuffer(b''.join(chunk), dtype='<f4').reshape(len(chunk), dimensions)
+    matrix[row:row + len(chunk)] = _normalize(block.copy())
+    return row + len(chunk)
+
+
+def vehicle_ids(vehicles):
+    return [listing_id(v['detailUrl']) for v in vehicles]
+
+
+def _top_k(scores, k):
+    """Índices dos ``k`` maiores scores, do maior para o menor (empate: menor índice)."""
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def _nearest_centroid(matrix, centroids):
+    assignment = np.empty(len(matrix), dtype=np.int32)
+    # Blocos limitados para o produto (linhas x listas) caber em ~64 MB
+    step = max(1024, (1 << 24) // len(centroids))
+    for start in range(0, len(matrix), step):
+        block = np.asarray(matrix[start:start + step], dtype=np.float32)
+        assignment[start:start + step] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def build_ivf(matrix, path, lists=None, seed=0):
+    """K-means esférico numa amostra da matriz e atribuição de todas as linhas.
+
+    ``lists`` padrão: ``sqrt(linhas)``. Devolve o número de listas.
+    """
+    rows = len(matrix)
+    if not rows:
+        raise ValueError('matriz vazia')
+    lists = min(lists or max(1, int(math.sqrt(rows))), rows)
+    rng = np.random.default_rng(seed)
+    sample_size = min(rows, lists * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(matrix[np.sort(rng.choice(rows, sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = _nearest_centroid(sample, centroids)
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=lists)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(sample[order], starts[~empty])
+        # Lista vazia recomeça num ponto aleatório da amostra
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = _normalize(sums)
+
+    assignment = _nearest_centroid(matrix, centroids)
+    order = np.argsort(assignment, kind='stable').astype(np.uint32)
+    offsets = np.zeros(lists + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assignment, minlength=lists), out=offsets[1:])
+    np.savez(path, centroids=centroids, offsets=offsets, rows=order)
+    return lists
+
+
+class VectorIndex:
+    """Top-k por cosseno sobre a matriz ``.npy`` (mmap) e, se existir, o IVF ao lado.
+
+    ``search`` devolve ``[(linha, score), ...]`` como ``TextIndex.search``;
+    ``ids[linha]`` é o id do anúncio.
+    """
+
+    def __init__(self, path):
+        self.matrix = np.load(path, mmap_mode='r')
+        with open(ids_path(path), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.model = meta['model']
+        self.ids = meta['ids']
+        if len(self.ids) != len(self.matrix):
+            raise ValueError(f'{path}: {len(self.matrix)} linhas e {len(self.ids)} ids')
+        self.centroids = self.offsets = self.rows = None
+        try:
+            with np.load(ivf_path(path)) as ivf:
+                self.centroids = ivf['centroids']
+                self.offsets = ivf['offsets']
+                self.rows = ivf['rows']
+        except FileNotFoundError:
+            pass
+        if self.offsets is not None and self.offsets[-1] != len(self.matrix):
+            raise ValueError(f'{ivf_path(path)}: IVF não corresponde à matriz')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.matrix = None
+
+    def _query(self, query):
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.matrix.shape[1]:
+            raise ValueError(f'consulta com {query.shape[0]} dimensões, matriz com {self.matrix.shape[1]}')
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+
+    def search(self, query, k=10, mode='exact', nprobe=DEFAULT_NPROBE):
+        """Top-``k`` por cosseno; ``mode`` é ``'exact'`` ou ``'ivf'``."""
+        if mode == 'exact':
+            return self.search_exact(query, k)
+        if mode == 'ivf':
+            return self.search_ivf(query, k, nprobe)
+        raise ValueError(f'modo desconhecido: {mode}')
+
+    def search_exact(self, query, k=10):
+        query = self._query(query)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self.matrix), BLOCK_ROWS):
+            scores = self.matrix[start:start + BLOCK_ROWS] @ query
+            top = _top_k(scores, k)
+            best_rows = np.concatenate((best_rows, top + start))
+            best_scores = np.concatenate((best_scores, scores[top]))
+            keep = _top_k(best_scores, k)
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+        return [(int(row), float(score)) for row, score in zip(best_rows, best_scores)]
+
+    def search_ivf(self, query, k=10, nprobe=DEFAULT_NPROBE):
+        if self.centroids is None:
+            raise ValueError('índice IVF ausente; gere com build_ivf')
+        query = self._query(query)
+        probes = _top_k(self.centroids @ query, nprobe)
+        rows = np.concatenate([self.rows[self.offsets[p]:self.offsets[p + 1]] for p in probes])
+        rows.sort()  # leitura do mmap em ordem
+        scores = self.matrix[rows] @ query
+        top = _top_k(scores, k)
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+
+def vectors_path(snapshot_path):
+    return sidecar_path(snapshot_path, '.vectors.npy')
+
+
+def ids_path(matrix_path):
+    # '.ids.json', não '.json': com --vectors robustcar-vehicles.npy o mapa de ids
+    # cairia em cima do snapshot
+    return (matrix_path[:-4] if matrix_path.endswith('.npy') else matrix_path) + '.ids.json'
+
+
+def ivf_path(matrix_path):
+    return (matrix_path[:-4] if matrix_path.endswith('.npy') else matrix_path) + '.ivf.npz'